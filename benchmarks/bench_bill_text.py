@@ -0,0 +1,234 @@
+import argparse
+import random
+import re
+import os
+import sys
+import time
+
+# Bill text analyser (bill_text.classify_bill) vs the repeated
+# scans parse_bill used to do.
+#   1. Regression: a seeded corpus of synthetic bill texts must give identical output
+#      (with the rules listed in bill_rules.json, i.e. the old provider chain).
+#   2. Speed: both implementations on large multi-page texts, with gas (Nm3, kWh)
+#      pairs and without any (every number is read, like an electricity bill).
+#   3. Provider count: provider detection with 5 rules vs many supplier rules, on a
+#      text naming none of them (every rule is checked).
+#   python benchmarks/bench_bill_text.py --corpus 5000 --pages 1 2 20 100
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "wattsaver_mobile"))
+
+from bill_rules import BillRules, ProviderRule, default_rules
+from bill_text import BillTextScan, classify_bill
+
+LISTED_RULES = BillRules.load() # bill_rules.json only: same providers as legacy_parse_text
+
+
+def legacy_parse_text(text):
+    # parse_bill's text heuristics before the single-pass analyser (prints removed)
+    data = {
+        "total_kwh": 0,
+        "days": 30,
+        "provider_detected": "Unknown",
+        "bill_type": "electricity"
+    }
+
+    if "Zeni" in text or "Zenith" in text: data["provider_detected"] = "Zenith"
+    elif "Protergia" in text: data["provider_detected"] = "Protergia"
+    elif "DEI" in text or "ΔΕΗ" in text: data["provider_detected"] = "DEI"
+    elif "Enerwave" in text: data["provider_detected"] = "Enerwave"
+    elif "ΦΥΣΙΚΟ ΑΕΡΙΟ" in text: data["provider_detected"] = "Fysiko Aerio"
+
+    numbers = re.findall(r'(\d+[.,]\d{2})', text)
+    clean_nums = []
+    for n in numbers:
+        try:
+            val = float(n.replace(',', '.'))
+            clean_nums.append(val)
+        except: pass
+
+    is_gas_by_math = False
+    found_gas_kwh = 0
+    for i in range(len(clean_nums) - 1):
+        n1 = clean_nums[i]
+        n2 = clean_nums[i+1]
+        if n1 > 1:
+            ratio = n2 / n1
+            if 10.5 < ratio < 12.5:
+                is_gas_by_math = True
+                found_gas_kwh = n2
+                break
+
+    is_gas_by_text = False
+    is_elec_by_text = False
+    if "Nm3" in text or "θερμογόνος" in text:
+        is_gas_by_text = True
+    if "kVA" in text or "ΔΕΔΔΗΕ" in text or "ΑΔΜΗΕ" in text or "ΗΛΕΚΤΡΙΣΜΟΣ" in text.upper():
+        is_elec_by_text = True
+
+    if is_gas_by_math:
+        data["bill_type"] = "gas"
+        data["total_kwh"] = int(found_gas_kwh)
+    elif is_gas_by_text and not is_elec_by_text:
+        data["bill_type"] = "gas"
+        valid = [x for x in clean_nums if x < 5000]
+        data["total_kwh"] = int(max(valid)) if valid else 0
+    elif is_elec_by_text and not is_gas_by_text:
+         data["bill_type"] = "electricity"
+         zenith_match = re.search(r"Σύνολο Κατανάλωσης.*?(\d+)", text, re.DOTALL)
+         if zenith_match:
+            data["total_kwh"] = int(zenith_match.group(1))
+         elif clean_nums:
+            valid = [x for x in clean_nums if 50 < x < 3000]
+            if valid: data["total_kwh"] = int(max(valid))
+    else:
+         if is_gas_by_text:
+             data["bill_type"] = "gas"
+             valid = [x for x in clean_nums if x < 5000]
+             data["total_kwh"] = int(max(valid)) if valid else 0
+         else:
+             data["bill_type"] = "electricity"
+             zenith_match = re.search(r"Σύνολο Κατανάλωσης.*?(\d+)", text, re.DOTALL)
+             if zenith_match:
+                data["total_kwh"] = int(zenith_match.group(1))
+             elif clean_nums:
+                valid = [x for x in clean_nums if 50 < x < 3000]
+                if valid: data["total_kwh"] = int(max(valid))
+
+    days_match = re.search(r"ΗΜΕΡΕΣ.*?(\d{2,3})", text, re.IGNORECASE)
+    if days_match:
+        try: data["days"] = int(days_match.group(1))
+        except: pass
+
+    return data
+
+
+# --- Synthetic corpus ---
+
+FILLER = [
+    "Λογαριασμός", "Πελάτης", "Διεύθυνση", "ΑΘΗΝΑ", "Παροχή", "Τιμολόγιο", "Αρ.", "ΦΠΑ", "€",
+    "Περίοδος", "Κατανάλωση", "kWh", "Πάγιο", "Σύνολο", "Ένδειξη", "Προηγούμενη", "Τρέχουσα",
+    "Συντελεστής", "Οφειλή", "Πληρωμή", "έως", "από", "-", ":", "/", "(", ")",
+]
+MARKERS = [
+    "Zenith", "ZENITH", "Zeni", "Protergia", "DEI", "ΔΕΗ", "ΔΕ", "Enerwave", "ΦΥΣΙΚΟ ΑΕΡΙΟ", "ΦΥΣΙΚΟ",
+    "Nm3", "θερμογόνος", "kVA", "kva", "ΔΕΔΔΗΕ", "ΑΔΜΗΕ", "ΗΛΕΚΤΡΙΣΜΟΣ", "Ηλεκτρισμός", "ηλεκτρισμοσ",
+    "ηλεκτρισμος", "Σύνολο Κατανάλωσης", "ΣΥΝΟΛΟ ΚΑΤΑΝΑΛΩΣΗΣ", "ΗΜΕΡΕΣ", "Ημερες", "ημέρες", "ΗΜΕΡΕΣ:",
+    "ΔΕΗΜΕΡΕΣ", "ΗΜΕΡΕΣύνολο Κατανάλωσης", "Nm3,50",
+    # Supplier markers from providers.json, also overlapping each other
+    "EUNICE", "Eunice", "ΗΡΩΝ", "VOLTON", "NRG", "EUNICEnerwave", "ΔΕΗΡΩΝ", "VOLTONRG", "OTE ESTATEUNICE",
+]
+
+
+def random_number(rng, gas_pairs=True):
+    if not gas_pairs: return f"{rng.randint(100, 199)},{rng.randint(0, 99):02d}" # No two within a ~11.5 ratio
+    style = rng.random()
+    if style < 0.35: return f"{rng.randint(0, 3000)},{rng.randint(0, 99):02d}"
+    if style < 0.55: return f"{rng.randint(0, 3000)}.{rng.randint(0, 99):02d}"
+    if style < 0.7: return str(rng.randint(0, 99999))
+    if style < 0.8: return f"{rng.randint(1, 9)}.{rng.randint(0, 999):03d},{rng.randint(0, 99):02d}"
+    if style < 0.9: return f"{rng.randint(0, 99)},{rng.randint(0, 9)}"
+    nm3 = rng.uniform(2, 300) # Gas pair with a ~11.5 conversion ratio
+    return f"{nm3:.2f} {nm3 * rng.uniform(10, 13):.2f}".replace(".", ",")
+
+
+def random_bill_text(rng, tokens, gas_pairs=True, markers=MARKERS):
+    parts = []
+    for _ in range(tokens):
+        r = rng.random()
+        if r < 0.05 and markers: parts.append(rng.choice(markers))
+        elif r < 0.35: parts.append(random_number(rng, gas_pairs))
+        else: parts.append(rng.choice(FILLER))
+        parts.append(rng.choice([" ", " ", " ", "\n", "", "  "]))
+    return "".join(parts)
+
+
+def corpus(n, seed=1234):
+    rng = random.Random(seed)
+    return [random_bill_text(rng, rng.randint(0, 400)) for _ in range(n)]
+
+
+def substring_provider(text, rules):
+    # Provider by a plain substring check of every marker, in rule order
+    for rule in rules.providers:
+        folded = text.upper() if rule.any_case else text
+        if any((m.upper() if rule.any_case else m) in folded for m in rule.markers): return rule.name
+    return None
+
+
+def check_corpus(n):
+    texts = corpus(n)
+    supplier_rules = default_rules()
+    for i, text in enumerate(texts):
+        expected = legacy_parse_text(text)
+        actual, _ = classify_bill(text, LISTED_RULES)
+        if actual != expected:
+            raise AssertionError(f"Corpus text {i} differs:\nlegacy={expected}\nnew={actual}\n{text[:500]!r}")
+        expected = substring_provider(text, supplier_rules)
+        actual = BillTextScan(text, supplier_rules).provider
+        if actual != expected:
+            raise AssertionError(f"Corpus text {i}: provider {actual}, substring checks give {expected}\n{text[:500]!r}")
+    return len(texts)
+
+
+def page_text(rng, gas_pairs=True):
+    return random_bill_text(rng, 900, gas_pairs) + "\n"
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(corpus_size=2000, pages=(1, 2, 20, 100), repeat=5):
+    checked = check_corpus(corpus_size)
+    rng = random.Random(99)
+    timings = []
+    for gas_pairs in (True, False):
+        for n in pages:
+            text = "".join(page_text(rng, gas_pairs) for _ in range(n))
+            assert legacy_parse_text(text) == classify_bill(text, LISTED_RULES)[0]
+            timings.append({
+                "pages": n,
+                "gas_pair": gas_pairs,
+                "chars": len(text),
+                "legacy_ms": best_of(lambda: legacy_parse_text(text), repeat),
+                "analyser_ms": best_of(lambda: classify_bill(text, LISTED_RULES), repeat),
+            })
+
+    text = "".join(random_bill_text(rng, 900, markers=()) + "\n" for _ in range(max(pages)))
+    rule_sets = [("listed", LISTED_RULES), ("listed + suppliers", default_rules())]
+    for n in (40, 200):
+        extra = [ProviderRule(f"Supplier {i:03d}", [f"SUPPLIER{i:03d}", f"Προμηθευτής {i:03d}"]) for i in range(n)]
+        rule_sets.append((f"listed + {n} synthetic", BillRules(LISTED_RULES.providers + extra)))
+    scaling = []
+    for name, rules in rule_sets:
+        rules.scanner # compile outside the timing
+        scaling.append({
+            "rules": name,
+            "providers": len(rules.providers),
+            "provider_ms": best_of(lambda: BillTextScan(text, rules).provider, repeat),
+        })
+    return {"corpus_checked": checked, "timings": timings, "provider_scaling": scaling}
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Single-pass bill text analyser: regression + benchmark")
+    arg_parser.add_argument("--corpus", type=int, default=2000)
+    arg_parser.add_argument("--pages", type=int, nargs="+", default=[1, 2, 20, 100])
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    report = run(args.corpus, args.pages, args.repeat)
+    print(f"Regression corpus: {report['corpus_checked']} texts, identical output")
+    print(f"{'pages':>6}{'gas pair':>10}{'chars':>10}{'legacy ms':>12}{'analyser ms':>13}")
+    for t in report["timings"]:
+        print(f"{t['pages']:>6}{'yes' if t['gas_pair'] else 'no':>10}{t['chars']:>10}"
+              f"{t['legacy_ms']:>12.2f}{t['analyser_ms']:>13.2f}")
+    print(f"\n{'rules':<26}{'providers':>10}{'provider ms':>13}  ({max(args.pages)} pages, no marker)")
+    for t in report["provider_scaling"]:
+        print(f"{t['rules']:<26}{t['providers']:>10}{t['provider_ms']:>13.2f}")
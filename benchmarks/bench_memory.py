@@ -0,0 +1,94 @@
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+
+# Memory the app keeps resident for one providers snapshot: the loaded offers
+# plus the PricingEngine built from them, as dicts (what load_data kept before)
+# vs slotted Offer records (provider_data.lean_data), at N x the current offer
+# count. Measured with tracemalloc as the Python heap still allocated after
+# the load, with the downloaded / read file contents already in memory
+# beforehand (they are freed right after parsing in the app). Every case runs
+# in its own process so interpreter-wide tables (interned strings) start equal.
+#   python benchmarks/bench_memory.py --scale 1 10 100
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "wattsaver_mobile"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_provider_formats import scaled_data
+from pricing import PricingEngine
+from provider_data import CATEGORY_KEYS, dumps_columnar, lean_data, loads_columnar
+
+
+def retained(fn):
+    # (bytes still allocated after fn(), peak bytes during it)
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current, peak
+
+
+def snapshot(data):
+    return data, PricingEngine(data)
+
+
+CASES = {
+    "dicts, Cloud Sync JSON": lambda text, col: snapshot(json.loads(text)),
+    "dicts, columnar asset (no raw_data)": lambda text, col: snapshot(loads_columnar(col, include_raw=False)),
+    "Offer records, Cloud Sync JSON": lambda text, col: snapshot(lean_data(json.loads(text), "providers.json")),
+    "Offer records, columnar asset": lambda text, col: snapshot(
+        lean_data(loads_columnar(col, include_raw=False), "providers.col.json.gz")),
+}
+
+
+def measure_case(name, scale):
+    data = scaled_data(scale)
+    offers = sum(len(data[k]) for k in CATEGORY_KEYS)
+    json_text = json.dumps(data, indent=4, ensure_ascii=False)
+    col_gz = dumps_columnar(data, compress=True)
+    del data
+    current, peak = retained(lambda: CASES[name](json_text, col_gz))
+    return {"offers": offers, "retained_kb": current / 1024, "peak_kb": peak / 1024, "bytes_per_offer": current / offers}
+
+
+def run(scale):
+    results = {}
+    for name in CASES:
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--case", name, "--scale", str(scale)],
+                             capture_output=True, text=True, check=True).stdout
+        results[name] = json.loads(out)
+    offers = next(iter(results.values()))["offers"]
+    return {"scale": scale, "offers": offers, "cases": results}
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Resident memory of a loaded providers snapshot")
+    arg_parser.add_argument("--scale", type=int, nargs="+", default=[1, 10, 100])
+    arg_parser.add_argument("-o", "--output", help="Write the results JSON here")
+    arg_parser.add_argument("--case", choices=list(CASES), help=argparse.SUPPRESS) # Child process: one measurement
+    args = arg_parser.parse_args()
+
+    if args.case:
+        print(json.dumps(measure_case(args.case, args.scale[0])))
+        sys.exit(0)
+
+    reports = []
+    for scale in args.scale:
+        report = run(scale)
+        reports.append(report)
+        print(f"scale {report['scale']}x ({report['offers']} offers)")
+        print(f"  {'':<38}{'retained KiB':>14}{'peak KiB':>12}{'B/offer':>10}")
+        for name, r in report["cases"].items():
+            print(f"  {name:<38}{r['retained_kb']:>14.1f}{r['peak_kb']:>12.1f}{r['bytes_per_offer']:>10.0f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
@@ -0,0 +1,99 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+# PricingEngine vs the per-provider loop update_table used to run.
+#   python benchmarks/bench_pricing.py --scale 1 10 100
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "wattsaver_mobile"))
+
+from pricing import ELECTRICITY, RESIDENTIAL, PricingEngine, regulated_charges_elec
+
+PROVIDERS_JSON = os.path.join(ROOT, "wattsaver_mobile", "assets", "providers.json")
+SLIDER_KWH = range(0, 2001, 10) # Slider: 0-2000, 200 divisions
+DAYS = 30
+
+
+def load_scaled(scale):
+    with open(PROVIDERS_JSON, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    offers = data["providers"]
+    data["providers"] = [
+        dict(p, price_kwh=p["price_kwh"] * (1 + n / 1000)) for n in range(scale) for p in offers
+    ]
+    return data
+
+
+def legacy_update_table(providers, reg_charges, kwh, days, detected_provider="Unknown"):
+    # The loop update_table ran on every slider event (minus the Flet controls)
+    vat_rate = reg_charges.get("vat", 0.06)
+    reg_cost = regulated_charges_elec(reg_charges, kwh, days)
+    results = []
+    for p in providers:
+        final_price = p["price_kwh"] * (1 - p.get("discount_percent", 0))
+        energy_val = kwh * final_price
+        fixed_val = (p["monthly_fee"] / 30) * days
+        cost_energy_total = energy_val + fixed_val
+        total_pre_vat = cost_energy_total + reg_cost
+        vat_val = total_pre_vat * vat_rate
+        total_final = total_pre_vat + vat_val
+        is_det = (detected_provider.lower() in p["name"].lower())
+        results.append({
+            "data": p,
+            "price_disp": f"{final_price:.3f}€",
+            "fixed_disp": f"{fixed_val:.1f}€",
+            "energy_cost": cost_energy_total,
+            "reg_cost": reg_cost,
+            "vat": vat_val,
+            "total": total_final,
+            "is_detected": is_det
+        })
+    results.sort(key=lambda x: (not x["is_detected"], x["total"]))
+    return results
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(scales=(1, 10, 100), repeat=5):
+    report = []
+    for scale in scales:
+        data = load_scaled(scale)
+        providers, reg = data["providers"], data["regulated_charges"]
+        engine = PricingEngine(data)
+
+        # Same ranking and totals as the legacy loop
+        legacy = legacy_update_table(providers, reg, 350, DAYS)
+        quote = engine.quote(ELECTRICITY, RESIDENTIAL, 350, DAYS, "Unknown")
+        assert [r["total"] for r in legacy] == [quote.total[i] for i in quote.order]
+
+        report.append({
+            "scale": scale,
+            "offers": len(providers),
+            "legacy_tick_ms": best_of(lambda: legacy_update_table(providers, reg, 350, DAYS), repeat),
+            "engine_tick_ms": best_of(lambda: engine.quote(ELECTRICITY, RESIDENTIAL, 350, DAYS, "Unknown"), repeat),
+            "legacy_curve_ms": best_of(lambda: [legacy_update_table(providers, reg, k, DAYS) for k in SLIDER_KWH], repeat),
+            "engine_curve_ms": best_of(lambda: engine.curve(ELECTRICITY, RESIDENTIAL, SLIDER_KWH, DAYS), repeat),
+        })
+    return report
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Pricing engine vs legacy update_table loop")
+    arg_parser.add_argument("--scale", type=int, nargs="+", default=[1, 10, 100])
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    print(f"{'offers':>8}{'loop tick':>12}{'engine tick':>13}{'loop curve':>13}{'engine curve':>14}   (ms, {len(SLIDER_KWH)}-point curve)")
+    for r in run(args.scale, args.repeat):
+        print(f"{r['offers']:>8}{r['legacy_tick_ms']:>12.3f}{r['engine_tick_ms']:>13.3f}"
+              f"{r['legacy_curve_ms']:>13.2f}{r['engine_curve_ms']:>14.2f}")
@@ -0,0 +1,92 @@
+import argparse
+import copy
+import gc
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+# Parse time and memory of providers.json vs the columnar asset at N x the
+# current offer count.
+#   python benchmarks/bench_provider_formats.py --scale 10
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "wattsaver_mobile"))
+
+from provider_data import CATEGORY_KEYS, dumps_columnar, loads_columnar
+
+PROVIDERS_JSON = os.path.join(ROOT, "wattsaver_mobile", "assets", "providers.json")
+
+
+def scaled_data(scale):
+    # Repeat every offer `scale` times with distinct programs/prices so the
+    # string table can't collapse the copies into one.
+    with open(PROVIDERS_JSON, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    for key in CATEGORY_KEYS:
+        offers = data.get(key, [])
+        scaled = []
+        for n in range(scale):
+            for offer in offers:
+                o = copy.deepcopy(offer)
+                if n:
+                    o["program"] = f"{o['program']} #{n}"
+                    o["price_kwh"] = round(o["price_kwh"] * (1 + n / 1000), 5)
+                    o["raw_data"][4] = o["program"]
+                    o["raw_data"][9] = str(o["price_kwh"])
+                scaled.append(o)
+        data[key] = scaled
+    return data
+
+
+def measure(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {"median_ms": statistics.median(times) * 1000, "peak_kb": peak / 1024, "retained_kb": retained / 1024}
+
+
+def run(scale=10, repeat=20):
+    data = scaled_data(scale)
+    json_text = json.dumps(data, indent=4, ensure_ascii=False)
+    json_bytes = json_text.encode("utf-8")
+    col_gz = dumps_columnar(data, compress=True)
+    col_plain = dumps_columnar(data, compress=False)
+    assert loads_columnar(col_gz) == json.loads(json_bytes)
+
+    cases = {
+        "json (indent=4)": (len(json_bytes), lambda: json.loads(json_bytes.decode("utf-8"))),
+        "columnar": (len(col_plain), lambda: loads_columnar(col_plain)),
+        "columnar.gz": (len(col_gz), lambda: loads_columnar(col_gz)),
+        "columnar.gz, no raw_data": (len(col_gz), lambda: loads_columnar(col_gz, include_raw=False)),
+    }
+    offers = sum(len(data[k]) for k in CATEGORY_KEYS)
+    results = {}
+    for name, (size, fn) in cases.items():
+        results[name] = dict(measure(fn, repeat), bytes=size)
+    return {"scale": scale, "offers": offers, "formats": results}
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="providers.json vs columnar asset benchmark")
+    arg_parser.add_argument("--scale", type=int, default=10)
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    report = run(args.scale, args.repeat)
+    print(f"{report['offers']} offers ({report['scale']}x)")
+    print(f"{'format':<28}{'size KB':>10}{'parse ms':>10}{'peak KB':>10}{'kept KB':>10}")
+    for name, r in report["formats"].items():
+        print(f"{name:<28}{r['bytes'] / 1024:>10.1f}{r['median_ms']:>10.2f}{r['peak_kb']:>10.0f}{r['retained_kb']:>10.0f}")
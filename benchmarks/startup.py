@@ -0,0 +1,112 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# App cold-start measurement.
+#
+#   python benchmarks/startup.py                 # -X importtime breakdown of `import main`
+#   python benchmarks/startup.py --first-frame   # also launch the app and time the first page.add
+#
+# The import breakdown lists the slowest modules by cumulative import time and
+# flags any module that should only load on demand (PyMuPDF on the first PDF,
+# requests on the first Cloud Sync). --first-frame opens the desktop app with
+# WATTSAVER_TRACE set, waits for its ui.first_frame record and closes it again;
+# it reports the time from `python main.py` to that record, and the part of it
+# after main.py started importing.
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.join(os.path.dirname(BENCH_DIR), "wattsaver_mobile")
+ON_DEMAND = ("fitz", "requests", "bill_parser", "sqlite3")
+
+
+def import_times(module="main"):
+    # [(cumulative us, self us, module)] from `python -X importtime -c "import <module>"`
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=APP_DIR, capture_output=True, text=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"): continue
+        parts = [p.strip() for p in line[len("import time:"):].split("|")]
+        if not parts[0].isdigit(): continue # Header
+        rows.append((int(parts[1]), int(parts[0]), parts[2].strip()))
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"
+        raise RuntimeError(f"import {module} failed: {error}")
+    return rows
+
+
+def first_frame(timeout=60):
+    # (ms from launch to the ui.first_frame record, ms reported by main.py)
+    with tempfile.TemporaryDirectory() as tmp:
+        trace = os.path.join(tmp, "trace.jsonl")
+        env = dict(os.environ, WATTSAVER_TRACE=trace)
+        started = time.time()
+        proc = subprocess.Popen([sys.executable, "main.py"], cwd=APP_DIR, env=env)
+        try:
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                if proc.poll() is not None:
+                    raise RuntimeError(f"app exited with status {proc.returncode} before its first frame")
+                if os.path.exists(trace):
+                    with open(trace, "r", encoding="utf-8") as f:
+                        for line in f:
+                            record = json.loads(line)
+                            if record.get("name") == "ui.first_frame":
+                                return (record["ts"] - started) * 1000, record["ms"]
+                time.sleep(0.05)
+            raise RuntimeError(f"no first frame within {timeout}s")
+        finally:
+            proc.terminate()
+            try:
+                proc.wait(5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Measure app import time and time to first frame")
+    arg_parser.add_argument("--top", type=int, default=15, help="Slowest modules to list")
+    arg_parser.add_argument("--first-frame", action="store_true", help="Launch the app and time its first page.add")
+    arg_parser.add_argument("-o", "--output", help="Write the results JSON here")
+    args = arg_parser.parse_args()
+
+    report = {}
+    try:
+        rows = import_times()
+    except RuntimeError as e:
+        print(e)
+        sys.exit(1)
+
+    total = sum(own for _, own, _ in rows)
+    report["import_ms"] = round(total / 1000, 3)
+    report["slowest"] = [{"module": name, "cumulative_ms": round(cum / 1000, 3), "self_ms": round(own / 1000, 3)}
+                         for cum, own, name in sorted(rows, reverse=True)[:args.top]]
+    loaded = {name.strip() for _, _, name in rows}
+    report["on_demand_loaded"] = [m for m in ON_DEMAND if m in loaded]
+
+    print(f"import main: {report['import_ms']:.1f} ms")
+    print(f"{'module':<40}{'cumulative ms':>15}{'self ms':>10}")
+    for row in report["slowest"]:
+        print(f"{row['module']:<40}{row['cumulative_ms']:>15.1f}{row['self_ms']:>10.1f}")
+    if report["on_demand_loaded"]:
+        print(f"Imported at startup but meant to load on demand: {', '.join(report['on_demand_loaded'])}")
+
+    if args.first_frame:
+        try:
+            launch_ms, app_ms = first_frame()
+        except RuntimeError as e:
+            print(f"first frame: {e}")
+            sys.exit(1)
+        report["first_frame_ms"] = round(launch_ms, 3)
+        report["first_frame_in_app_ms"] = app_ms
+        print(f"first page.add: {launch_ms:.0f} ms after launch ({app_ms:.0f} ms after main.py started)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    sys.exit(1 if report["on_demand_loaded"] else 0)
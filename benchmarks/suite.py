@@ -0,0 +1,344 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+# Offline benchmark suite for the price-comparison pipeline:
+#   parser        BillParser.parse_bill on generated 1, 2 and 20 page PDFs (needs PyMuPDF)
+#   load_data     providers.json / columnar asset -> PricingEngine, at 1x, 10x, 100x offers
+#   update_table  PricingEngine.quote per slider position at the same sizes, and
+#                 PricingEngine.annual over 24 monthly periods (the Year view), and
+#                 HouseholdPlan for one electricity + gas household
+#   ui            ResultsView.render over a slider sweep at 1x, 10x, 100x offers
+#                 (needs Flet); fails if a render after the first creates controls
+#   scraper       table extraction from a saved energycost.gr page (benchmarks/fixtures),
+#                 after checking that the page still gives the offers stored next to it
+#
+#   python benchmarks/suite.py                      # run, compare with baseline.json
+#   python benchmarks/suite.py -o results.json      # also write the results
+#   python benchmarks/suite.py --update-baseline    # accept the current numbers
+#
+# Every result is the best of --repeat runs, in ms. A result slower than the
+# baseline by more than --tolerance (and --min-ms) is a regression, and a
+# result with no baseline entry can't be checked: either makes the exit status
+# 1. Sections whose dependencies are missing are skipped and reported, with a
+# warning listing the baselined results that went unchecked. Baselines are machine-specific: refresh them on the
+# machine that runs the comparison.
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "wattsaver_mobile"))
+sys.path.insert(0, BENCH_DIR)
+
+from bench_provider_formats import scaled_data
+from html_table import extract_largest_table
+from annual import monthly_profile
+from household import HouseholdPlan
+from pricing import ELECTRICITY, RESIDENTIAL, PricingEngine
+from provider_data import dumps_columnar, loads_columnar
+
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+FIXTURE_HTML = os.path.join(BENCH_DIR, "fixtures", "energycost_residential_electricity.html")
+FIXTURE_OFFERS = os.path.join(BENCH_DIR, "fixtures", "energycost_residential_electricity.json") # providers.json "providers" it was scraped as
+SCALES = (1, 10, 100)
+PDF_PAGES = (1, 2, 20)
+SLIDER_KWH = range(0, 2001, 10) # Slider: 0-2000, 200 divisions
+
+
+class Skip(Exception):
+    pass
+
+
+class CheckFailed(Exception):
+    pass
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+# --- parser ---
+
+def bill_page_lines(page, pages):
+    # Latin-only content: the Base-14 PDF fonts can't encode Greek glyphs
+    lines = [f"DEI Customer statement - page {page + 1}/{pages}", "Supply number 1 234 567 890", ""]
+    if page == 0:
+        lines += ["Power kVA 8", "Consumption period 01.01.2025 - 03.03.2025", "Total kWh 345", "Days 62"]
+    for i in range(40):
+        lines.append(f"Item {page * 40 + i:04d}   {(i * 37) % 500},{i % 100:02d}   {(i * 13) % 90}.{i % 10}0")
+    return lines
+
+
+def make_bill_pdf(path, pages):
+    import fitz
+    doc = fitz.open()
+    for p in range(pages):
+        page = doc.new_page()
+        y = 50
+        for line in bill_page_lines(p, pages):
+            page.insert_text((50, y), line, fontsize=9)
+            y += 12
+    doc.save(path)
+    doc.close()
+
+
+def bench_parser(repeat):
+    try:
+        import fitz # noqa: F401
+    except ImportError:
+        raise Skip("PyMuPDF (fitz) is not installed")
+    from bill_parser import BillParser
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in PDF_PAGES:
+            path = os.path.join(tmp, f"bill_{pages}p.pdf")
+            make_bill_pdf(path, pages)
+            for mode, parser in (("layout", BillParser(layout=True)), ("text", BillParser(layout=False))):
+                results[f"parser/{mode}/{pages}p"] = best_of(lambda: parser.parse_bill(path), repeat)
+    return results
+
+
+# --- load_data / update_table ---
+
+def bench_load_data(repeat):
+    # What main.load_data does per source: decode, then build the PricingEngine
+    results = {}
+    for scale in SCALES:
+        data = scaled_data(scale)
+        json_text = json.dumps(data, indent=4, ensure_ascii=False)
+        columnar = dumps_columnar(data, compress=True)
+        results[f"load_data/json/{scale}x"] = best_of(lambda: PricingEngine(json.loads(json_text)), repeat)
+        results[f"load_data/columnar/{scale}x"] = best_of(
+            lambda: PricingEngine(loads_columnar(columnar, include_raw=False)), repeat)
+    return results
+
+
+def bench_update_table(repeat):
+    # Cost of pricing + ranking every offer for one slider position (ms per call)
+    results = {}
+    for scale in SCALES:
+        engine = PricingEngine(scaled_data(scale))
+
+        def sweep():
+            for kwh in SLIDER_KWH:
+                engine.quote(ELECTRICITY, RESIDENTIAL, kwh, 30, "DEI")
+
+        results[f"update_table/quote/{scale}x"] = best_of(sweep, repeat) / len(SLIDER_KWH)
+
+        periods = monthly_profile([300, 250, 280, 200, 180, 350, 500, 520, 300, 220, 260, 330]) * 2
+        results[f"update_table/annual/{scale}x"] = best_of(
+            lambda: engine.annual(ELECTRICITY, RESIDENTIAL, periods, "DEI"), repeat)
+
+        results[f"update_table/household/{scale}x"] = best_of(
+            lambda: HouseholdPlan(engine, RESIDENTIAL, 3400, 5500), repeat)
+    return results
+
+
+def bench_ui(repeat):
+    # One ResultsView render per slider position, as update_table does it
+    # (ms per render). Cards are built on the first render only: every later
+    # one must create no controls. Controls updated per render are reported.
+    try:
+        import flet as ft
+        from results_view import ResultsView
+    except ImportError as e:
+        raise Skip(f"Flet is not installed ({e})")
+    results = {"counters": {}}
+    for scale in SCALES:
+        engine = PricingEngine(scaled_data(scale))
+        quotes = [engine.quote(ELECTRICITY, RESIDENTIAL, kwh, 30, "DEI") for kwh in SLIDER_KWH]
+        view = ResultsView(ft.Column()) # Not on a page: nothing is sent anywhere
+        view.render(quotes[0], "")
+        first = view.stats.as_dict()
+        updated = 0
+        for quote in quotes[1:]:
+            view.render(quote, "")
+            if view.stats.last_created:
+                raise CheckFailed(f"ui/{scale}x: render at {quote.kwh} kWh created "
+                                  f"{view.stats.last_created} controls after the first render")
+            updated += view.stats.last_updated
+
+        def sweep():
+            for quote in quotes:
+                view.render(quote, "")
+
+        results[f"ui/render/{scale}x"] = best_of(sweep, repeat) / len(quotes)
+        results["counters"][f"ui/{scale}x"] = {
+            "first_render_created": first["last_created"],
+            "updated_per_render": round(updated / (len(quotes) - 1), 1),
+        }
+    return results
+
+
+# --- scraper ---
+
+def scaled_fixture(scale):
+    with open(FIXTURE_HTML, "r", encoding="utf-8") as f:
+        html = f.read()
+    head, _, rest = html.partition("<tbody>")
+    body, _, tail = rest.partition("</tbody>")
+    return head + "<tbody>" + body * scale + "</tbody>" + tail
+
+
+def check_fixture(scraper):
+    # The saved page must give exactly the offers providers.json holds for it,
+    # raw_data cells included (provider_diff compares them)
+    with open(FIXTURE_HTML, "r", encoding="utf-8") as f:
+        offers = scraper.rows_to_offers(extract_largest_table([f.read()]), "Residential Electricity")
+    with open(FIXTURE_OFFERS, "r", encoding="utf-8") as f:
+        expected = json.load(f)
+    if len(offers) != len(expected):
+        raise CheckFailed(f"fixture gives {len(offers)} offers, {len(expected)} expected")
+    for i, (offer, want) in enumerate(zip(offers, expected)):
+        for key in want:
+            if offer.get(key) != want[key]:
+                raise CheckFailed(f"fixture offer {i} ({want['name']} - {want['program']}): "
+                                  f"{key} is {offer.get(key)!r}, expected {want[key]!r}")
+
+
+def bench_scraper(repeat):
+    results = {}
+    try:
+        from cloud_scraper import CloudScraper
+        scraper = CloudScraper(backend="static")
+    except ImportError as e:
+        scraper = None # Table extraction is still measured
+        results["skipped"] = f"rows_to_offers: {e}"
+    else:
+        check_fixture(scraper)
+
+    for scale in (1, 10):
+        html = scaled_fixture(scale)
+        # Same 64 KiB chunks fetch_table_static streams from the network
+        chunks = [html[i:i + 65536] for i in range(0, len(html), 65536)]
+        rows = extract_largest_table(chunks)
+        results[f"scraper/html_table/{scale}x"] = best_of(lambda: extract_largest_table(chunks), repeat)
+        if scraper is not None:
+            results[f"scraper/rows_to_offers/{scale}x"] = best_of(
+                lambda: scraper.rows_to_offers(rows, "Residential Electricity"), repeat)
+    return results
+
+
+SECTIONS = {
+    "parser": bench_parser,
+    "load_data": bench_load_data,
+    "update_table": bench_update_table,
+    "ui": bench_ui,
+    "scraper": bench_scraper,
+}
+
+
+def run(sections=None, repeat=5):
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {},
+        "counters": {}, # Non-timing numbers (not compared with the baseline)
+        "skipped": {},
+    }
+    for name in sections or SECTIONS:
+        try:
+            results = SECTIONS[name](repeat)
+        except Skip as e:
+            report["skipped"][name] = str(e)
+            continue
+        if "skipped" in results:
+            report["skipped"][name] = results.pop("skipped")
+        report["counters"].update(results.pop("counters", {}))
+        report["results"].update(results)
+    return report
+
+
+def compare(results, baseline, tolerance=0.5, min_ms=0.05):
+    # [(name, baseline_ms, current_ms, ratio, regressed)] for results in both
+    rows = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None: continue
+        ratio = current / base if base else float("inf")
+        regressed = current > base * (1 + tolerance) and current - base > min_ms
+        rows.append((name, base, current, ratio, regressed))
+    return rows
+
+
+def load_baseline(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("results", {})
+    except OSError:
+        return {}
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Offline benchmark suite with baseline comparison")
+    arg_parser.add_argument("--only", nargs="+", choices=list(SECTIONS), help="Run only these sections")
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("-o", "--output", help="Write the results JSON here")
+    arg_parser.add_argument("--baseline", default=BASELINE_FILE)
+    arg_parser.add_argument("--update-baseline", action="store_true", help="Store these results as the baseline")
+    arg_parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed slowdown (0.5 = 50%%)")
+    arg_parser.add_argument("--min-ms", type=float, default=0.05, help="Ignore slowdowns smaller than this")
+    args = arg_parser.parse_args()
+
+    try:
+        report = run(args.only, args.repeat)
+    except CheckFailed as e:
+        print(f"Check failed: {e}")
+        sys.exit(1)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    for name, reason in report["skipped"].items():
+        print(f"skipped {name}: {reason}")
+    for name, counters in report["counters"].items():
+        print(f"{name}: " + ", ".join(f"{k}={v}" for k, v in counters.items()))
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        # Keep entries of sections that couldn't run here
+        merged = dict(baseline.get("results", {}), **{k: round(v, 4) for k, v in report["results"].items()})
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(dict(report, results=merged), f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline updated: {args.baseline} ({len(merged)} results)")
+        sys.exit(0)
+
+    baseline = load_baseline(args.baseline)
+    rows = compare(report["results"], baseline, args.tolerance, args.min_ms)
+    print(f"{'benchmark':<34}{'baseline ms':>12}{'current ms':>12}{'ratio':>8}")
+    for name, base, current, ratio, regressed in rows:
+        print(f"{name:<34}{base:>12.3f}{current:>12.3f}{ratio:>8.2f}{'  REGRESSION' if regressed else ''}")
+    # A result without a baseline can't be checked: that fails too
+    unchecked = [name for name in report["results"] if name not in baseline]
+    for name in unchecked:
+        print(f"{name:<34}{'-':>12}{report['results'][name]:>12.3f}  NO BASELINE")
+    # Baseline entries of sections (or parts of them) skipped here go unchecked
+    not_run = [name for name in baseline
+               if name.split("/")[0] in report["skipped"] and name not in report["results"]]
+    if not_run:
+        print(f"warning: {len(not_run)} baselined benchmark(s) not run here: {', '.join(not_run)}")
+
+    failed = False
+    regressions = [row[0] for row in rows if row[4]]
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        failed = True
+    if unchecked:
+        print(f"{len(unchecked)} benchmark(s) without a baseline entry: {', '.join(unchecked)} "
+              "(record them with --update-baseline)")
+        failed = True
+    sys.exit(1 if failed else 0)
@@ -1,20 +1,237 @@
+import argparse
 import json
 import os
+import queue
 import sys
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import codecs
+import requests
+from requests.adapters import HTTPAdapter
+from html_table import clean_text, extract_largest_table
+from provider_diff import diff_snapshots, write_change_log, write_json_atomic
+from price_history import HISTORY_LOG, append_snapshot
 import time
 
+# Selenium is only needed when a table is rendered by JavaScript.
+# Slim installs (static backend only) can leave it out.
+try:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.support.ui import WebDriverWait
+    from webdriver_manager.chrome import ChromeDriverManager
+except ImportError:
+    webdriver = None
+
 # Ensure we can find the assets folder relative to this script
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_FILE = os.path.join(BASE_DIR, "wattsaver_mobile", "assets", "providers.json")
+COLUMNAR_FILE = os.path.join(BASE_DIR, "wattsaver_mobile", "assets", "providers.col.json.gz")
+CHANGES_DIR = os.path.join(os.path.dirname(OUTPUT_FILE), "changes")
+# Categories fetched by today's unfinished run (see Checkpoint); not committed
+CHECKPOINT_FILE = os.path.join(BASE_DIR, ".scrape_checkpoint.json")
+
+# Per-category retries: attempt n+1 starts RETRY_BACKOFF * 2**n seconds after attempt n failed
+RETRIES = 2
+RETRY_BACKOFF = 5.0
+# Whole-run fetch budget in seconds; no new attempt starts after it
+TIME_BUDGET = 1200.0
+
+# Shared data-format helpers live with the app
+sys.path.insert(0, os.path.join(BASE_DIR, "wattsaver_mobile"))
+from provider_data import write_columnar
+import instrument # Spans / counters as JSON lines when WATTSAVER_TRACE is set
+from scrape_schema import (MAX_REJECT_RATE, MAX_ROW_DELTA, ColumnMap, RowStats, SchemaError,
+                           check_category, validate_rows)
+
+# "static": plain HTTP + HTML parsing only
+# "selenium": headless Chrome only (the original behaviour)
+# "auto": static first, Chrome only for tables that are not in the served HTML
+BACKENDS = ("auto", "static", "selenium")
+
+# Fewest rows (header + one offer) for a table to count as the offers table
+MIN_TABLE_ROWS = 2
+
+# Runs in the browser: row count of the table with the most rows, the one
+# EXTRACT_TABLE_JS reads (rows of menus / layout tables elsewhere don't count)
+ROW_COUNT_JS = """
+let most = 0;
+for (const t of document.getElementsByTagName('table')) {
+    most = Math.max(most, t.getElementsByTagName('tr').length);
+}
+return most;
+"""
+
+# Runs in the browser: the table with the most rows as a 2-D array of <td> texts
+# (<th> texts for header rows, like html_table).
+# One WebDriver round trip instead of one per table, row and cell.
+EXTRACT_TABLE_JS = """
+const tables = document.getElementsByTagName('table');
+if (!tables.length) return null;
+let best = tables[0];
+for (const t of tables) {
+    if (t.getElementsByTagName('tr').length > best.getElementsByTagName('tr').length) best = t;
+}
+return Array.from(best.getElementsByTagName('tr'), tr => {
+    const tds = tr.getElementsByTagName('td');
+    return Array.from(tds.length ? tds : tr.getElementsByTagName('th'), td => td.innerText.trim());
+});
+"""
+
+class RowCountStable:
+    # WebDriverWait condition: the largest table has at least `min_rows` rows
+    # and its row count stayed the same for `polls` consecutive checks (the JS
+    # table finished filling in).
+    def __init__(self, polls=3, min_rows=MIN_TABLE_ROWS):
+        self.polls = polls
+        self.min_rows = min_rows
+        self.last_count = None
+        self.stable_checks = 0
+
+    def __call__(self, driver):
+        count = driver.execute_script(ROW_COUNT_JS)
+        if count and count >= self.min_rows and count == self.last_count:
+            self.stable_checks += 1
+        else:
+            self.stable_checks = 0
+        self.last_count = count
+        return self.stable_checks >= self.polls - 1
+
+class DriverPool:
+    # Bounded pool of reusable headless Chrome sessions.
+    # Sessions are started lazily (at most `size` of them) and handed back after
+    # each page, so a run pays the browser startup cost once per worker, not per page.
+    def __init__(self, driver_path, options, size=1):
+        self.driver_path = driver_path
+        self.options = options
+        self.size = max(1, size)
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._drivers = []
+
+    def _start_driver(self):
+        with instrument.span("scraper.driver_start"):
+            service = Service(self.driver_path)
+            return webdriver.Chrome(service=service, options=self.options)
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_start = len(self._drivers) < self.size
+            if can_start:
+                self._drivers.append(None) # Reserve the slot while Chrome starts
+
+        if not can_start:
+            return self._idle.get()
+
+        try:
+            driver = self._start_driver()
+        except Exception:
+            with self._lock:
+                self._drivers.remove(None)
+            raise
+
+        with self._lock:
+            self._drivers[self._drivers.index(None)] = driver
+        return driver
+
+    def release(self, driver, broken=False):
+        if not broken:
+            self._idle.put(driver)
+            return
+        # A crashed/hung session is dropped so the next acquire starts a fresh one
+        with self._lock:
+            if driver in self._drivers: self._drivers.remove(driver)
+        try: driver.quit()
+        except Exception: pass
+
+    @contextmanager
+    def session(self):
+        driver = self.acquire()
+        broken = False
+        try:
+            yield driver
+        except Exception:
+            broken = True
+            raise
+        finally:
+            self.release(driver, broken)
+
+    def close(self):
+        with self._lock:
+            drivers = [d for d in self._drivers if d is not None]
+            self._drivers = []
+        for driver in drivers:
+            try: driver.quit()
+            except Exception: pass
+
+class Checkpoint:
+    # Categories that today's run already fetched and validated, so a re-run
+    # after a failure only fetches the rest. Saved after every category and
+    # removed once a run completes with all categories; a checkpoint from an
+    # earlier day is ignored.
+    def __init__(self, path, run_id):
+        self.path = path
+        self.run_id = run_id
+        self.lock = threading.Lock()
+        self.categories = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                doc = json.load(f)
+            if doc.get("run_id") == run_id:
+                self.categories = doc.get("categories", {})
+        except (OSError, ValueError):
+            pass
+
+    def get(self, key):
+        # (offers, RowStats) or None
+        entry = self.categories.get(key)
+        if entry is None: return None
+        return entry["offers"], RowStats.from_dict(entry["stats"])
+
+    def save(self, key, offers, stats):
+        with self.lock:
+            self.categories[key] = {"offers": offers, "stats": stats.as_dict()}
+            self._write()
+
+    def logged(self, key):
+        # Whether the category's offers are already in the price history
+        return self.categories.get(key, {}).get("logged", False)
+
+    def mark_logged(self, keys):
+        with self.lock:
+            keys = [key for key in keys if key in self.categories]
+            if not keys: return
+            for key in keys:
+                self.categories[key]["logged"] = True
+            self._write()
+
+    def _write(self):
+        write_json_atomic(self.path, {"run_id": self.run_id, "categories": self.categories}, separators=(",", ":"))
+
+    def clear(self):
+        with self.lock:
+            self.categories = {}
+            if os.path.exists(self.path): os.remove(self.path)
 
 class CloudScraper:
-    def __init__(self):
+    def __init__(self, backend="auto", max_reject_rate=MAX_REJECT_RATE, max_row_delta=MAX_ROW_DELTA,
+                 retries=RETRIES, backoff=RETRY_BACKOFF, time_budget=TIME_BUDGET):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
+        self.backend = backend
+        self.max_reject_rate = max_reject_rate
+        self.max_row_delta = max_row_delta
+        self.retries = retries
+        self.backoff = backoff
+        self.time_budget = time_budget
+        self.row_stats = {} # category label -> RowStats of its last parsed table
+
         # Residential
         self.url_elec_res = "https://energycost.gr/υπολογισμός-τιμής-βάσει-κατανάλωσης-2/"
         self.url_gas_res = "https://energycost.gr/υπολογισμός-τιμής-βάσει-οι_gas/"
@@ -23,84 +240,201 @@ class CloudScraper:
         self.url_elec_bus = "https://energycost.gr/υπολογισμός-τιμής-βάσει-κατανάλωσης-3/"
         self.url_gas_bus = "https://energycost.gr/υπολογισμός-τιμής-βάσει-επ_gas/"
 
-        self.options = webdriver.ChromeOptions()
-        self.options.add_argument("--headless")
-        self.options.add_argument("--disable-gpu")
-        self.options.add_argument("--no-sandbox")
-        self.options.add_argument("--disable-dev-shm-usage")
-        self.options.add_argument("--window-size=1920,1080")
+        # (providers.json key, url, category label, summary label)
+        self.categories = [
+            ("providers", self.url_elec_res, "Residential Electricity", "Elec_Res"),
+            ("gas_providers", self.url_gas_res, "Residential Gas", "Gas_Res"),
+            ("providers_business", self.url_elec_bus, "Business Electricity", "Elec_Bus"),
+            ("gas_providers_business", self.url_gas_bus, "Business Gas", "Gas_Bus"),
+        ]
 
-    def fetch_table(self, url, category_name):
-        print(f"Fetching {category_name}: {url}")
-        driver = None
-        results = []
+        # One keep-alive connection pool shared by every category (same host)
+        self.http = requests.Session()
+        self.http.headers["User-Agent"] = "Mozilla/5.0 (X11; Linux x86_64) WattSaver/1.0"
+        self.http.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=len(self.categories)))
+        self.http.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=len(self.categories)))
+
+        self.options = None
+        if webdriver is not None:
+            self.options = webdriver.ChromeOptions()
+            self.options.add_argument("--headless")
+            self.options.add_argument("--disable-gpu")
+            self.options.add_argument("--no-sandbox")
+            self.options.add_argument("--disable-dev-shm-usage")
+            self.options.add_argument("--window-size=1920,1080")
+
+    def fetch_table_static(self, url, category_name):
+        # Fetch the page over HTTP and stream it through the HTML table parser.
+        # Returns None when the served HTML has no usable table (JS-rendered page).
+        print(f"Fetching {category_name} (static): {url}")
         try:
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=self.options)
-            driver.get(url)
+            with instrument.span("scraper.static_fetch", category=category_name) as span, \
+                    self.http.get(url, timeout=30, stream=True) as resp:
+                resp.raise_for_status()
+                content_type = resp.headers.get("Content-Type", "")
+                charset = content_type.partition("charset=")[2].split(";")[0].strip() or "utf-8"
+                decoder = codecs.getincrementaldecoder(charset)(errors="replace")
+                chunks = (decoder.decode(chunk) for chunk in resp.iter_content(chunk_size=65536))
+                rows = extract_largest_table(chunks)
+                span.set(rows=len(rows or ()))
+        except Exception as e:
+            print(f"Static fetch failed for {url}: {e}")
+            return None
+
+        if not rows or len(rows) < MIN_TABLE_ROWS:
+            print("No table in static HTML.")
+            return None
 
-            wait = WebDriverWait(driver, 30)
-            wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")))
-            time.sleep(5) 
-
-            tables = driver.find_elements(By.TAG_NAME, "table")
-            if not tables:
-                print("No tables found.")
-                return []
-
-            target_table = max(tables, key=lambda t: len(t.find_elements(By.TAG_NAME, "tr")))
-            rows = target_table.find_elements(By.TAG_NAME, "tr")
-            print(f"Found {len(rows)} rows.")
-
-            for row in rows[1:]:
-                cols = row.find_elements(By.TAG_NAME, "td")
-                if not cols: continue
-                raw_data = [c.text for c in cols]
-                if len(raw_data) > 2:
-                    try:
-                        # Common parsing logic (Assuming table structure is similar across pages)
-                        # Adapting to match providers.json structure
-                        name = raw_data[1]
-                        program = raw_data[4]
-                        
-                        fee_str = raw_data[7].replace(',', '.')
-                        monthly_fee = float(fee_str) if fee_str.strip() else 0.0
-                        
-                        price_str = raw_data[9].replace(',', '.')
-                        price_kwh = float(price_str) if price_str.strip() else 0.0
-                        
-                        results.append({
-                            "name": name,
-                            "program": program,
-                            "type": "Live",
-                            "category": category_name, # Tag the category
-                            "price_kwh": price_kwh,
-                            "monthly_fee": monthly_fee,
-                            "discount_percent": 0.0,
-                            "color": "#d35400",
-                            "raw_data": raw_data 
-                        })
-                    except Exception as e:
-                        # Only print error if it's not a header/empty row issue
-                        if "list index" not in str(e):
-                             print(f"Row parse error: {e}")
-                        continue
-            return results
+        print(f"Found {len(rows)} rows.")
+        return self.rows_to_offers(rows, category_name) or None
 
+    def fetch_table(self, url, category_name, pool=None):
+        print(f"Fetching {category_name}: {url}")
+        own_pool = pool is None
+        if own_pool:
+            # Standalone call: resolve the driver and start a single session just for this page
+            pool = DriverPool(ChromeDriverManager().install(), self.options)
+        try:
+            with pool.session() as driver:
+                return self._scrape_page(driver, url, category_name)
         except Exception as e:
             print(f"Error scraping {url}: {e}")
             return []
         finally:
-            if driver: driver.quit()
+            if own_pool: pool.close()
+
+    def _scrape_page(self, driver, url, category_name):
+        with instrument.span("scraper.page_load", category=category_name):
+            driver.get(url)
+
+        # Wait until the row count settles instead of sleeping a fixed 5s
+        with instrument.span("scraper.page_wait", category=category_name):
+            wait = WebDriverWait(driver, 30, poll_frequency=0.5)
+            wait.until(RowCountStable())
+
+        with instrument.span("scraper.table_extract", category=category_name) as span:
+            table = driver.execute_script(EXTRACT_TABLE_JS)
+            span.set(rows=len(table or ()))
+        # innerText keeps <br> as a line break; same cell text as the static backend
+        table = [[clean_text(cell) for cell in row] for row in table or ()]
+        if not table:
+            print("No tables found.")
+            return []
+
+        print(f"Found {len(table)} rows.")
+        return self.rows_to_offers(table, category_name)
+
+    def rows_to_offers(self, rows, category_name):
+        # `rows`: every <tr> of the table as a list of its cell texts (header first).
+        # Shared by the Selenium and static backends so both emit identical offers.
+        # Columns come from the header (scrape_schema); invalid rows are counted
+        # in self.row_stats[category_name], which run() checks before writing.
+        stats = self.row_stats[category_name] = RowStats()
+        try:
+            columns = ColumnMap.resolve(rows)
+        except SchemaError as e:
+            stats.error = str(e)
+            print(f"{category_name}: {e}")
+            return []
+        results = list(validate_rows(rows, columns, category_name, stats))
+        if stats.rejected:
+            print(f"{category_name}: {stats.rejected} row(s) rejected {stats.reasons}")
+        return results
+
+    def fetch_all(self, workers=1, checkpoint=None):
+        # Scrape every category with `workers` threads.
+        # Chrome is only started for categories the static backend can't read;
+        # those share a pool of `workers` sessions and the chromedriver binary
+        # is resolved once per run, not once per page.
+        # A category that comes back empty is retried with exponential backoff
+        # while the run's time budget lasts; categories in `checkpoint` are not
+        # fetched again and good new ones are added to it.
+        # Returns {key: (rows, seconds)}
+        workers = max(1, min(workers, len(self.categories)))
+        pool = None
+        pool_lock = threading.Lock()
+        deadline = time.monotonic() + self.time_budget
+
+        def selenium_pool():
+            nonlocal pool
+            with pool_lock:
+                if pool is None:
+                    if webdriver is None:
+                        raise RuntimeError("Selenium is not installed")
+                    pool = DriverPool(ChromeDriverManager().install(), self.options, size=workers)
+                return pool
+
+        def fetch_once(url, category_name, span):
+            rows = None
+            if self.backend in ("auto", "static"):
+                rows = self.fetch_table_static(url, category_name)
+                span.set(backend="static")
+            if rows is None and self.backend in ("auto", "selenium"):
+                span.set(backend="selenium")
+                # Driver download / session start failures count as a failed
+                # attempt, like fetch_table's own errors; the next attempt retries
+                try:
+                    rows = self.fetch_table(url, category_name, pool=selenium_pool())
+                except Exception as e:
+                    print(f"Cannot fall back to Selenium for {category_name}: {e}")
+            return rows or []
+
+        def timed_fetch(category):
+            key, url, category_name, _ = category
+            start = time.perf_counter()
+            saved = checkpoint.get(key) if checkpoint else None
+            if saved is not None:
+                rows, self.row_stats[category_name] = saved
+                print(f"{category_name}: {len(rows)} offers from the checkpoint")
+                return key, (rows, 0.0)
+
+            rows = []
+            with instrument.span("scraper.category", category=category_name) as span:
+                for attempt in range(self.retries + 1):
+                    if attempt:
+                        delay = self.backoff * 2 ** (attempt - 1)
+                        if time.monotonic() + delay >= deadline:
+                            print(f"{category_name}: time budget spent, no more retries")
+                            break
+                        print(f"{category_name}: attempt {attempt + 1} in {delay:g}s")
+                        instrument.count("scraper.retry")
+                        time.sleep(delay)
+                    elif time.monotonic() >= deadline:
+                        print(f"{category_name}: time budget spent, not fetched")
+                        break
+                    rows = fetch_once(url, category_name, span)
+                    stats = self.row_stats.get(category_name)
+                    # A table that was read but is unusable won't get better on a retry
+                    if rows or (stats is not None and stats.error): break
+                span.set(offers=len(rows), attempts=attempt + 1)
+
+            stats = self.row_stats.get(category_name)
+            if checkpoint and rows and stats is not None and stats.reject_rate <= self.max_reject_rate:
+                checkpoint.save(key, rows, stats)
+            return key, (rows, time.perf_counter() - start)
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return dict(executor.map(timed_fetch, self.categories))
+        finally:
+            if pool: pool.close()
+
+    def run(self, workers=1, checkpoint_path=CHECKPOINT_FILE):
+        # Returns the labels of the categories that could not be fetched
+        # (their previous data is kept). checkpoint_path=None disables checkpointing.
+        print(f"Starting Cloud Scrape ({self.backend} backend, {workers} worker(s))...")
+        run_start = time.perf_counter()
+        import datetime
+        today = datetime.datetime.now().strftime("%Y-%m-%d")
+        checkpoint = Checkpoint(checkpoint_path, today) if checkpoint_path else None
 
-    def run(self):
-        print("Starting Cloud Scrape...")
-        
         # Fetch all 4 categories
-        elec_res = self.fetch_table(self.url_elec_res, "Residential Electricity")
-        gas_res = self.fetch_table(self.url_gas_res, "Residential Gas")
-        elec_bus = self.fetch_table(self.url_elec_bus, "Business Electricity")
-        gas_bus = self.fetch_table(self.url_gas_bus, "Business Gas")
+        fetched = self.fetch_all(workers, checkpoint)
+        failed = [label for key, _, _, label in self.categories if not fetched[key][0]]
+        elec_res = fetched["providers"][0]
+        gas_res = fetched["gas_providers"][0]
+        elec_bus = fetched["providers_business"][0]
+        gas_bus = fetched["gas_providers_business"][0]
         
         # Load existing
         existing_data = {}
@@ -108,9 +442,7 @@ class CloudScraper:
             with open(OUTPUT_FILE, "r", encoding="utf-8") as f:
                 existing_data = json.load(f)
         
-        # Update timestamp
-        import datetime
-        existing_data["last_updated"] = datetime.datetime.now().strftime("%Y-%m-%d")
+        new_data = dict(existing_data)
         
         # Store Data
         # We'll map them to specific keys.
@@ -119,19 +451,89 @@ class CloudScraper:
         # 'providers_business' -> Business Electricity
         # 'gas_providers_business' -> Business Gas
         
-        if elec_res: existing_data["providers"] = elec_res
-        if gas_res: existing_data["gas_providers"] = gas_res
-        if elec_bus: existing_data["providers_business"] = elec_bus
-        if gas_bus: existing_data["gas_providers_business"] = gas_bus
+        if elec_res: new_data["providers"] = elec_res
+        if gas_res: new_data["gas_providers"] = gas_res
+        if elec_bus: new_data["providers_business"] = elec_bus
+        if gas_bus: new_data["gas_providers_business"] = gas_bus
 
-        print(f"Summary: Elec_Res={len(elec_res)}, Gas_Res={len(gas_res)}, Elec_Bus={len(elec_bus)}, Gas_Bus={len(gas_bus)}")
+        summary = ", ".join(
+            f"{label}={len(fetched[key][0])} ({fetched[key][1]:.1f}s)" for key, _, _, label in self.categories
+        )
+        print(f"Summary: {summary} | Total {time.perf_counter() - run_start:.1f}s")
 
-        # Ensure dir exists
-        os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
-        
-        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-            json.dump(existing_data, f, indent=4, ensure_ascii=False)
+        # Nothing is recorded or written if any table looks wrong
+        problems = []
+        for key, _, category_name, label in self.categories:
+            problems += check_category(label, self.row_stats.get(category_name), len(fetched[key][0]),
+                                       len(existing_data.get(key) or ()), self.max_reject_rate, self.max_row_delta)
+        if problems:
+            raise SchemaError("Validation failed, nothing written:\n  " + "\n  ".join(problems))
+
+        if failed:
+            print(f"No data for {', '.join(failed)}; keeping their previous offers. "
+                  "Re-run to fetch only these.")
+
+        # Every run is recorded in the price history, changed or not. A category
+        # restored from the checkpoint was recorded by the run that fetched it
+        # (unless that run stopped before this point).
+        unlogged = {key: fetched[key][0] for key in fetched
+                    if fetched[key][0] and not (checkpoint and checkpoint.logged(key))}
+        recorded = append_snapshot(unlogged, today, HISTORY_LOG)
+        if checkpoint: checkpoint.mark_logged(unlogged)
+        print(f"History: {recorded} offer(s) recorded for {today}")
+
+        # Only touch the snapshot when an offer actually changed
+        deltas = diff_snapshots(existing_data, new_data)
+        if not deltas:
+            print("No offer changes; snapshot left untouched.")
+            # providers.json may still have been edited by hand (regulated
+            # charges, meta) and the app prefers the columnar asset: rebuild it
+            # every run. The bytes are reproducible, so unchanged data is no git change.
+            if existing_data: write_columnar(existing_data, COLUMNAR_FILE)
+            if checkpoint and not failed: checkpoint.clear()
+            return failed
+
+        # Update timestamp
+        new_data["last_updated"] = today
+
+        for key, delta in deltas.items():
+            print(f"{key}: +{len(delta['added'])} -{len(delta['removed'])} ~{len(delta['changed'])}")
+
+        write_json_atomic(OUTPUT_FILE, new_data, indent=4)
         print(f"Saved to {OUTPUT_FILE}")
+        write_columnar(new_data, COLUMNAR_FILE)
+        print(f"Saved to {COLUMNAR_FILE}")
+        change_file = write_change_log(CHANGES_DIR, today, existing_data.get("last_updated"), deltas)
+        print(f"Change log: {change_file}")
+        if checkpoint and not failed: checkpoint.clear()
+        return failed
 
 if __name__ == "__main__":
-    CloudScraper().run()
\ No newline at end of file
+    arg_parser = argparse.ArgumentParser(description="Scrape energycost.gr into providers.json")
+    arg_parser.add_argument("--workers", type=int, default=1,
+                            help="Parallel fetches / browser sessions (1 = one category at a time)")
+    arg_parser.add_argument("--backend", choices=BACKENDS, default="auto",
+                            help="static = HTTP only, selenium = headless Chrome, auto = static with Chrome fallback")
+    arg_parser.add_argument("--max-reject-rate", type=float, default=MAX_REJECT_RATE,
+                            help="Abort if more than this share of a table's rows fails validation")
+    arg_parser.add_argument("--max-row-delta", type=float, default=MAX_ROW_DELTA,
+                            help="Abort if a category's offer count changes by more than this share")
+    arg_parser.add_argument("--retries", type=int, default=RETRIES, help="Extra attempts per category")
+    arg_parser.add_argument("--backoff", type=float, default=RETRY_BACKOFF,
+                            help="Seconds before the first retry, doubled for each further one")
+    arg_parser.add_argument("--time-budget", type=float, default=TIME_BUDGET,
+                            help="Seconds after which no new fetch attempt starts")
+    arg_parser.add_argument("--no-checkpoint", action="store_true",
+                            help="Fetch every category, ignoring (and not writing) the checkpoint")
+    args = arg_parser.parse_args()
+    scraper = CloudScraper(backend=args.backend, max_reject_rate=args.max_reject_rate, max_row_delta=args.max_row_delta,
+                           retries=args.retries, backoff=args.backoff, time_budget=args.time_budget)
+    try:
+        with instrument.profile("scraper.run"), instrument.span("scraper.run", backend=args.backend, workers=args.workers):
+            failed = scraper.run(workers=args.workers, checkpoint_path=None if args.no_checkpoint else CHECKPOINT_FILE)
+    except SchemaError as e:
+        print(e)
+        sys.exit(1)
+    # Partial update: the fetched categories were written, the failed ones are
+    # still missing from the checkpoint, so a re-run fetches only those
+    if failed: sys.exit(3)
@@ -0,0 +1,97 @@
+import re
+from html.parser import HTMLParser
+
+# Streaming extraction of the largest <table> in an HTML document.
+# Mirrors what CloudScraper.fetch_table reads through Selenium:
+# every <tr> of the table with the most rows, as a list of its <td> texts
+# (header rows without <td> cells come out as their <th> texts, which is how
+# scrape_schema finds the columns).
+
+SKIP_TAGS = {"script", "style", "noscript", "template"}
+
+# HTML whitespace and &nbsp;. Other Unicode spaces (e.g. U+202F) are cell text.
+WHITESPACE = re.compile(r"[ \t\n\r\f\xa0]+")
+
+
+def clean_text(text):
+    # Cell text as providers.json holds it: every whitespace run, line breaks
+    # included, is one space
+    return WHITESPACE.sub(" ", text).strip(" ")
+
+
+class LargestTableParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.best_rows = None
+        self._tables = []   # Stack of open tables, each a list of rows
+        self._row = None    # Cells of the open <tr> (innermost table)
+        self._headers = []  # <th> texts of the open <tr>
+        self._cell_tag = None
+        self._cell = None   # Text parts of the open <td>
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "table":
+            self._close_row()
+            self._tables.append([])
+        elif not self._tables:
+            return
+        elif tag == "tr":
+            self._close_row()
+            self._row = []
+        elif tag in ("td", "th"):
+            self._close_cell()
+            if self._row is None: self._row = []
+            self._cell = []
+            self._cell_tag = tag
+        elif tag == "br" and self._cell is not None:
+            self._cell.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif not self._tables:
+            return
+        elif tag == "table":
+            self._close_row()
+            rows = self._tables.pop()
+            if self.best_rows is None or len(rows) > len(self.best_rows):
+                self.best_rows = rows
+        elif tag == "tr":
+            self._close_row()
+        elif tag in ("td", "th"):
+            self._close_cell()
+
+    def handle_data(self, data):
+        if self._cell is not None and not self._skip_depth:
+            self._cell.append(data)
+
+    def _close_cell(self):
+        if self._cell is not None and self._row is not None:
+            # <th> cells only count for rows that have no <td> at all
+            (self._row if self._cell_tag == "td" else self._headers).append(clean_text("".join(self._cell)))
+        self._cell = None
+
+    def _close_row(self):
+        self._close_cell()
+        if self._row is not None and self._tables:
+            self._tables[-1].append(self._row or self._headers)
+        self._row = None
+        self._headers = []
+
+    def close(self):
+        super().close()
+        # Unterminated tables still count (truncated or sloppy markup)
+        while self._tables:
+            self.handle_endtag("table")
+
+
+def extract_largest_table(chunks):
+    # `chunks` is any iterable of decoded HTML text pieces (e.g. a streamed response)
+    parser = LargestTableParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    parser.close()
+    return parser.best_rows
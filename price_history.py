@@ -0,0 +1,219 @@
+import argparse
+import csv
+import datetime
+import io
+import json
+import os
+import sqlite3
+
+from provider_diff import CATEGORY_KEYS
+
+# Daily price history of every offer.
+#
+# Source of truth: history/offers.csv, one row per offer per scraped day.
+# The scraper only ever appends to it, so it stays small in git (a day is ~200
+# added lines) and nothing is lost when providers.json is overwritten.
+#
+# Queries go through a SQLite index next to it (history/price_history.sqlite3,
+# not committed), indexed by (name, program, category, date) and
+# (category, date). PriceHistory brings the index up to date on open by
+# reading only the bytes appended since the last sync; a rewritten log is
+# re-indexed from scratch. If a category was recorded twice on one day (manual
+# re-run), the rows of its latest run win; a re-run that fetched only some
+# categories leaves the day's other categories as they were.
+#
+#   python price_history.py history "ΔΕΗ" "ΔΕΗ myHome Online" --category providers
+#   python price_history.py cheapest --category providers --days 365 --kwh 300
+#   python price_history.py export 2025-06-01 -o snapshot.json
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTORY_DIR = os.path.join(BASE_DIR, "history")
+HISTORY_LOG = os.path.join(HISTORY_DIR, "offers.csv")
+HISTORY_INDEX = os.path.join(HISTORY_DIR, "price_history.sqlite3")
+
+# raw_data is left out: nothing prices from it and it would triple the log
+COLUMNS = ("date", "run", "key", "name", "program", "category", "type",
+           "price_kwh", "monthly_fee", "discount_percent", "color")
+OFFER_FIELDS = COLUMNS[3:]
+NUMERIC = ("price_kwh", "monthly_fee", "discount_percent")
+
+
+def append_snapshot(data, date, log_path=HISTORY_LOG):
+    # Append the offers of every category present in `data` as `date`'s rows.
+    # Returns the number of rows written.
+    run = datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S")
+    rows = []
+    for key in CATEGORY_KEYS:
+        for offer in data.get(key) or []:
+            rows.append([date, run, key] + [offer.get(c, "") for c in OFFER_FIELDS])
+    if not rows: return 0
+
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    new_file = not os.path.exists(log_path) or os.path.getsize(log_path) == 0
+    with open(log_path, "a", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        if new_file: writer.writerow(COLUMNS)
+        writer.writerows(rows)
+        f.flush()
+        os.fsync(f.fileno())
+    return len(rows)
+
+
+class PriceHistory:
+    def __init__(self, log_path=HISTORY_LOG, index_path=HISTORY_INDEX):
+        self.log_path = log_path
+        self.conn = sqlite3.connect(index_path)
+        self.conn.row_factory = sqlite3.Row
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS offers (
+                    date TEXT NOT NULL, run TEXT NOT NULL, key TEXT NOT NULL,
+                    name TEXT NOT NULL, program TEXT NOT NULL,
+                    category TEXT, type TEXT, price_kwh REAL, monthly_fee REAL,
+                    discount_percent REAL, color TEXT
+                )""")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS offers_program ON offers (name, program, key, date)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS offers_day ON offers (key, date)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS sync (offset INTEGER NOT NULL, head TEXT NOT NULL)")
+        self.sync()
+
+    def close(self):
+        self.conn.close()
+
+    def _synced(self):
+        row = self.conn.execute("SELECT offset, head FROM sync").fetchone()
+        return (row["offset"], row["head"]) if row else (0, "")
+
+    def sync(self):
+        # Index whatever was appended to the log since the last sync
+        if not os.path.exists(self.log_path): return 0
+        offset, head = self._synced()
+        with open(self.log_path, "rb") as f:
+            current_head = f.read(4096).decode("utf-8", "replace")
+            size = f.seek(0, os.SEEK_END)
+            # A shorter file or a different start means the log was rewritten
+            if size < offset or (offset and not current_head.startswith(head)):
+                offset = 0
+            if offset == size: return 0
+            f.seek(offset)
+            appended = f.read(size - offset)
+
+        # Only complete lines; a partial last line is picked up next time
+        end = appended.rfind(b"\n") + 1
+        text = appended[:end].decode("utf-8")
+        reader = csv.reader(io.StringIO(text))
+        rows = [r for r in reader if r and r[0] != COLUMNS[0]]
+
+        # One run per (day, category): the latest one seen so far
+        latest = {}
+        for r in rows:
+            if r[1] > latest.get((r[0], r[2]), ""): latest[(r[0], r[2])] = r[1]
+        rows = [r for r in rows if r[1] == latest[(r[0], r[2])]]
+
+        with self.conn:
+            if offset == 0:
+                self.conn.execute("DELETE FROM offers")
+            for (date, key), run in latest.items():
+                self.conn.execute("DELETE FROM offers WHERE date = ? AND key = ? AND run < ?", (date, key, run))
+            self.conn.executemany(f"INSERT INTO offers ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                                  (self._typed(r) for r in rows))
+            self.conn.execute("DELETE FROM sync")
+            self.conn.execute("INSERT INTO sync (offset, head) VALUES (?, ?)",
+                              (offset + end, current_head[:256]))
+        return len(rows)
+
+    @staticmethod
+    def _typed(row):
+        values = dict(zip(COLUMNS, row))
+        for c in NUMERIC:
+            values[c] = float(values[c]) if values[c] else 0.0
+        return [values[c] for c in COLUMNS]
+
+    def dates(self):
+        return [r[0] for r in self.conn.execute("SELECT DISTINCT date FROM offers ORDER BY date")]
+
+    def program_history(self, name, program, key=None, since=None, until=None):
+        # [{date, key, price_kwh, monthly_fee, discount_percent}, ...] oldest first
+        sql = "SELECT date, key, price_kwh, monthly_fee, discount_percent FROM offers WHERE name = ? AND program = ?"
+        args = [name, program]
+        if key: sql += " AND key = ?"; args.append(key)
+        if since: sql += " AND date >= ?"; args.append(since)
+        if until: sql += " AND date <= ?"; args.append(until)
+        return [dict(r) for r in self.conn.execute(sql + " ORDER BY date", args)]
+
+    def cheapest_per_day(self, key, kwh=300, days=30, since=None, until=None):
+        # Cheapest offer of a category on every recorded day, for `kwh` over `days`
+        # (supplier energy + fixed fee; regulated charges are the same for all offers)
+        sql = """
+            SELECT date, name, program, price_kwh, monthly_fee, discount_percent, cost FROM (
+                SELECT *, ? * price_kwh * (1 - discount_percent) + monthly_fee / 30.0 * ? AS cost,
+                       ROW_NUMBER() OVER (PARTITION BY date ORDER BY
+                           ? * price_kwh * (1 - discount_percent) + monthly_fee / 30.0 * ?, name, program) AS rank
+                FROM offers WHERE key = ? AND date >= ? AND date <= ?
+            ) WHERE rank = 1 ORDER BY date"""
+        args = [kwh, days, kwh, days, key, since or "", until or "9999"]
+        return [dict(r) for r in self.conn.execute(sql, args)]
+
+    def snapshot(self, date):
+        # Offers as they were on `date`, in the providers.json layout: every
+        # category from the last day up to `date` it was recorded (a category
+        # that failed to scrape kept its previous offers). None before the first record.
+        row = self.conn.execute("SELECT MAX(date) FROM offers WHERE date <= ?", (date,)).fetchone()
+        if row is None or row[0] is None: return None
+        data = {key: [] for key in CATEGORY_KEYS}
+        days = self.conn.execute("SELECT key, MAX(date) FROM offers WHERE date <= ? GROUP BY key", (date,)).fetchall()
+        for key, day in days:
+            for r in self.conn.execute(f"SELECT {', '.join(COLUMNS)} FROM offers WHERE key = ? AND date = ? ORDER BY rowid",
+                                       (key, day)):
+                data.setdefault(key, []).append({c: r[c] for c in OFFER_FIELDS})
+        data["last_updated"] = row[0]
+        return data
+
+
+def days_ago(n):
+    return (datetime.date.today() - datetime.timedelta(days=n)).isoformat()
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Query the daily offer price history")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("sync", help="Bring the SQLite index up to date with history/offers.csv")
+
+    p = commands.add_parser("history", help="Price history of one program")
+    p.add_argument("name")
+    p.add_argument("program")
+    p.add_argument("--category", choices=CATEGORY_KEYS)
+    p.add_argument("--days", type=int, default=365)
+
+    p = commands.add_parser("cheapest", help="Cheapest offer per day")
+    p.add_argument("--category", choices=CATEGORY_KEYS, default="providers")
+    p.add_argument("--days", type=int, default=365)
+    p.add_argument("--kwh", type=float, default=300, help="Monthly consumption to rank by")
+
+    p = commands.add_parser("export", help="Snapshot of a past day in the providers.json layout")
+    p.add_argument("date", help="YYYY-MM-DD (the last recorded day up to it is used)")
+    p.add_argument("-o", "--output", help="Write to this file instead of stdout")
+
+    args = arg_parser.parse_args()
+    history = PriceHistory()
+    try:
+        if args.command == "sync":
+            print(f"Indexed {history.sync()} new row(s); {len(history.dates())} day(s) recorded")
+        elif args.command == "history":
+            for r in history.program_history(args.name, args.program, args.category, since=days_ago(args.days)):
+                print(f"{r['date']}  {r['key']:<24}{r['price_kwh']:>9.4f} €/kWh{r['monthly_fee']:>8.2f} €/month")
+        elif args.command == "cheapest":
+            for r in history.cheapest_per_day(args.category, args.kwh, since=days_ago(args.days)):
+                print(f"{r['date']}  {r['cost']:>8.2f} €  {r['name']} - {r['program']}")
+        elif args.command == "export":
+            data = history.snapshot(args.date)
+            if data is None:
+                raise SystemExit(f"No history on or before {args.date}")
+            text = json.dumps(data, ensure_ascii=False, indent=4)
+            if args.output:
+                with open(args.output, "w", encoding="utf-8") as f: f.write(text + "\n")
+            else:
+                print(text)
+    finally:
+        history.close()
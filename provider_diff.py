@@ -0,0 +1,85 @@
+import json
+import os
+import sys
+import tempfile
+
+# providers.json keys that hold offer lists: defined with the app's data format
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "wattsaver_mobile"))
+from provider_data import CATEGORY_KEYS
+
+# Offer-level diffing between two providers.json snapshots.
+# Offers are keyed by (name, program, category). The site occasionally lists
+# the same program twice, so repeats get an occurrence number as a 4th element.
+
+# Fields compared between snapshots (everything the scraper writes besides the key)
+TRACKED_FIELDS = ("price_kwh", "monthly_fee", "discount_percent", "type", "color", "raw_data")
+
+
+def index_offers(offers):
+    indexed = {}
+    seen = {}
+    for offer in offers:
+        base = (offer.get("name"), offer.get("program"), offer.get("category"))
+        n = seen.get(base, 0)
+        seen[base] = n + 1
+        indexed[base if n == 0 else base + (n,)] = offer
+    return indexed
+
+
+def diff_offers(old_offers, new_offers):
+    old = index_offers(old_offers)
+    new = index_offers(new_offers)
+
+    added = [offer for key, offer in new.items() if key not in old]
+    removed = [list(key) for key in old if key not in new]
+    changed = []
+    for key, offer in new.items():
+        before = old.get(key)
+        if before is None: continue
+        fields = {f: [before.get(f), offer.get(f)] for f in TRACKED_FIELDS if before.get(f) != offer.get(f)}
+        if fields:
+            changed.append({"key": list(key), "fields": fields})
+
+    if not (added or removed or changed):
+        return None
+    return {"added": added, "removed": removed, "changed": changed}
+
+
+def diff_snapshots(old_data, new_data):
+    # Returns {category_key: delta} for the categories that differ (empty dict = no change)
+    deltas = {}
+    for key in CATEGORY_KEYS:
+        delta = diff_offers(old_data.get(key, []), new_data.get(key, []))
+        if delta:
+            deltas[key] = delta
+    return deltas
+
+
+def write_json_atomic(path, data, **dump_kwargs):
+    # Write to a temp file in the same directory, then rename over the target,
+    # so readers (and the git commit step) never see a half-written file.
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, **dump_kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644) # mkstemp creates 0600
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path): os.remove(tmp_path)
+        raise
+
+
+def write_change_log(changes_dir, date, previous_date, deltas):
+    # Compact delta for clients: changes/<date>.json (a second run on the same day gets -2, -3, ...)
+    path = os.path.join(changes_dir, f"{date}.json")
+    n = 2
+    while os.path.exists(path):
+        path = os.path.join(changes_dir, f"{date}-{n}.json")
+        n += 1
+    payload = {"date": date, "previous": previous_date, "categories": deltas}
+    write_json_atomic(path, payload, separators=(",", ":"))
+    return path
@@ -0,0 +1,189 @@
+import unicodedata
+
+import instrument
+
+# Schema of the energycost.gr offer tables.
+#
+# Columns are found by their header text, once per table, instead of fixed
+# positions: if the site reorders or renames columns the scrape fails loudly
+# rather than reading fees as prices. Rows then stream through validate_rows(),
+# which checks every field's type and range and counts what it rejects, and
+# check_category() decides whether a category's result is safe to publish.
+# A failed check aborts the run before providers.json (which every client
+# downloads) is written.
+
+# field -> header texts it may appear under (compared accent- and case-insensitively,
+# as a prefix: "Πάγιο" matches "Πάγιο (€/μήνα)")
+HEADERS = {
+    "name": ("Πάροχος",),
+    "program": ("Πρόγραμμα",),
+    "monthly_fee": ("Πάγιο",),
+    "price_kwh": ("Τιμή",),
+}
+
+# Positions used before the tables had a readable header; only used when the
+# table has no header row at all (its first row is already an offer, e.g. the
+# header lives in a separate table)
+LEGACY_COLUMNS = {"name": 1, "program": 4, "monthly_fee": 7, "price_kwh": 9}
+
+# Accepted ranges (inclusive)
+PRICE_RANGE = (0.001, 2.0) # €/kWh
+FEE_RANGE = (0.0, 100.0)   # €/month
+
+# Abort thresholds (overridable from the command line)
+MAX_REJECT_RATE = 0.2 # Share of a table's data rows that failed validation
+MAX_ROW_DELTA = 0.5   # Relative change in a category's offer count vs. the last run
+
+
+class SchemaError(Exception):
+    pass
+
+
+def _fold(text):
+    text = unicodedata.normalize("NFD", text)
+    return "".join(c for c in text if not unicodedata.combining(c)).upper().strip()
+
+
+def _matches(cell, field):
+    folded = _fold(cell)
+    return any(folded.startswith(_fold(alias)) for alias in HEADERS[field])
+
+
+def _is_legacy_offer(row):
+    # An offer row at LEGACY_COLUMNS: name, program and a price in range
+    if len(row) <= max(LEGACY_COLUMNS.values()): return False
+    if not row[LEGACY_COLUMNS["name"]].strip() or not row[LEGACY_COLUMNS["program"]].strip(): return False
+    return _number(row[LEGACY_COLUMNS["price_kwh"]], *PRICE_RANGE) is not None
+
+
+class ColumnMap:
+    def __init__(self, indexes, header_row=None):
+        self.indexes = indexes
+        self.header_row = header_row # Index of the header in the table's rows, None for LEGACY_COLUMNS
+        self.width = max(indexes.values()) + 1
+
+    @classmethod
+    def resolve(cls, rows, search=5):
+        # Header = first of the first `search` rows naming at least two fields
+        for r, row in enumerate(rows[:search]):
+            found = {}
+            for field in HEADERS:
+                for i, cell in enumerate(row):
+                    if _matches(cell, field):
+                        found[field] = i
+                        break
+            if len(found) < 2: continue
+            missing = [field for field in HEADERS if field not in found]
+            if missing:
+                raise SchemaError(f"Header row has no column for {', '.join(missing)}: {row}")
+            return cls(found, r)
+        # A header we can't read (renamed / reordered columns) fails the
+        # category; the legacy positions are only for tables that start
+        # straight with offers
+        first = next((row for row in rows if any(row)), None)
+        if first is None or not _is_legacy_offer(first):
+            raise SchemaError(f"No header row names the offer columns: {first}")
+        print("Table has no header row; using the legacy column positions.")
+        return cls(dict(LEGACY_COLUMNS))
+
+    def is_header(self, row):
+        return all(i < len(row) and _matches(row[i], field) for field, i in self.indexes.items())
+
+
+class RowStats:
+    def __init__(self):
+        self.accepted = 0
+        self.rejected = 0
+        self.reasons = {}
+        self.error = None # SchemaError message: the table itself was unusable
+
+    @property
+    def total(self):
+        return self.accepted + self.rejected
+
+    @property
+    def reject_rate(self):
+        return self.rejected / self.total if self.total else 0.0
+
+    def as_dict(self):
+        return {"accepted": self.accepted, "rejected": self.rejected, "reasons": self.reasons, "error": self.error}
+
+    @classmethod
+    def from_dict(cls, d):
+        stats = cls()
+        stats.accepted, stats.rejected = d["accepted"], d["rejected"]
+        stats.reasons, stats.error = dict(d["reasons"]), d["error"]
+        return stats
+
+    def reject(self, reason):
+        self.rejected += 1
+        self.reasons[reason] = self.reasons.get(reason, 0) + 1
+        instrument.count("scraper.row_rejected." + reason)
+
+
+def _number(text, low, high, blank=None):
+    # float in [low, high]; a blank cell is `blank` (None = invalid)
+    text = text.strip().replace(",", ".")
+    if not text: value = blank
+    else:
+        try:
+            value = float(text)
+        except ValueError:
+            return None
+    if value is None or not low <= value <= high: return None
+    return value
+
+
+def validate_rows(rows, columns, category_name, stats):
+    # Yields one offer dict per valid data row; everything else is counted in `stats`
+    start = 0 if columns.header_row is None else columns.header_row + 1
+    for raw_data in rows[start:]:
+        if not raw_data or not any(raw_data): continue # Spacer rows
+        if columns.is_header(raw_data): continue # Repeated header
+        if len(raw_data) < columns.width:
+            stats.reject("short_row")
+            continue
+
+        name = raw_data[columns.indexes["name"]].strip()
+        program = raw_data[columns.indexes["program"]].strip()
+        if not name or not program:
+            stats.reject("missing_name")
+            continue
+
+        monthly_fee = _number(raw_data[columns.indexes["monthly_fee"]], *FEE_RANGE, blank=0.0)
+        if monthly_fee is None:
+            stats.reject("bad_fee")
+            continue
+        price_kwh = _number(raw_data[columns.indexes["price_kwh"]], *PRICE_RANGE)
+        if price_kwh is None:
+            stats.reject("bad_price")
+            continue
+
+        stats.accepted += 1
+        yield {
+            "name": name,
+            "program": program,
+            "type": "Live",
+            "category": category_name, # Tag the category
+            "price_kwh": price_kwh,
+            "monthly_fee": monthly_fee,
+            "discount_percent": 0.0,
+            "color": "#d35400",
+            "raw_data": raw_data
+        }
+
+
+def check_category(label, stats, count, previous_count, max_reject_rate=MAX_REJECT_RATE, max_row_delta=MAX_ROW_DELTA):
+    # Problems that should stop this category from being published ([] = fine)
+    problems = []
+    if stats is not None and stats.error:
+        problems.append(f"{label}: {stats.error}")
+    if stats is not None and stats.total and stats.reject_rate > max_reject_rate:
+        problems.append(f"{label}: {stats.rejected}/{stats.total} rows rejected "
+                        f"({stats.reject_rate:.0%} > {max_reject_rate:.0%}) {stats.reasons}")
+    if previous_count and count:
+        delta = abs(count - previous_count) / previous_count
+        if delta > max_row_delta:
+            problems.append(f"{label}: {previous_count} -> {count} offers "
+                            f"({delta:.0%} change > {max_row_delta:.0%})")
+    return problems
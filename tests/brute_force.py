@@ -0,0 +1,53 @@
+import json
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "wattsaver_mobile"))
+
+from pricing import CATEGORY_KEYS, ELECTRICITY, regulated_charges_elec, regulated_charges_gas
+
+# Reference answers for the pricing tests: every offer priced on its own from
+# its providers.json record, the way the app's per-card loop did before the
+# PricingEngine, and searches done over every candidate.
+
+PROVIDERS_JSON = os.path.join(ROOT, "wattsaver_mobile", "assets", "providers.json")
+SUPPLIERS = ["ΔΕΗ", "ΗΡΩΝ", "ΖΕΝΙΘ", "EUNICE", "NRG", "PROTERGIA", "VOLTON", "ΕΛΙΝΟΙΛ"]
+
+
+def bundled_data():
+    with open(PROVIDERS_JSON, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def random_data(seed, per_category=40):
+    # Seeded catalogue with repeated prices / fees (ties) and suppliers selling
+    # both energy types, on the bundled regulated charges
+    rng = random.Random(seed)
+    data = {"last_updated": "2025-06-01", "regulated_charges": bundled_data()["regulated_charges"]}
+    for name in CATEGORY_KEYS.values():
+        data[name] = [{
+            "name": rng.choice(SUPPLIERS),
+            "program": f"Plan {i}",
+            "price_kwh": rng.choice([0.089, 0.1, 0.12]) if rng.random() < 0.2 else round(rng.uniform(0.05, 0.25), 4),
+            "monthly_fee": rng.choice([0.0, 5.0, 9.9]) if rng.random() < 0.3 else round(rng.uniform(0, 20), 2),
+            "discount_percent": rng.choice([0.0, 0.0, 0.05, 0.1]),
+        } for i in range(per_category)]
+    return data
+
+
+def offer_total(data, energy_type, offer, kwh, days):
+    reg_charges = data.get("regulated_charges", {})
+    if energy_type == ELECTRICITY:
+        reg, vat = regulated_charges_elec(reg_charges, kwh, days), reg_charges.get("vat", 0.06)
+    else:
+        gas = reg_charges.get("gas_reg_charges", {})
+        reg, vat = regulated_charges_gas(gas, kwh, days), gas.get("vat", 0.06)
+    energy = kwh * offer["price_kwh"] * (1 - offer.get("discount_percent", 0))
+    fixed = offer["monthly_fee"] / 30 * days
+    return (energy + fixed + reg) * (1 + vat)
+
+
+def category_totals(data, energy_type, mode, kwh, days):
+    return [offer_total(data, energy_type, o, kwh, days) for o in data.get(CATEGORY_KEYS[(energy_type, mode)], [])]
@@ -0,0 +1,75 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "wattsaver_mobile"))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import bill_batch
+from bill_batch import parse_bills
+from bill_parser import BillParser
+
+try:
+    import fitz # noqa: F401
+except ImportError:
+    fitz = None
+
+
+@unittest.skipIf(fitz is None, "PyMuPDF (fitz) is not installed")
+class BillBatchTest(unittest.TestCase):
+    def setUp(self):
+        from suite import make_bill_pdf
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        bills = os.path.join(self.tmp, "bills")
+        os.mkdir(bills)
+        for name, pages in (("c.pdf", 1), ("a.pdf", 2), ("b.pdf", 1)):
+            make_bill_pdf(os.path.join(bills, name), pages)
+        with open(os.path.join(bills, "corrupt.pdf"), "wb") as f:
+            f.write(b"%PDF-1.4\nnot a pdf\n%%EOF\n")
+        with open(os.path.join(bills, "notes.txt"), "w") as f:
+            f.write("not a bill")
+        self.bills = bills
+        self.missing = os.path.join(self.tmp, "missing.pdf")
+        self.single = os.path.join(self.tmp, "single.pdf")
+        make_bill_pdf(self.single, 1)
+        # Every test starts from a fresh parser in this process
+        self.addCleanup(setattr, bill_batch, "_parser", None)
+
+    def expected_files(self):
+        names = ["a.pdf", "b.pdf", "c.pdf", "corrupt.pdf"]
+        return [self.single] + [os.path.join(self.bills, n) for n in names] + [self.missing]
+
+    def check(self, lines):
+        self.assertEqual([line["file"] for line in lines], self.expected_files())
+        self.assertEqual([line["ok"] for line in lines], [True, True, True, True, False, False])
+        parser = BillParser()
+        for line in lines[:4]:
+            self.assertEqual(line["result"], parser.parse_bill(line["file"]))
+            self.assertEqual(line["result"]["provider_detected"], "DEI")
+        for line in lines[4:]:
+            self.assertIn("error", line)
+
+    def test_ordered_results_in_process(self):
+        self.check(list(parse_bills([self.single, self.bills, self.missing], workers=1)))
+
+    def test_ordered_results_across_workers(self):
+        self.check(list(parse_bills([self.single, self.bills, self.missing], workers=3)))
+
+    def test_cli_writes_json_lines_only(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(io.StringIO()):
+            status = bill_batch.main([self.single, self.bills, self.missing, "--workers", "2",
+                                      "--cache", os.path.join(self.tmp, "cache.sqlite3")])
+        self.assertEqual(status, 1) # Two files failed
+        self.check([json.loads(line) for line in out.getvalue().splitlines()])
+
+
+if __name__ == "__main__":
+    unittest.main()
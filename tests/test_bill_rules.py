@@ -0,0 +1,29 @@
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "wattsaver_mobile"))
+
+from bill_rules import MODULE_ASSETS_DIR, default_rules
+from pricing import OfferTable
+from provider_data import CATEGORY_KEYS, load_providers
+
+
+class CatalogueNameTest(unittest.TestCase):
+    def test_every_rule_finds_its_offers(self):
+        # A detected provider is matched against offer names: every rule has
+        # to name a supplier of the bundled catalogue
+        data = load_providers(MODULE_ASSETS_DIR, include_raw=False)
+        table = OfferTable(o for key in CATEGORY_KEYS for o in data.get(key, []))
+        rules = default_rules()
+        for rule in rules.providers:
+            with self.subTest(rule=rule.name):
+                self.assertTrue(any(table.matches(rules.catalogue_name(rule.name))))
+
+    def test_unknown_provider_is_unchanged(self):
+        self.assertEqual(default_rules().catalogue_name("Unknown"), "Unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
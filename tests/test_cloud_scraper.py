@@ -0,0 +1,301 @@
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import cloud_scraper
+from html_table import extract_largest_table
+from provider_data import CATEGORY_KEYS, loads_columnar, write_columnar
+from cloud_scraper import CloudScraper, RowCountStable
+
+# Retry, checkpoint and time budget of CloudScraper against a local fixture
+# server that serves the saved energycost.gr page for every category, after
+# failing a configurable number of times.
+
+FIXTURE_HTML = os.path.join(ROOT, "benchmarks", "fixtures", "energycost_residential_electricity.html")
+FIXTURE_OFFERS = os.path.join(ROOT, "benchmarks", "fixtures", "energycost_residential_electricity.json")
+ALWAYS = 10 ** 6
+
+
+class FixtureServer:
+    # GET /<key> answers 503 for the first failures[key] requests, then the fixture page
+    def __init__(self):
+        with open(FIXTURE_HTML, "rb") as f:
+            page = f.read()
+        self.failures = {}
+        self.hits = {}
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                key = self.path.strip("/")
+                with server.lock:
+                    server.hits[key] = server.hits.get(key, 0) + 1
+                    failing = server.hits[key] <= server.failures.get(key, 0)
+                body = b"unavailable" if failing else page
+                self.send_response(503 if failing else 200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class StubDriver:
+    # Headless Chrome stand-in: get() loads the page from the fixture server
+    # (raising for the first failures[key] loads, like a crashed session) and
+    # execute_script() answers the scraper's two scripts from its HTML
+    def __init__(self, failures, loads):
+        self.failures = failures
+        self.loads = loads
+        self.page_source = ""
+
+    def get(self, url):
+        key = url.rsplit("/", 1)[1]
+        self.loads.append(key)
+        if self.failures.get(key, 0) > 0:
+            self.failures[key] -= 1
+            raise RuntimeError("chrome not reachable")
+        with urllib.request.urlopen(url) as resp:
+            self.page_source = resp.read().decode("utf-8")
+
+    def execute_script(self, script):
+        rows = extract_largest_table([self.page_source]) or []
+        if script == cloud_scraper.ROW_COUNT_JS: return len(rows)
+        if script == cloud_scraper.EXTRACT_TABLE_JS: return rows
+        raise AssertionError(f"Unexpected script: {script}")
+
+    def quit(self):
+        pass
+
+
+class StubWait:
+    # WebDriverWait without the timeout: polls until the condition holds
+    def __init__(self, driver, timeout, poll_frequency=0.5):
+        self.driver = driver
+
+    def until(self, condition):
+        while True:
+            result = condition(self.driver)
+            if result: return result
+
+
+class ScraperTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = FixtureServer()
+        self.addCleanup(self.server.close)
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+        # Every output of run() goes to the temp dir; the previous snapshot
+        # holds the fixture's offers in every category
+        self.output = os.path.join(self.tmp, "providers.json")
+        with open(FIXTURE_OFFERS, "r", encoding="utf-8") as f:
+            offers = json.load(f)
+        with open(self.output, "w", encoding="utf-8") as f:
+            json.dump({key: offers for key in CATEGORY_KEYS}, f)
+        for name, path in (("OUTPUT_FILE", self.output),
+                           ("COLUMNAR_FILE", os.path.join(self.tmp, "providers.col.json.gz")),
+                           ("CHANGES_DIR", os.path.join(self.tmp, "changes")),
+                           ("HISTORY_LOG", os.path.join(self.tmp, "history", "offers.csv"))):
+            patcher = mock.patch.object(cloud_scraper, name, path)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.checkpoint = os.path.join(self.tmp, "checkpoint.json")
+
+    def scraper(self, **kwargs):
+        kwargs.setdefault("backend", "static")
+        kwargs.setdefault("backoff", 0.01)
+        scraper = CloudScraper(**kwargs)
+        scraper.categories = [(key, f"{self.server.url}/{key}", name, label)
+                              for key, _, name, label in scraper.categories]
+        return scraper
+
+    def test_retry_recovers_a_failing_category(self):
+        self.server.failures = {"gas_providers": 2}
+        fetched = self.scraper(retries=2).fetch_all()
+        self.assertEqual(self.server.hits["gas_providers"], 3)
+        self.assertEqual(self.server.hits["providers"], 1)
+        self.assertTrue(all(rows for rows, _ in fetched.values()))
+
+    def test_retries_exhausted_leaves_category_empty(self):
+        self.server.failures = {"gas_providers": ALWAYS}
+        fetched = self.scraper(retries=1).fetch_all()
+        self.assertEqual(self.server.hits["gas_providers"], 2)
+        self.assertEqual(fetched["gas_providers"][0], [])
+        self.assertTrue(fetched["providers"][0])
+
+    def test_checkpoint_rerun_fetches_only_failed_categories(self):
+        self.server.failures = {"providers_business": ALWAYS}
+        failed = self.scraper(retries=0).run(checkpoint_path=self.checkpoint)
+        self.assertEqual(failed, ["Elec_Bus"])
+        with open(self.checkpoint, "r", encoding="utf-8") as f:
+            saved = json.load(f)["categories"]
+        self.assertEqual(sorted(saved), ["gas_providers", "gas_providers_business", "providers"])
+
+        self.server.failures = {}
+        self.server.hits = {}
+        failed = self.scraper(retries=0).run(checkpoint_path=self.checkpoint)
+        self.assertEqual(failed, [])
+        self.assertEqual(self.server.hits, {"providers_business": 1})
+        self.assertFalse(os.path.exists(self.checkpoint)) # Complete run: checkpoint removed
+        with open(self.output, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.assertEqual(data["providers_business"][0]["category"], "Business Electricity")
+
+    def history_rows(self):
+        with open(cloud_scraper.HISTORY_LOG, "r", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        return {key: sum(1 for row in rows if row["key"] == key) for key in CATEGORY_KEYS}
+
+    def test_checkpoint_rerun_logs_each_category_once(self):
+        with open(FIXTURE_OFFERS, "r", encoding="utf-8") as f:
+            offers = len(json.load(f))
+        self.server.failures = {"providers_business": ALWAYS}
+        self.scraper(retries=0).run(checkpoint_path=self.checkpoint)
+        self.server.failures = {}
+        self.scraper(retries=0).run(checkpoint_path=self.checkpoint)
+        self.assertEqual(self.history_rows(), {key: offers for key in CATEGORY_KEYS})
+
+    def test_checkpoint_rerun_logs_categories_of_a_rejected_run(self):
+        # The first run fails validation after checkpointing three categories:
+        # nothing was recorded, so the re-run records them
+        with open(FIXTURE_OFFERS, "r", encoding="utf-8") as f:
+            offers = len(json.load(f))
+        self.server.failures = {"providers_business": ALWAYS}
+        with mock.patch.object(cloud_scraper, "check_category", return_value=["rejected"]):
+            with self.assertRaises(cloud_scraper.SchemaError):
+                self.scraper(retries=0).run(checkpoint_path=self.checkpoint)
+        self.assertFalse(os.path.exists(cloud_scraper.HISTORY_LOG))
+        self.server.failures = {}
+        self.scraper(retries=0).run(checkpoint_path=self.checkpoint)
+        self.assertEqual(self.history_rows(), {key: offers for key in CATEGORY_KEYS})
+
+    def test_columnar_asset_follows_providers_json_without_offer_changes(self):
+        self.scraper().run(checkpoint_path=None) # Offers as the fixture server serves them
+        # regulated_charges edited in providers.json; the columnar asset is from before
+        with open(self.output, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        columnar = cloud_scraper.COLUMNAR_FILE
+        write_columnar(dict(data, regulated_charges={"vat": 0.06}), columnar)
+        data["regulated_charges"] = {"vat": 0.24}
+        with open(self.output, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+        self.assertEqual(self.scraper().run(checkpoint_path=None), [])
+        with open(columnar, "rb") as f:
+            self.assertEqual(loads_columnar(f.read())["regulated_charges"], {"vat": 0.24})
+        with open(self.output, "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f), data) # No offer changed: snapshot untouched
+
+    def test_time_budget_stops_retries(self):
+        self.server.failures = {"gas_providers": ALWAYS}
+        # The second retry (after 0.2 + 0.4 s of backoff) would start past the budget
+        fetched = self.scraper(retries=5, backoff=0.2, time_budget=0.5).fetch_all()
+        self.assertEqual(self.server.hits["gas_providers"], 2)
+        self.assertEqual(fetched["gas_providers"][0], [])
+
+    def test_spent_budget_fetches_nothing(self):
+        fetched = self.scraper(time_budget=0).fetch_all()
+        self.assertEqual(self.server.hits, {})
+        self.assertTrue(all(rows == [] for rows, _ in fetched.values()))
+
+    def test_driver_setup_failure_is_a_failed_attempt(self):
+        # No table in the static HTML, and resolving chromedriver fails: every
+        # attempt fails but the run carries on instead of raising
+        self.server.failures = {"gas_providers": ALWAYS}
+
+        class BrokenManager:
+            def install(self):
+                raise OSError("driver download failed")
+
+        with mock.patch.object(cloud_scraper, "webdriver", mock.MagicMock()), \
+                mock.patch.object(cloud_scraper, "ChromeDriverManager", BrokenManager, create=True):
+            fetched = self.scraper(backend="auto", retries=1).fetch_all()
+        self.assertEqual(self.server.hits["gas_providers"], 2)
+        self.assertEqual(fetched["gas_providers"][0], [])
+        self.assertTrue(fetched["providers"][0])
+
+    def test_selenium_retry_recovers_a_failing_category(self):
+        # The first page load of one category fails: the broken session is
+        # dropped and the retry, after the backoff, reads the table
+        failures, loads = {"gas_providers": 1}, []
+        started = []
+
+        def chrome(service, options):
+            started.append(StubDriver(failures, loads))
+            return started[-1]
+
+        class Manager:
+            def install(self):
+                return "chromedriver"
+
+        patches = [mock.patch.object(cloud_scraper, "webdriver", mock.MagicMock(Chrome=chrome)),
+                   mock.patch.object(cloud_scraper, "Service", mock.MagicMock(), create=True),
+                   mock.patch.object(cloud_scraper, "WebDriverWait", StubWait, create=True),
+                   mock.patch.object(cloud_scraper, "ChromeDriverManager", Manager, create=True)]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        fetched = self.scraper(backend="selenium", retries=2).fetch_all()
+
+        self.assertEqual(loads.count("gas_providers"), 2)
+        self.assertEqual(loads.count("providers"), 1)
+        self.assertEqual(len(started), 2) # A fresh session for the retry
+        with open(FIXTURE_OFFERS, "r", encoding="utf-8") as f:
+            expected = json.load(f)
+        self.assertEqual(fetched["providers"][0], expected)
+        self.assertEqual([o["raw_data"] for o in fetched["gas_providers"][0]], [o["raw_data"] for o in expected])
+        self.assertEqual(fetched["gas_providers"][0][0]["category"], "Residential Gas")
+
+
+class FakeDriver:
+    # execute_script returns the next row count of the largest table
+    def __init__(self, counts):
+        self.counts = iter(counts)
+
+    def execute_script(self, script):
+        return next(self.counts)
+
+
+class RowCountStableTest(unittest.TestCase):
+    def polls_until_stable(self, counts, **kwargs):
+        condition, driver = RowCountStable(**kwargs), FakeDriver(counts)
+        for polls in range(1, len(counts) + 1):
+            if condition(driver): return polls
+        return None
+
+    def test_waits_for_the_count_to_settle(self):
+        self.assertEqual(self.polls_until_stable([5, 20, 40, 40, 40]), 5)
+
+    def test_short_table_is_not_the_offers_table(self):
+        # Only the header row so far, then the offers fill in
+        self.assertEqual(self.polls_until_stable([1, 1, 1, 1, 30, 30, 30]), 7)
+        self.assertIsNone(self.polls_until_stable([0, 0, 0, 0]))
+        self.assertIsNone(self.polls_until_stable([8, 8, 8], min_rows=10))
+
+
+if __name__ == "__main__":
+    unittest.main()
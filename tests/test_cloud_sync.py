@@ -0,0 +1,140 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "wattsaver_mobile"))
+
+import cloud_sync
+from cloud_sync import NOT_MODIFIED, UPDATED, CloudSync
+
+# CloudSync against a local stand-in for raw.githubusercontent: conditional
+# requests, the 304 path, the stored payload + validators and the offline cache.
+
+ETAG = '"v1"'
+LAST_MODIFIED = "Sat, 01 Jun 2025 00:00:00 GMT"
+PAYLOAD = json.dumps({"last_updated": "2025-06-01", "providers": [{"name": "ΗΡΩΝ"}]}, ensure_ascii=False)
+
+
+class ProvidersServer:
+    # GET /providers.json: 304 when the request's validators match, else the payload
+    def __init__(self):
+        self.requests = [] # Request headers, one dict per GET
+        self.status = None # Force a status (e.g. 500) instead of the normal answer
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                headers = dict(self.headers)
+                server.requests.append(headers)
+                if server.status is not None:
+                    self.send_response(server.status)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if headers.get("If-None-Match") == ETAG or headers.get("If-Modified-Since") == LAST_MODIFIED:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                body = PAYLOAD.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain") # No charset, like raw.githubusercontent
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", ETAG)
+                self.send_header("Last-Modified", LAST_MODIFIED)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/providers.json"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class CloudSyncTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ProvidersServer()
+        self.addCleanup(self.server.close)
+        self.storage = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.storage)
+
+    def sync(self, url=None):
+        sync = CloudSync(url or self.server.url, os.path.join(self.storage, "app"), timeout=5)
+        self.addCleanup(lambda: sync._session and sync._session.close())
+        return sync
+
+    def test_first_fetch_is_unconditional(self):
+        status, payload, validators = self.sync().fetch()
+        self.assertEqual(status, UPDATED)
+        self.assertEqual(payload, PAYLOAD) # UTF-8 without a charset header
+        self.assertEqual(validators, {"etag": ETAG, "last_modified": LAST_MODIFIED})
+        self.assertNotIn("If-None-Match", self.server.requests[0])
+        self.assertNotIn("If-Modified-Since", self.server.requests[0])
+
+    def test_stored_validators_give_not_modified(self):
+        sync = self.sync()
+        sync.store(*sync.fetch()[1:])
+        self.assertEqual(sync.fetch(), (NOT_MODIFIED, None, None))
+        self.assertEqual(self.server.requests[1]["If-None-Match"], ETAG)
+        self.assertEqual(self.server.requests[1]["If-Modified-Since"], LAST_MODIFIED)
+
+    def test_validators_need_the_cached_payload(self):
+        sync = self.sync()
+        sync.store(*sync.fetch()[1:])
+        os.remove(sync.cache_path)
+        self.assertEqual(sync.fetch()[0], UPDATED)
+        self.assertNotIn("If-None-Match", self.server.requests[1])
+
+    def test_store_writes_payload_and_validators(self):
+        sync = self.sync()
+        sync.store(*sync.fetch()[1:])
+        self.assertEqual(sync.load_cached(), PAYLOAD)
+        with open(sync.meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.assertEqual((meta["etag"], meta["last_modified"]), (ETAG, LAST_MODIFIED))
+        self.assertIn("fetched_at", meta)
+        self.assertEqual(sorted(os.listdir(sync.storage_dir)), sorted([cloud_sync.CACHE_FILE, cloud_sync.META_FILE]))
+
+    def test_failed_store_keeps_the_previous_cache(self):
+        sync = self.sync()
+        sync.store(*sync.fetch()[1:])
+        with mock.patch.object(cloud_sync.os, "replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                sync.store("{}", {"etag": '"v2"', "last_modified": None})
+        self.assertEqual(sync.load_cached(), PAYLOAD)
+        self.assertEqual(sorted(os.listdir(sync.storage_dir)), sorted([cloud_sync.CACHE_FILE, cloud_sync.META_FILE]))
+
+    def test_http_error_raises(self):
+        self.server.status = 500
+        with self.assertRaises(requests.HTTPError):
+            self.sync().fetch()
+
+    def test_offline_keeps_the_cached_payload(self):
+        self.sync().store(*self.sync().fetch()[1:])
+        self.server.close()
+        offline = self.sync(self.server.url)
+        with self.assertRaises(requests.ConnectionError):
+            offline.fetch()
+        self.assertEqual(offline.load_cached(), PAYLOAD)
+
+    def test_nothing_cached(self):
+        self.assertIsNone(self.sync().load_cached())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import asyncio
+import http.client
+import json
+import os
+import sys
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "wattsaver_mobile"))
+
+from comparison_service import ComparisonService, handle, serve
+
+
+class RankRequestTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.service = ComparisonService(check_interval=None) # Bundled assets/providers.json
+
+    def test_rank(self):
+        status, body = handle(self.service, "/rank?kwh=300&limit=3")
+        self.assertEqual(status, 200)
+        self.assertEqual([o["rank"] for o in body["offers"]], [1, 2, 3])
+        json.dumps(body, allow_nan=False)
+
+    def test_non_finite_kwh_is_rejected(self):
+        for kwh in ("nan", "NaN", "inf", "-inf", "1e999"):
+            with self.subTest(kwh=kwh):
+                self.assertEqual(handle(self.service, f"/rank?kwh={kwh}")[0], 400)
+
+    def test_limit_below_one_is_rejected(self):
+        for limit in ("0", "-45"):
+            with self.subTest(limit=limit):
+                self.assertEqual(handle(self.service, f"/rank?kwh=300&limit={limit}")[0], 400)
+
+    def test_without_limit_ranks_every_offer(self):
+        status, body = handle(self.service, "/rank?kwh=300")
+        self.assertEqual(status, 200)
+        self.assertEqual(len(body["offers"]), len(self.service.rank("electricity", "residential", 300)))
+
+    def test_unexpected_error_is_a_500(self):
+        with mock.patch.object(self.service, "providers", side_effect=KeyError("providers")):
+            status, body = handle(self.service, "/providers")
+        self.assertEqual(status, 500)
+        self.assertIn("error", body)
+
+
+class ServeTest(unittest.TestCase):
+    # serve() on a free port in its own event loop thread, driven by
+    # concurrent keep-alive clients
+    def setUp(self):
+        self.service = ComparisonService(check_interval=None)
+        ready = threading.Event()
+        loop = asyncio.new_event_loop()
+
+        def on_ready(port):
+            self.port = port
+            ready.set()
+
+        task = loop.create_task(serve(self.service, port=0, watch_interval=60, on_ready=on_ready))
+
+        def run():
+            try:
+                loop.run_until_complete(task)
+            except asyncio.CancelledError:
+                pass
+            finally:
+                loop.close()
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        self.assertTrue(ready.wait(10))
+
+        def stop():
+            loop.call_soon_threadsafe(task.cancel)
+            thread.join(10)
+        self.addCleanup(stop)
+
+    def client(self, targets):
+        # One connection, several requests: [(status, body, socket), ...]
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=10)
+        try:
+            answers = []
+            for target in targets:
+                conn.request("GET", target)
+                resp = conn.getresponse()
+                answers.append((resp.status, json.loads(resp.read().decode("utf-8")), conn.sock))
+            return answers
+        finally:
+            conn.close()
+
+    def test_concurrent_keep_alive_clients(self):
+        targets = ["/health", "/rank?kwh=300&limit=3", "/rank?kwh=nan", "/providers?type=gas", "/rank?kwh=120&days=60"]
+        expected = [handle(self.service, target) for target in targets]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(self.client, [targets] * 16))
+        for answers in results:
+            self.assertEqual([(status, body) for status, body, _ in answers], expected)
+            self.assertEqual(len({id(sock) for _, _, sock in answers}), 1) # Same connection throughout
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "wattsaver_mobile"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from brute_force import bundled_data, category_totals, random_data
+from cost_curve import lower_envelope
+from pricing import CATEGORY_KEYS, PricingEngine
+
+# Cost curves against pricing every offer at every kWh of a grid
+
+GRID = [x * 5.0 for x in range(1201)] # 0 .. 6000 kWh, across all YKO tiers
+DAYS = [30, 61, 120]
+
+
+def tolerance(value):
+    return 1e-9 * max(1.0, abs(value))
+
+
+class CostCurvesTest(unittest.TestCase):
+    def check(self, data):
+        engine = PricingEngine(data)
+        for energy_type, mode in CATEGORY_KEYS:
+            for days in DAYS:
+                curves = engine.cost_curves(energy_type, mode, days)
+                for kwh in GRID:
+                    totals = category_totals(data, energy_type, mode, kwh, days)
+                    for i in range(0, len(totals), 7):
+                        self.assertAlmostEqual(curves.total(i, kwh), totals[i], delta=tolerance(totals[i]))
+                    index, total = curves.cheapest(kwh)
+                    self.assertAlmostEqual(total, min(totals), delta=tolerance(total))
+                    self.assertAlmostEqual(totals[index], min(totals), delta=tolerance(total))
+
+    def test_bundled_catalogue(self):
+        self.check(bundled_data())
+
+    def test_random_catalogues(self):
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                self.check(random_data(seed))
+
+    def test_envelope_segments_hold_the_cheapest_offer(self):
+        engine = PricingEngine(random_data(4))
+        curves = engine.cost_curves("electricity", "residential", 30)
+        segments = curves.envelope(6000)
+        self.assertEqual(segments[0][0], 0.0)
+        self.assertEqual(segments[-1][1], 6000)
+        for (_, end, _), (start, _, _) in zip(segments, segments[1:]):
+            self.assertEqual(end, start)
+        for start, end, index in segments:
+            line = [curves.slopes[i] * (start + end) / 2 + curves.intercepts[i] for i in range(len(curves))]
+            self.assertAlmostEqual(line[index], min(line), delta=1e-9)
+
+    def test_lower_envelope_ties_go_to_the_lower_index(self):
+        starts, hull = lower_envelope([0.1, 0.1, 0.2, 0.0, 0.1], [1.0, 1.0, 0.0, 10.0, 1.0])
+        self.assertEqual(hull, [2, 0, 3])
+        self.assertEqual(starts, [0.0, 10.0, 90.0])
+        # Three lines through one point: the middle one is never strictly lowest
+        starts, hull = lower_envelope([0.2, 0.1, 0.0], [0.0, 5.0, 10.0])
+        self.assertEqual((starts, hull), ([0.0, 50.0], [0, 2]))
+        self.assertEqual(lower_envelope([], []), ([], []))
+
+
+class OfferMapTest(unittest.TestCase):
+    # Crossings and savings against a fine scan of the detected provider's
+    # best offer vs the best other offer
+    MAX_KWH = 2000
+    STEP = 0.5
+
+    def brute_crossings(self, curves, detected, others):
+        xs = [k * self.STEP for k in range(int(self.MAX_KWH / self.STEP) + 1)]
+        def diff(x):
+            line = lambda i: curves.slopes[i] * x + curves.intercepts[i]
+            return min(map(line, detected)) - min(map(line, others))
+        # Sign changes, skipping exact ties (e.g. two offers without a fee at 0 kWh)
+        crossings, previous = [], None
+        for x in xs:
+            d = diff(x)
+            if abs(d) < 1e-12: continue
+            if previous is not None and (d < 0) != previous: crossings.append(x)
+            previous = d < 0
+        return crossings
+
+    def test_crossings_and_savings(self):
+        checked = 0
+        for seed in range(3):
+            engine = PricingEngine(random_data(seed))
+            for energy_type, mode in CATEGORY_KEYS:
+                curves = engine.cost_curves(energy_type, mode, 30)
+                for supplier in sorted({o["name"] for o in curves.table.offers}):
+                    offer_map = curves.offer_map(self.MAX_KWH, supplier)
+                    detected = [i for i, o in enumerate(curves.table.offers) if supplier in o["name"]]
+                    others = [i for i in range(len(curves)) if i not in detected]
+                    self.assertEqual(offer_map.detected, detected)
+                    expected = self.brute_crossings(curves, detected, others)
+                    with self.subTest(seed=seed, category=(energy_type, mode), supplier=supplier):
+                        self.assertEqual(len(offer_map.crossings), len(expected))
+                        for (x, d, o), brute in zip(offer_map.crossings, expected):
+                            self.assertLessEqual(abs(x - brute), 1.0)
+                            self.assertIn(d, detected)
+                            self.assertIn(o, others)
+                        for kwh in (0, 123.4, 777, 1999):
+                            totals = [curves.total(i, kwh) for i in range(len(curves))]
+                            d, o, saved = offer_map.savings(kwh)
+                            best = min(totals[i] for i in detected) - min(totals[i] for i in others)
+                            self.assertAlmostEqual(saved, best, delta=1e-9 * max(totals))
+                            self.assertAlmostEqual(totals[offer_map.at(kwh)[2]], min(totals), delta=1e-9 * max(totals))
+                    checked += len(expected)
+        self.assertGreater(checked, 0) # The random catalogues do have break-even points
+
+    def test_without_detected_provider(self):
+        curves = PricingEngine(random_data(0)).cost_curves("electricity", "residential", 30)
+        offer_map = curves.offer_map(self.MAX_KWH)
+        self.assertEqual((offer_map.detected, offer_map.crossings), ([], []))
+        self.assertIsNone(offer_map.savings(300))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import itertools
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "wattsaver_mobile"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from annual import monthly_profile, periods_from_bills
+from brute_force import bundled_data, category_totals, random_data
+from household import HouseholdPlan, normalise
+from pricing import CATEGORY_KEYS, PricingEngine
+
+# AnnualQuote and HouseholdPlan against pricing every period / every pair
+
+
+class AnnualQuoteTest(unittest.TestCase):
+    def check(self, data, periods):
+        engine = PricingEngine(data)
+        for energy_type, mode in CATEGORY_KEYS:
+            quote = engine.annual(energy_type, mode, periods)
+            per_period = [category_totals(data, energy_type, mode, kwh, days) for kwh, days in periods]
+            expected = [sum(column) for column in zip(*per_period)]
+            self.assertEqual(len(quote), len(expected))
+            for total, reference in zip(quote.total, expected):
+                self.assertAlmostEqual(total, reference, delta=1e-9 * max(1.0, reference))
+            self.assertEqual([quote.total[i] for i in quote.order], sorted(quote.total))
+
+    def test_year_of_bills(self):
+        bills = [{"total_kwh": kwh, "days": days} for kwh, days in
+                 [(420, 61), (1900, 60), (2600, 62), (75, 59), (0, 30), (5400, 120)]]
+        bills.append({"error": "unreadable"})
+        for data in (bundled_data(), random_data(3)):
+            self.check(data, periods_from_bills(bills))
+
+    def test_monthly_profile(self):
+        self.check(random_data(7), monthly_profile([300, 280, 250, 200, 150, 400, 650, 700, 300, 200, 250, 320]))
+        self.assertEqual(sum(days for _, days in monthly_profile(100)), 365)
+
+
+class HouseholdPlanTest(unittest.TestCase):
+    def brute(self, plan, top):
+        elec, gas = plan.elec.total, plan.gas.total
+        pairs = sorted((elec[i] + gas[j], i, j) for i, j in itertools.product(range(len(elec)), range(len(gas))))
+        same = {}
+        for total, i, j in pairs:
+            e, g = plan.elec.table.offers[i], plan.gas.table.offers[j]
+            supplier = e["name"].strip().upper()
+            if supplier == g["name"].strip().upper() and supplier not in same:
+                same[supplier] = total
+        return pairs[:top], sorted(same.values())
+
+    def test_pruned_search_matches_every_pair(self):
+        for seed in range(4):
+            engine = PricingEngine(random_data(seed, per_category=60))
+            for mode in ("residential", "business"):
+                for top in (1, 5, 12):
+                    plan = HouseholdPlan(engine, mode, 3600, 9000, top=top)
+                    pairs, same = self.brute(plan, top)
+                    with self.subTest(seed=seed, mode=mode, top=top):
+                        self.assertEqual([total for total, _, _ in plan.pairs], [total for total, _, _ in pairs])
+                        self.assertEqual([total for total, _, _ in plan.same_supplier], same)
+                        self.assertEqual(plan.best, plan.pairs[0])
+
+    def test_bundled_catalogue(self):
+        plan = HouseholdPlan(PricingEngine(bundled_data()), "residential", 3600, 9000)
+        pairs, same = self.brute(plan, 5)
+        self.assertEqual(plan.pairs, pairs)
+        self.assertEqual([total for total, _, _ in plan.same_supplier], same)
+
+    def test_normalise(self):
+        bills = [{"total_kwh": 600, "days": 60}, {"total_kwh": 300, "days": 30}, {"error": "unreadable"}, {"days": 0}]
+        self.assertAlmostEqual(normalise(bills), 3650)
+        self.assertIsNone(normalise([{"error": "unreadable"}]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import price_history
+from price_history import PriceHistory, append_snapshot
+from provider_diff import CATEGORY_KEYS
+
+
+def offer(name, price):
+    return {"name": name, "program": "Basic", "category": "", "type": "Live",
+            "price_kwh": price, "monthly_fee": 5.0, "discount_percent": 0.0, "color": "#d35400"}
+
+
+class FakeClock:
+    # Distinct, increasing run timestamps for appends within the same second
+    def __init__(self):
+        self.runs = iter(f"2025-06-01T0{h}:00:00" for h in range(10))
+
+    def utcnow(self):
+        run = next(self.runs)
+        return mock.Mock(strftime=lambda fmt: run)
+
+
+class PriceHistoryTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.log = os.path.join(self.tmp, "offers.csv")
+        self.index = os.path.join(self.tmp, "index.sqlite3")
+        patcher = mock.patch.object(price_history.datetime, "datetime", FakeClock())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def open(self):
+        history = PriceHistory(self.log, self.index)
+        self.addCleanup(history.close)
+        return history
+
+    def test_partial_rerun_keeps_other_categories(self):
+        append_snapshot({key: [offer(key, 0.1)] for key in CATEGORY_KEYS}, "2025-06-01", self.log)
+        append_snapshot({"providers": [offer("rerun", 0.2)]}, "2025-06-01", self.log)
+        data = self.open().snapshot("2025-06-01")
+        self.assertEqual([o["name"] for o in data["providers"]], ["rerun"])
+        for key in CATEGORY_KEYS[1:]:
+            self.assertEqual([o["name"] for o in data[key]], [key])
+
+    def test_partial_rerun_synced_separately(self):
+        # Same result when the index saw the first run before the second was appended
+        append_snapshot({key: [offer(key, 0.1)] for key in CATEGORY_KEYS}, "2025-06-01", self.log)
+        self.open()
+        append_snapshot({"providers": [offer("rerun", 0.2)]}, "2025-06-01", self.log)
+        data = self.open().snapshot("2025-06-01")
+        self.assertEqual([o["name"] for o in data["providers"]], ["rerun"])
+        self.assertEqual(sum(len(data[key]) for key in CATEGORY_KEYS), len(CATEGORY_KEYS))
+
+    def test_snapshot_keeps_last_recorded_day_of_a_missing_category(self):
+        append_snapshot({key: [offer(key, 0.1)] for key in CATEGORY_KEYS}, "2025-06-01", self.log)
+        append_snapshot({"providers": [offer("next day", 0.2)]}, "2025-06-02", self.log)
+        data = self.open().snapshot("2025-06-02")
+        self.assertEqual(data["last_updated"], "2025-06-02")
+        self.assertEqual([o["name"] for o in data["providers"]], ["next day"])
+        self.assertEqual([o["name"] for o in data["gas_providers"]], ["gas_providers"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "wattsaver_mobile"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from brute_force import bundled_data, category_totals, random_data
+from pricing import CATEGORY_KEYS, PricingEngine
+
+KWH = [0, 1, 49.5, 150, 300, 533, 1200, 1600, 2100, 5000, 40000]
+DAYS = [1, 30, 61, 365]
+
+
+class PricingEngineTest(unittest.TestCase):
+    def check(self, data):
+        engine = PricingEngine(data)
+        for energy_type, mode in CATEGORY_KEYS:
+            for days in DAYS:
+                for kwh in KWH:
+                    quote = engine.quote(energy_type, mode, kwh, days)
+                    expected = category_totals(data, energy_type, mode, kwh, days)
+                    self.assertEqual(len(quote), len(expected))
+                    for total, reference in zip(quote.total, expected):
+                        self.assertAlmostEqual(total, reference, delta=1e-9 * max(1.0, reference))
+                    self.assertEqual([quote.total[i] for i in quote.order], sorted(quote.total))
+
+    def test_bundled_catalogue_matches_per_offer_pricing(self):
+        self.check(bundled_data())
+
+    def test_random_catalogues_match_per_offer_pricing(self):
+        for seed in range(5):
+            with self.subTest(seed=seed):
+                self.check(random_data(seed))
+
+    def test_detected_provider_ranks_first(self):
+        engine = PricingEngine(random_data(1))
+        quote = engine.quote("electricity", "residential", 300, 30, "ΗΡΩΝ")
+        detected = [i for i, offer in enumerate(quote.table.offers) if offer["name"] == "ΗΡΩΝ"]
+        self.assertTrue(detected)
+        self.assertEqual(sorted(quote.order[:len(detected)]), detected)
+        rest = quote.order[len(detected):]
+        self.assertEqual([quote.total[i] for i in rest], sorted(quote.total[i] for i in rest))
+
+    def test_curve_matches_quotes(self):
+        engine = PricingEngine(random_data(2))
+        rows = engine.curve("gas", "business", KWH, 30)
+        for column, kwh in enumerate(KWH):
+            quote = engine.quote("gas", "business", kwh, 30)
+            for row, total in zip(rows, quote.total):
+                self.assertAlmostEqual(row[column], total, delta=1e-9 * max(1.0, total))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "wattsaver_mobile"))
+
+import provider_data
+from provider_data import lean_data
+
+RECORD = {"name": "ΗΡΩΝ", "program": "Basic", "category": "", "type": "Live", "price_kwh": 0.12,
+          "monthly_fee": 5.0, "discount_percent": 0.0, "color": "#d35400", "raw_data": ["", "ΗΡΩΝ"]}
+
+
+class OfferTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        self.path = os.path.join(tmp, "providers.json")
+        data = {"last_updated": "2025-06-01", "providers": [RECORD]}
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        self.offer = lean_data(data, self.path)["providers"][0]
+
+    def test_fields_are_held_on_the_record(self):
+        with mock.patch.object(provider_data, "read_providers_file") as read:
+            self.assertEqual(self.offer["name"], "ΗΡΩΝ")
+            self.assertEqual(self.offer.get("price_kwh"), 0.12)
+        read.assert_not_called()
+
+    def test_other_keys_do_not_read_the_file(self):
+        with mock.patch.object(provider_data, "read_providers_file") as read:
+            with self.assertRaises(KeyError):
+                self.offer["raw_data"]
+            self.assertIsNone(self.offer.get("color"))
+            self.assertEqual(self.offer.get("type", "Live"), "Live")
+        read.assert_not_called()
+
+    def test_details_reads_the_full_record(self):
+        self.assertEqual(self.offer.details(), RECORD)
+
+
+if __name__ == "__main__":
+    unittest.main()
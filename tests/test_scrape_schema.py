@@ -0,0 +1,47 @@
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "wattsaver_mobile"))
+
+from html_table import extract_largest_table
+from scrape_schema import LEGACY_COLUMNS, ColumnMap, RowStats, SchemaError, validate_rows
+
+FIXTURE_HTML = os.path.join(ROOT, "benchmarks", "fixtures", "energycost_residential_electricity.html")
+
+
+def fixture_rows():
+    with open(FIXTURE_HTML, "r", encoding="utf-8") as f:
+        return extract_largest_table([f.read()])
+
+
+class ColumnMapTest(unittest.TestCase):
+    def test_header_resolves_columns(self):
+        columns = ColumnMap.resolve(fixture_rows())
+        self.assertEqual(columns.header_row, 0)
+        self.assertEqual(columns.indexes, {"name": 1, "program": 4, "monthly_fee": 7, "price_kwh": 9})
+
+    def test_renamed_header_is_an_error(self):
+        # Only one field still recognisable: not read at the legacy positions
+        rows = fixture_rows()
+        rows[0] = ["", "Εταιρεία", "Έτος", "Μήνας", "Πακέτο", "Τύπος", "Χρέωση", "Σταθερό (€/μήνα)",
+                   "", "Τιμή (€/kWh)", "Εκπτώσεις", "Διάρκεια", "Σημειώσεις", "", "Εκτίμηση (€)"]
+        with self.assertRaises(SchemaError):
+            ColumnMap.resolve(rows)
+
+    def test_reordered_header_is_read_by_name(self):
+        rows = [[row[9], row[4], row[7], row[1]] for row in fixture_rows()]
+        columns = ColumnMap.resolve(rows)
+        offers = list(validate_rows(rows, columns, "Residential Electricity", RowStats()))
+        self.assertEqual((offers[0]["name"], offers[0]["price_kwh"]), ("EUNICE", 0.098))
+
+    def test_table_without_header_uses_legacy_positions(self):
+        columns = ColumnMap.resolve(fixture_rows()[1:])
+        self.assertIsNone(columns.header_row)
+        self.assertEqual(columns.indexes, LEGACY_COLUMNS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import calendar
+
+# Cost of every offer over a sequence of billing periods (a year of bills or
+# a monthly profile), priced as one batch.
+#
+# Per period p every offer's bill is (see pricing.py)
+#   total_p = (kwh_p * unit_price + monthly_fee / 30 * days_p + reg_p) * (1 + vat)
+# and summing over the periods gives
+#   total   = (unit_price * sum(kwh_p) + monthly_fee / 30 * sum(days_p) + sum(reg_p)) * (1 + vat)
+# reg_p is the only non-linear term (YKO tiers prorated by days_p / 120), and
+# it is the same for every offer, so it is computed once per period with the
+# regular regulated_charges_* functions. Pricing N offers over P periods is then
+# O(N + P) instead of N * P quotes, and equals the sum of the per-period
+# quotes up to float rounding.
+#
+# Get instances through PricingEngine.annual().
+
+# A period is (kwh, days)
+
+
+def monthly_profile(monthly_kwh, year=2025):
+    # One period per calendar month. `monthly_kwh` is 12 values, or one value
+    # used for every month.
+    if not isinstance(monthly_kwh, (list, tuple)):
+        monthly_kwh = [monthly_kwh] * 12
+    return [(kwh, calendar.monthrange(year, month)[1]) for month, kwh in enumerate(monthly_kwh[:12], 1)]
+
+
+def periods_from_bills(bills):
+    # Parsed bills (BillParser.parse_bill results) -> periods; failed parses are skipped
+    return [(bill.get("total_kwh", 0), bill.get("days", 30)) for bill in bills if "error" not in bill]
+
+
+class AnnualQuote:
+    # Priced offers summed over `periods`. Same columns as pricing.Quote, so
+    # ResultsView renders it unchanged; kwh / days / reg_cost are the sums.
+    def __init__(self, table, periods, reg_costs, vat_rate, detected=None):
+        self.table = table
+        self.periods = list(periods)
+        self.kwh = sum(kwh for kwh, _ in self.periods)
+        self.days = sum(days for _, days in self.periods)
+        self.reg_cost = sum(reg_costs)
+        self.fixed = [(fee / 30) * self.days for fee in table.monthly_fee]
+        self.energy_cost = [self.kwh * price + fixed for price, fixed in zip(table.unit_price, self.fixed)]
+        pre_vat = [cost + self.reg_cost for cost in self.energy_cost]
+        self.vat = [total * vat_rate for total in pre_vat]
+        self.total = [total + vat for total, vat in zip(pre_vat, self.vat)]
+        self.is_detected = table.matches(detected) if detected else [False] * len(table)
+        self.order = sorted(range(len(table)), key=lambda i: (not self.is_detected[i], self.total[i]))
+
+    def __len__(self):
+        return len(self.table)
+
+    def ranking(self):
+        # [(offer, total), ...] cheapest first, ignoring the detected provider
+        return sorted(((self.table.offers[i], self.total[i]) for i in range(len(self.table))),
+                      key=lambda pair: pair[1])
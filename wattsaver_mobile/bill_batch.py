@@ -0,0 +1,111 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bill_cache import default_cache_path, open_bill_cache
+from bill_parser import BillParser, cache_version
+
+# Batch bill import: parse many PDFs across CPU cores and stream one JSON
+# result per line, in input order (directories expand to their PDFs sorted by name).
+#
+#   python bill_batch.py ~/bills/2024 ~/bills/2025 --workers 4 > bills.jsonl
+#
+# Results are cached by file content (bill_cache.py), so re-running over the
+# same folders only parses new or changed PDFs; --no-cache turns that off.
+#
+# or from code:
+#   for line in parse_bills(["~/bills"]): ...
+
+_parser = None
+
+
+def collect_pdfs(paths):
+    files = []
+    for path in paths:
+        path = os.path.expanduser(path)
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                full = os.path.join(path, name)
+                if name.lower().endswith(".pdf") and os.path.isfile(full):
+                    files.append(full)
+        else:
+            files.append(path)
+    return files
+
+
+def _init_worker(cache_path=None):
+    # One BillParser (and cache connection) per worker process, reused for every file it gets
+    global _parser
+    with contextlib.redirect_stdout(sys.stderr):
+        cache = open_bill_cache(cache_version(), cache_path) if cache_path else None
+    _parser = BillParser(cache=cache)
+
+
+def parse_one(path):
+    if _parser is None: _init_worker()
+    start = time.perf_counter()
+    try:
+        # PyMuPDF writes its warnings to stdout; keep stdout for the JSON lines
+        with contextlib.redirect_stdout(sys.stderr):
+            result = _parser.parse_bill(path)
+    except Exception as e:
+        result = {"error": f"{type(e).__name__}: {e}"}
+    seconds = round(time.perf_counter() - start, 4)
+
+    if "error" in result:
+        return {"file": path, "ok": False, "seconds": seconds, "error": result["error"]}
+    return {"file": path, "ok": True, "seconds": seconds, "result": result}
+
+
+def parse_bills(paths, workers=None, cache_path=None):
+    # Yields one dict per PDF, in the same order as collect_pdfs(paths),
+    # as soon as that file (and every file before it) is done.
+    # cache_path: bill cache database to use (None = no cache).
+    files = collect_pdfs(paths)
+    if not files: return
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(files) == 1:
+        _init_worker(cache_path)
+        for path in files:
+            yield parse_one(path)
+        return
+
+    workers = min(workers, len(files))
+    # Small chunks keep the stream flowing while still batching IPC
+    chunksize = max(1, min(8, len(files) // (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cache_path,)) as executor:
+        yield from executor.map(parse_one, files, chunksize=chunksize)
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Parse PDF bills in parallel and print one JSON result per line")
+    arg_parser.add_argument("paths", nargs="+", help="PDF files and/or directories of PDFs")
+    arg_parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    arg_parser.add_argument("-o", "--output", help="Write JSON lines to this file instead of stdout")
+    arg_parser.add_argument("--cache", default=default_cache_path(), help="Bill cache database (default: %(default)s)")
+    arg_parser.add_argument("--no-cache", action="store_true", help="Parse every PDF, ignoring the cache")
+    args = arg_parser.parse_args(argv)
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    start = time.perf_counter()
+    count = failed = 0
+    try:
+        cache_path = None if args.no_cache else args.cache
+        for line in parse_bills(args.paths, args.workers, cache_path):
+            out.write(json.dumps(line, ensure_ascii=False) + "\n")
+            out.flush()
+            count += 1
+            failed += not line["ok"]
+    finally:
+        if out is not sys.stdout: out.close()
+
+    print(f"Parsed {count} bill(s), {failed} failed, in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from cloud_sync import default_storage_dir
+
+# Persistent cache of parsed bills, keyed by the PDF's content hash.
+#
+# Each entry holds the extracted text and the result dict for one
+# (sha256 of the file, parser version). Re-importing a bill - or re-running a
+# batch over the same folder - skips fitz and the heuristics entirely.
+# Entries written by another parser version are dropped when the cache is
+# opened, so bumping bill_parser.PARSER_VERSION (or the "version" in
+# assets/bill_rules.json) is all a rules change needs; a changed supplier list
+# in providers.json changes the version by itself (bill_rules fingerprint).
+# The least recently used entries are evicted past `max_entries`.
+
+CACHE_FILE = "bill_cache.sqlite3"
+DEFAULT_MAX_ENTRIES = 500
+
+
+def default_cache_path():
+    # Next to the Cloud Sync cache, in the per-app data directory
+    return os.path.join(default_storage_dir(), CACHE_FILE)
+
+
+def file_digest(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def open_bill_cache(version, path=None, max_entries=DEFAULT_MAX_ENTRIES):
+    # The cache is an optimisation: an unwritable storage dir just means no cache
+    try:
+        return BillCache(version, path, max_entries)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Bill cache unavailable: {e}")
+        return None
+
+
+class BillCache:
+    def __init__(self, version, path=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.version = str(version)
+        self.path = path or default_cache_path()
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Batch workers open the same file from several processes
+        self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS bills (
+                    digest TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (digest, version)
+                )""")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS bills_last_used ON bills (last_used)")
+            # Older parser versions can never be hit again
+            self.conn.execute("DELETE FROM bills WHERE version != ?", (self.version,))
+
+    def get(self, digest):
+        # (text, result) or None
+        with self.lock, self.conn:
+            row = self.conn.execute("SELECT text, result FROM bills WHERE digest = ? AND version = ?",
+                                    (digest, self.version)).fetchone()
+            if row is None: return None
+            self.conn.execute("UPDATE bills SET last_used = ? WHERE digest = ? AND version = ?",
+                              (time.time(), digest, self.version))
+        return row[0], json.loads(row[1])
+
+    def put(self, digest, text, result):
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO bills (digest, version, text, result, last_used) VALUES (?, ?, ?, ?, ?)",
+                              (digest, self.version, text, json.dumps(result, ensure_ascii=False), time.time()))
+            self.conn.execute("""
+                DELETE FROM bills WHERE rowid IN (
+                    SELECT rowid FROM bills ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )""", (self.max_entries,))
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM bills").fetchone()[0]
+
+    def clear(self):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM bills")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
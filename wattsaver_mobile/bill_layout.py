@@ -0,0 +1,140 @@
+import re
+import unicodedata
+
+# Layout-aware field extraction from PyMuPDF word boxes.
+#
+# page.get_text("words") gives (x0, y0, x1, y1, word, block_no, line_no, word_no)
+# per word. A field is found by its label: the value is the first number to
+# the right of the label on the same visual row, or failing that the nearest
+# number below it in the same column (table headers). This reads e.g. the
+# consumption next to "Σύνολο Κατανάλωσης" instead of guessing it from the
+# order of all numbers in the text.
+#
+# No fitz import here: BillParser feeds the words in, one page at a time, and
+# stops opening pages once LayoutScan.done. Which pages, and any extra labels,
+# come from the detected provider's rule (bill_rules.py).
+
+
+def fold(s):
+    # Case- and accent-insensitive form for label matching ("Ημέρες" == "ΗΜΕΡΕΣ")
+    s = unicodedata.normalize("NFD", s)
+    s = "".join(c for c in s if not unicodedata.combining(c))
+    return s.upper().strip(":.()[]")
+
+
+GREEK_NUMBER = re.compile(r"\d{1,3}(?:\.\d{3})+(?:,\d+)?|\d+(?:[.,]\d+)?")
+
+
+def parse_number(word):
+    # "1.234,56" / "180,26" / "15.48" / "1.234" (thousands) -> float, else None
+    w = word.strip(":()[]€%")
+    if not GREEK_NUMBER.fullmatch(w): return None
+    if "," in w:
+        w = w.replace(".", "").replace(",", ".")
+    elif re.fullmatch(r"\d{1,3}(?:\.\d{3})+", w):
+        w = w.replace(".", "")
+    return float(w)
+
+
+def kwh_value(value):
+    return int(value) if 0 < value < 100000 else None
+
+
+def days_value(value):
+    return int(value) if value == int(value) and 1 <= value <= 366 else None
+
+
+# field -> (label phrases, value check/convert)
+FIELDS = {
+    "total_kwh": (("Σύνολο Κατανάλωσης",), kwh_value),
+    "days": (("Ημέρες",), days_value),
+}
+
+
+def words_to_text(words):
+    # Plain text from word boxes: one line per (block, line), list join
+    lines = []
+    current = None
+    for w in words:
+        key = (w[5], w[6])
+        if key != current:
+            lines.append([])
+            current = key
+        lines[-1].append(w[4])
+    return "\n".join(" ".join(line) for line in lines) + "\n"
+
+
+def _find_labels(folded, words, phrase):
+    # (first, last) word indexes of every occurrence of the phrase on one line
+    tokens = fold(phrase).split()
+    n = len(tokens)
+    for i in range(len(words) - n + 1):
+        if folded[i] != tokens[0]: continue
+        if all(folded[i + k] == tokens[k] and words[i + k][5:7] == words[i][5:7] for k in range(1, n)):
+            yield i, i + n - 1
+
+
+def _value_near(words, first, last, convert):
+    x0, y0 = words[first][0], words[first][1]
+    x1, y1 = words[last][2], words[last][3]
+    mid = (y0 + y1) / 2
+    height = max(y1 - y0, 1)
+
+    # Same row, to the right
+    best = None
+    for w in words:
+        if w[0] >= x1 - 1 and w[1] <= mid <= w[3]:
+            value = parse_number(w[4])
+            if value is not None and (best is None or w[0] < best[0]):
+                checked = convert(value)
+                if checked is not None: best = (w[0], checked)
+    if best: return best[1]
+
+    # Same column, below (within a few lines)
+    for w in sorted(words, key=lambda w: w[1]):
+        if w[1] < y1 - 1 or w[1] > y1 + 4 * height: continue
+        if w[2] < x0 or w[0] > x1: continue
+        value = parse_number(w[4])
+        if value is not None:
+            checked = convert(value)
+            if checked is not None: return checked
+    return None
+
+
+def fields_with(extra_labels):
+    # FIELDS with a provider's own labels tried first: {field: [label, ...]}
+    fields = dict(FIELDS)
+    for field, labels in extra_labels.items():
+        if field in fields:
+            fields[field] = (tuple(labels) + fields[field][0], fields[field][1])
+    return fields
+
+
+class LayoutScan:
+    def __init__(self, fields=FIELDS):
+        self.fields = fields
+        self.values = {}
+        self.pages_read = []
+
+    @property
+    def done(self):
+        return len(self.values) == len(self.fields)
+
+    def add_page(self, index, words):
+        self.pages_read.append(index)
+        folded = [fold(w[4]) for w in words]
+        for field, (labels, convert) in self.fields.items():
+            if field in self.values: continue
+            value = None
+            for label in labels:
+                for first, last in _find_labels(folded, words, label):
+                    value = _value_near(words, first, last, convert)
+                    if value is not None: break
+                if value is not None:
+                    self.values[field] = value
+                    break
+
+
+def page_plan(pages, page_count):
+    # Pages to read after page 0, in order
+    return [p for p in pages if 0 < p < page_count]
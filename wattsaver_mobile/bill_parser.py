@@ -1,122 +1,111 @@
 import fitz  # PyMuPDF
-import re
+import instrument
+from bill_cache import file_digest
+from bill_layout import LayoutScan, fields_with, page_plan, words_to_text
+from bill_rules import default_rules
+from bill_text import BillTextScan, classify_bill
+
+# Bump whenever text extraction or the bill_text rules change:
+# cached results from older versions are then discarded
+PARSER_VERSION = 3
+
+def cache_version(rules=None):
+    # Cache tag: parser code + the "version" of assets/bill_rules.json + the
+    # rules actually in use (supplier rules come from the bundled providers.json)
+    rules = rules or default_rules()
+    return f"{PARSER_VERSION}/{rules.version}/{rules.fingerprint}"
 
 class BillParser:
-    def __init__(self):
-        pass
+    def __init__(self, cache=None, layout=True, rules=None):
+        self.cache = cache # Optional bill_cache.BillCache
+        self.layout = layout # Word boxes + labelled fields (bill_layout.py) instead of plain text
+        self.rules = rules or default_rules() # Provider markers, pages and labels (bill_rules.py)
 
     def extract_text_from_pdf(self, pdf_path):
-        text_content = ""
         try:
-            doc = fitz.open(pdf_path)
-            for i in range(min(2, len(doc))):
-                text_content += doc[i].get_text() + "\n"
+            with instrument.span("pdf.open"):
+                doc = fitz.open(pdf_path)
+            with instrument.span("pdf.extract", mode="text") as s:
+                pages = [doc[i].get_text() for i in range(min(2, len(doc)))]
+                s.set(pages=len(pages))
             doc.close()
-            return text_content
+            return "".join(page + "\n" for page in pages)
         except Exception as e:
             return None
 
-    def parse_bill(self, file_path):
-        text = self.extract_text_from_pdf(file_path)
-        
-        if not text:
-            return {"error": "Could not read PDF. Ensure it is a valid file."}
-        
-        # DEBUG: Print snippet
-        print(f"--- PARSING: {file_path} ---")
-        print(f"Text Sample: {text[:200]}...")
-
-        data = {
-            "total_kwh": 0,
-            "days": 30,
-            "provider_detected": "Unknown",
-            "bill_type": "electricity"
-        }
+    def extract_layout_from_pdf(self, pdf_path):
+        # Returns (text, fields) or (None, {}). Page 0 first; the provider found
+        # there picks the next pages and extra labels, and reading stops once
+        # every field is found.
+        try:
+            with instrument.span("pdf.open"):
+                doc = fitz.open(pdf_path)
+        except Exception as e:
+            return None, {}
+        try:
+            if len(doc) == 0: return None, {}
+            with instrument.span("pdf.extract", mode="layout") as s:
+                words = doc[0].get_text("words", sort=True)
+                texts = [words_to_text(words)]
+                provider = BillTextScan(texts[0], self.rules).provider
+                scan = LayoutScan(fields_with(self.rules.fields_for(provider)))
+                scan.add_page(0, words)
+                for i in page_plan(self.rules.pages_for(provider), len(doc)):
+                    if scan.done: break
+                    words = doc[i].get_text("words", sort=True)
+                    texts.append(words_to_text(words))
+                    scan.add_page(i, words)
+                s.set(pages=scan.pages_read, page_count=len(doc), provider=provider, fields=sorted(scan.values))
+            return "".join(texts), scan.values
+        except Exception as e:
+            return None, {}
+        finally:
+            doc.close()
 
-        # 1. Detect Provider
-        if "Zeni" in text or "Zenith" in text: data["provider_detected"] = "Zenith"       
-        elif "Protergia" in text: data["provider_detected"] = "Protergia"
-        elif "DEI" in text or "ΔΕΗ" in text: data["provider_detected"] = "DEI"
-        elif "Enerwave" in text: data["provider_detected"] = "Enerwave"
-        elif "ΦΥΣΙΚΟ ΑΕΡΙΟ" in text: data["provider_detected"] = "Fysiko Aerio"   
+    def parse_bill(self, file_path):
+        with instrument.profile("bill.parse"), instrument.span("bill.parse", file=file_path) as s:
+            data = self._parse_bill(file_path)
+            s.set(ok="error" not in data)
+        return data
 
-        # 2. Extract Numbers for Analysis
-        # Find all numbers like 180,26 or 15.48
-        numbers = re.findall(r'(\d+[.,]\d{2})', text)
-        clean_nums = []
-        for n in numbers:
+    def _parse_bill(self, file_path):
+        digest = None
+        if self.cache is not None:
             try:
-                val = float(n.replace(',', '.'))
-                clean_nums.append(val)
-            except: pass
+                digest = file_digest(file_path)
+            except OSError:
+                return {"error": "Could not read PDF. Ensure it is a valid file."}
+            cached = self.cache.get(digest)
+            instrument.count("bill.cache_hit" if cached is not None else "bill.cache_miss")
+            if cached is not None:
+                instrument.debug("bill.cached", file=file_path)
+                return cached[1]
 
-        # 3. Smart Detection: Gas vs Elec
-        # Check if we have a pair of numbers (Nm3, kWh) with ratio ~11.5
-        is_gas_by_math = False
-        found_gas_kwh = 0
+        if self.layout:
+            text, fields = self.extract_layout_from_pdf(file_path)
+        else:
+            text, fields = self.extract_text_from_pdf(file_path), {}
 
-        for i in range(len(clean_nums) - 1):
-            n1 = clean_nums[i] # Candidate Nm3
-            n2 = clean_nums[i+1] # Candidate kWh
-            if n1 > 1:
-                ratio = n2 / n1
-                if 10.5 < ratio < 12.5: # Typical Gas conversion factor
-                    is_gas_by_math = True
-                    found_gas_kwh = n2
-                    break
+        if not text:
+            return {"error": "Could not read PDF. Ensure it is a valid file."}
 
-        # Check text keywords as fallback
-        is_gas_by_text = False
-        is_elec_by_text = False
+        instrument.debug("bill.text", file=file_path, sample=text[:200])
 
-        if "Nm3" in text or "θερμογόνος" in text:
-            is_gas_by_text = True
-        
-        if "kVA" in text or "ΔΕΔΔΗΕ" in text or "ΑΔΜΗΕ" in text or "ΗΛΕΚΤΡΙΣΜΟΣ" in text.upper():
-            is_elec_by_text = True
-            
-        print(f"DEBUG: Gas_Math={is_gas_by_math}, Gas_Text={is_gas_by_text}, Elec_Text={is_elec_by_text}")
+        # Keywords, numbers and labelled values from one analysis of the text
+        with instrument.span("bill.classify", chars=len(text)):
+            data, scan = classify_bill(text, self.rules)
 
-        # Final Decision
-        if is_gas_by_math:
-            data["bill_type"] = "gas"
-            data["total_kwh"] = int(found_gas_kwh)
-        elif is_gas_by_text and not is_elec_by_text:
-            data["bill_type"] = "gas"
-            # Fallback kwh if math failed (pick realistic gas number)
-            valid = [x for x in clean_nums if x < 5000]
-            data["total_kwh"] = int(max(valid)) if valid else 0
-        elif is_elec_by_text and not is_gas_by_text:
-             data["bill_type"] = "electricity"
-             # Elec logic
-             zenith_match = re.search(r"Σύνολο Κατανάλωσης.*?(\d+)", text, re.DOTALL)
-             if zenith_match:
-                data["total_kwh"] = int(zenith_match.group(1))
-             elif clean_nums:
-                valid = [x for x in clean_nums if 50 < x < 3000]
-                if valid: data["total_kwh"] = int(max(valid))
-        else:
-             # Ambiguous: Default to Electricity unless math found gas
-             if is_gas_by_text: # Strong hint
-                 data["bill_type"] = "gas"
-                 valid = [x for x in clean_nums if x < 5000]
-                 data["total_kwh"] = int(max(valid)) if valid else 0
-             else:
-                 data["bill_type"] = "electricity"
-                 zenith_match = re.search(r"Σύνολο Κατανάλωσης.*?(\d+)", text, re.DOTALL)
-                 if zenith_match:
-                    data["total_kwh"] = int(zenith_match.group(1))
-                 elif clean_nums:
-                    valid = [x for x in clean_nums if 50 < x < 3000]
-                    if valid: data["total_kwh"] = int(max(valid))
-        
-        print(f"DEBUG: Result Bill Type = {data['bill_type']}")
+        # Values read next to their labels beat the text heuristics
+        if "days" in fields:
+            data["days"] = fields["days"]
+        if "total_kwh" in fields and data["bill_type"] == "electricity":
+            data["total_kwh"] = fields["total_kwh"]
 
+        if instrument.ENABLED:
+            instrument.debug("bill.result", gas_text=scan.is_gas_by_text, elec_text=scan.is_elec_by_text,
+                             numbers=len(scan.numbers), layout_fields=fields, result=data)
 
-        # Days
-        days_match = re.search(r"ΗΜΕΡΕΣ.*?(\d{2,3})", text, re.IGNORECASE)
-        if days_match:
-            try: data["days"] = int(days_match.group(1))
-            except: pass
+        if digest is not None:
+            self.cache.put(digest, text, data)
 
         return data
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+import re
+
+# Provider-specific bill parsing rules, loaded from assets/bill_rules.json:
+#
+#   {"name": "Zenith",                # reported as provider_detected
+#    "markers": ["Zeni"],             # any of these in the text -> this provider
+#    "any_case": false,               # match markers case-insensitively
+#    "catalogue": "ΖΕΝΙΘ",            # supplier name in providers.json, default `name`
+#    "pages": [0, 1],                 # pages to read (bill_layout), default DEFAULT_PAGES
+#    "fields": {"total_kwh": ["Σύνολο Κατανάλωσης"]}}   # extra labels per field
+#
+# Order is detection priority. Every supplier in providers.json that no rule
+# covers gets an automatic rule after the listed ones, with its name as written
+# there (upper case) and in title case as markers. The markers of every rule
+# end up in one trie-shaped regex (bill_text.py), so detection stays a single
+# scan however many suppliers there are. Prefer exact-case markers: an
+# any-case marker starting with a common letter ("e", "n", ...) makes re try a
+# match at every occurrence of that letter, which measured several times slower.
+
+RULES_FILE = "bill_rules.json"
+MODULE_ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+DEFAULT_PAGES = (0, 1)
+
+
+def trie_pattern(literals):
+    # Regex matching any of `literals`, with common prefixes factored out
+    # ("Zeni", "Zenith" -> "Zeni(?:th)?"). Always prefers the longest literal.
+    trie = {}
+    for literal in literals:
+        node = trie
+        for ch in literal:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node):
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches: return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node: return f"(?:{body})?"
+        return body
+
+    return emit(trie)
+
+
+class ProviderRule:
+    def __init__(self, name, markers, any_case=False, pages=None, fields=None, catalogue=None):
+        self.name = name
+        self.markers = tuple(markers)
+        self.any_case = any_case
+        self.pages = tuple(pages) if pages else DEFAULT_PAGES
+        self.fields = fields or {}
+        self.catalogue = catalogue or name
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d["name"], d["markers"], d.get("any_case", False), d.get("pages"), d.get("fields"),
+                   d.get("catalogue"))
+
+
+def _covered(name, rules):
+    folded = name.upper()
+    return any(m.upper() in folded or folded in m.upper() for rule in rules for m in rule.markers)
+
+
+def supplier_rules(providers_data, rules):
+    # One automatic rule per supplier name in providers.json not covered by `rules`
+    extra = []
+    seen = set()
+    for key in ("providers", "gas_providers", "providers_business", "gas_providers_business"):
+        for offer in (providers_data or {}).get(key, []):
+            name = offer.get("name", "").strip()
+            if not name or name in seen: continue
+            seen.add(name)
+            if not _covered(name, rules + extra):
+                markers = [name] if name.title() == name else [name, name.title()]
+                extra.append(ProviderRule(name, markers))
+    return extra
+
+
+class BillRules:
+    def __init__(self, providers, version=None):
+        self.providers = list(providers)
+        self.version = version
+        self.by_name = {rule.name: rule for rule in self.providers}
+        self._scanner = None
+
+    @classmethod
+    def load(cls, path=None, providers_data=None):
+        path = path or os.path.join(MODULE_ASSETS_DIR, RULES_FILE)
+        with open(path, "r", encoding="utf-8") as f:
+            doc = json.load(f)
+        rules = [ProviderRule.from_dict(d) for d in doc.get("providers", [])]
+        if providers_data:
+            rules += supplier_rules(providers_data, rules)
+        return cls(rules, doc.get("version"))
+
+    @property
+    def fingerprint(self):
+        # Digest of every rule, the ones generated from providers.json included:
+        # a new supplier in the daily scrape changes what bills are detected as
+        doc = [[r.name, r.markers, r.any_case, r.pages, r.fields] for r in self.providers]
+        return hashlib.sha256(json.dumps(doc, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+    @property
+    def scanner(self):
+        # Compiled once per rule set
+        if self._scanner is None:
+            from bill_text import KeywordScanner
+            self._scanner = KeywordScanner(self.providers)
+        return self._scanner
+
+    def pages_for(self, provider):
+        rule = self.by_name.get(provider)
+        return rule.pages if rule else DEFAULT_PAGES
+
+    def fields_for(self, provider):
+        rule = self.by_name.get(provider)
+        return rule.fields if rule else {}
+
+    def catalogue_name(self, provider):
+        # Name the detected provider's offers carry in providers.json ("DEI" -> "ΔΕΗ"),
+        # what PricingEngine / OfferMap match the detected provider against
+        rule = self.by_name.get(provider)
+        return rule.catalogue if rule else provider
+
+
+_default_rules = None
+
+
+def default_rules():
+    # bill_rules.json plus the suppliers in the bundled provider data, loaded once
+    global _default_rules
+    if _default_rules is None:
+        from provider_data import load_providers
+        data = load_providers(MODULE_ASSETS_DIR, include_raw=False)
+        _default_rules = BillRules.load(providers_data=data)
+    return _default_rules
@@ -0,0 +1,220 @@
+import re
+
+from bill_rules import default_rules, trie_pattern
+
+# Analysis of extracted bill text in one place.
+#
+# The fixed markers and labels stay C-level substring checks and precompiled
+# searches (memchr speed; a Python loop over regex hits measured 2x slower
+# than the scans they replaced). What the analyser saves is work that isn't
+# needed: every signal is computed on first use, the decimal tokens are read
+# only up to the first gas (Nm3, kWh) pair, and a gas pair skips the marker
+# and text.upper() checks entirely. Provider markers - which grow with the
+# supplier list - are found in one trie-shaped regex pass.
+
+# Provider markers and their priority come from the rule registry
+# (bill_rules.py); the markers and labels below apply to every bill.
+
+GAS_MARKERS = ("Nm3", "θερμογόνος")
+ELEC_MARKERS = ("kVA", "ΔΕΔΔΗΕ", "ΑΔΜΗΕ")
+ELEC_MARKERS_ANY_CASE = ("ΗΛΕΚΤΡΙΣΜΟΣ",) # Checked in text.upper()
+
+LABEL_TOTAL = "Σύνολο Κατανάλωσης"
+DAYS = re.compile(r"ΗΜΕΡΕΣ.*?(\d{2,3})", re.IGNORECASE)
+
+# 180,26 / 15.48. Same as \d+[.,]\d{2}, but re scans for a leading \d faster than for \d+
+NUMBER = re.compile(r"\d\d*[.,]\d\d")
+NUMBER_CHUNK = 8192 # chars per gas_pair() read, about a page
+DIGIT_RUN = re.compile(r"\d+")
+
+
+class KeywordScanner:
+    # Provider detection for a rule set. Every rule's markers are found in one
+    # trie-shaped regex pass: adding providers adds branches to the trie, not
+    # passes over the text. Build through BillRules.scanner.
+    def __init__(self, provider_rules):
+        self.rules = list(provider_rules)
+        self.searchers = {m: re.compile(f"(?i:{re.escape(m)})" if rule.any_case else re.escape(m)).search
+                          for rule in provider_rules for m in rule.markers}
+
+        keywords = {}  # literal -> case-insensitive
+        for rule in self.rules:
+            for marker in rule.markers:
+                keywords.setdefault(marker, rule.any_case)
+
+        exact = [k for k, any_case in keywords.items() if not any_case]
+        folded = [k for k, any_case in keywords.items() if any_case]
+        # No capture groups: they would switch off re's fast first-character skip
+        parts = [trie_pattern(exact)] if exact else []
+        if folded: parts.append(f"(?i:{trie_pattern(folded)})")
+        self.pattern = re.compile("|".join(parts)) if parts else None
+
+        self.exact = set(exact)
+        self.folded = {k.upper(): k for k in folded}
+
+        # findall reports one keyword per match, so an occurrence overlapped by
+        # another marker's match ("Zeni" inside "Zenith", or starting inside
+        # one) can be missed - but only if that other marker was found. Per
+        # marker, the markers whose match could hide it; compared upper-cased
+        # when either of the two is any-case.
+        self.hidden_by = {}
+        for k in keywords:
+            partners = []
+            for other in keywords:
+                if other == k: continue
+                a, b = (k.upper(), other.upper()) if keywords[k] or keywords[other] else (k, other)
+                if any(b[p:].startswith(a) or a.startswith(b[p:]) for p in range(len(b))):
+                    partners.append(other)
+            if partners: self.hidden_by[k] = partners
+
+    def keyword(self, token):
+        if token in self.exact: return token
+        name = self.folded.get(token.upper())
+        if name is not None: return name
+        # Case folding that str.upper() doesn't mirror (e.g. the Kelvin sign)
+        return next(k for k in self.folded.values() if self.searchers[k](token))
+
+    def present(self, text):
+        # Set of the trie's markers occurring in text
+        if self.pattern is None: return set()
+        found = {self.keyword(token) for token in set(self.pattern.findall(text))}
+        for k, partners in self.hidden_by.items():
+            if k not in found and any(p in found for p in partners) and self.searchers[k](text):
+                found.add(k)
+        return found
+
+    def provider(self, text):
+        # Name of the first rule with a marker in text, or None
+        found = self.present(text)
+        for rule in self.rules:
+            if any(m in found for m in rule.markers): return rule.name
+        return None
+
+
+class BillTextScan:
+    def __init__(self, text, rules=None):
+        self.text = text
+        self.rules = rules or default_rules()
+        self._numbers = None
+        self._provider = False # Not looked up yet
+
+    @property
+    def numbers(self):
+        # Every decimal token; already collected when gas_pair() found no pair
+        if self._numbers is None:
+            self._numbers = [float(n.replace(",", ".")) for n in NUMBER.findall(self.text)]
+        return self._numbers
+
+    @property
+    def number_offsets(self):
+        # Only needed for debugging, so not collected on the hot path
+        return [m.start() for m in NUMBER.finditer(self.text)]
+
+    def gas_pair(self):
+        # kWh of the first consecutive (Nm3, kWh) numbers with a ratio of ~11.5
+        # (the typical gas conversion factor), or None. Tokens are read a
+        # chunk of lines at a time, only up to that pair. A token never spans
+        # a newline, so the chunks give the same tokens as the whole text.
+        text = self.text
+        numbers = []
+        previous = 0
+        pos = 0
+        while pos < len(text):
+            end = text.find("\n", pos + NUMBER_CHUNK)
+            end = len(text) if end < 0 else end + 1
+            chunk = list(map(float, " ".join(NUMBER.findall(text, pos, end)).replace(",", ".").split()))
+            for n in chunk:
+                if previous > 1 and 10.5 < n / previous < 12.5:
+                    return n
+                previous = n
+            numbers += chunk
+            pos = end
+        self._numbers = numbers
+        return None
+
+    @property
+    def provider(self):
+        if self._provider is False:
+            self._provider = self.rules.scanner.provider(self.text)
+        return self._provider
+
+    @property
+    def is_gas_by_text(self):
+        return any(m in self.text for m in GAS_MARKERS)
+
+    @property
+    def is_elec_by_text(self):
+        if any(m in self.text for m in ELEC_MARKERS): return True
+        upper = self.text.upper()
+        return any(m in upper for m in ELEC_MARKERS_ANY_CASE)
+
+    @property
+    def total_consumption(self):
+        # First digit run anywhere after the first label
+        offset = self.text.find(LABEL_TOTAL)
+        if offset < 0: return None
+        m = DIGIT_RUN.search(self.text, offset + len(LABEL_TOTAL))
+        return int(m.group()) if m else None
+
+    @property
+    def days(self):
+        # First label with 2-3 digits later on the same line
+        m = DAYS.search(self.text)
+        return int(m.group(1)) if m else None
+
+
+def classify_bill(text, rules=None):
+    # Bill type, consumption, provider and days from extracted text.
+    # Returns (data, scan) so callers can log the intermediate signals.
+    scan = BillTextScan(text, rules)
+    data = {
+        "total_kwh": 0,
+        "days": 30,
+        "provider_detected": "Unknown",
+        "bill_type": "electricity"
+    }
+
+    # 1. Detect Provider
+    if scan.provider: data["provider_detected"] = scan.provider
+
+    # 2. Smart Detection: Gas vs Elec
+    # A pair of numbers (Nm3, kWh) with ratio ~11.5
+    found_gas_kwh = scan.gas_pair()
+
+    def elec_kwh():
+        if scan.total_consumption is not None:
+            return scan.total_consumption
+        valid = [x for x in scan.numbers if 50 < x < 3000]
+        return int(max(valid)) if valid else 0
+
+    def gas_kwh():
+        # Fallback kwh if math failed (pick realistic gas number)
+        valid = [x for x in scan.numbers if x < 5000]
+        return int(max(valid)) if valid else 0
+
+    # Final Decision (text keywords only checked when the math failed)
+    if found_gas_kwh is not None:
+        data["bill_type"] = "gas"
+        data["total_kwh"] = int(found_gas_kwh)
+    else:
+        is_gas_by_text = scan.is_gas_by_text
+        is_elec_by_text = scan.is_elec_by_text
+        if is_gas_by_text and not is_elec_by_text:
+            data["bill_type"] = "gas"
+            data["total_kwh"] = gas_kwh()
+        elif is_elec_by_text and not is_gas_by_text:
+            data["bill_type"] = "electricity"
+            data["total_kwh"] = elec_kwh()
+        elif is_gas_by_text: # Ambiguous, but a strong gas hint
+            data["bill_type"] = "gas"
+            data["total_kwh"] = gas_kwh()
+        else: # Ambiguous: Default to Electricity
+            data["bill_type"] = "electricity"
+            data["total_kwh"] = elec_kwh()
+
+    # Days
+    days = scan.days
+    if days is not None:
+        data["days"] = days
+
+    return data, scan
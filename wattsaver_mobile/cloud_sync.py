@@ -0,0 +1,102 @@
+import json
+import os
+import tempfile
+import time
+
+# Conditional download of providers.json with a persistent offline cache.
+#
+# The last good payload and its HTTP validators (ETag / Last-Modified) are kept
+# in the app's storage directory, so:
+#  - startup can load the newest data we ever downloaded, not just the bundled asset
+#  - a sync where nothing changed is a 304 with no body and nothing to parse
+#
+# `requests` is imported on the first fetch, not at app startup.
+
+CACHE_FILE = "providers_cache.json"
+META_FILE = "providers_cache.meta.json"
+
+NOT_MODIFIED = "not_modified"
+UPDATED = "updated"
+
+
+def default_storage_dir():
+    # Flet packaged apps expose a writable per-app data directory
+    return os.getenv("FLET_APP_STORAGE_DATA") or os.path.join(os.path.expanduser("~"), ".wattsaver")
+
+
+def _write_atomic(path, text):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path): os.remove(tmp_path)
+        raise
+
+
+class CloudSync:
+    def __init__(self, url, storage_dir=None, timeout=15):
+        self.url = url
+        self.storage_dir = storage_dir or default_storage_dir()
+        self.timeout = timeout
+        self._session = None
+
+    @property
+    def session(self):
+        # Created on the first sync and reused after it (keep-alive)
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
+
+    @property
+    def cache_path(self):
+        return os.path.join(self.storage_dir, CACHE_FILE)
+
+    @property
+    def meta_path(self):
+        return os.path.join(self.storage_dir, META_FILE)
+
+    def load_cached(self):
+        # Last good payload (JSON text) or None
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _load_meta(self):
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def fetch(self):
+        # Returns (NOT_MODIFIED, None, None) or (UPDATED, payload_text, validators).
+        # Raises requests exceptions on network/HTTP errors.
+        headers = {}
+        if os.path.exists(self.cache_path):
+            # Validators are only useful while we still hold the body they describe
+            meta = self._load_meta()
+            if meta.get("etag"): headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"): headers["If-Modified-Since"] = meta["last_modified"]
+
+        r = self.session.get(self.url, headers=headers, timeout=self.timeout)
+        if r.status_code == 304:
+            return NOT_MODIFIED, None, None
+        r.raise_for_status()
+        # providers.json is always UTF-8 (raw.githubusercontent may not say so)
+        return UPDATED, r.content.decode("utf-8"), {
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+        }
+
+    def store(self, payload, validators):
+        # Call only after the payload parsed successfully
+        _write_atomic(self.cache_path, payload)
+        meta = dict(validators, fetched_at=time.strftime("%Y-%m-%dT%H:%M:%S"))
+        _write_atomic(self.meta_path, json.dumps(meta))
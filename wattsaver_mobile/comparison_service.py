@@ -0,0 +1,264 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import threading
+import time
+from functools import lru_cache
+from urllib.parse import parse_qs, urlsplit
+
+from pricing import CATEGORY_KEYS, ELECTRICITY, PricingEngine
+from provider_data import JSON_ASSET, find_assets_dir, read_providers_file
+
+# Headless offer comparison over providers.json, without the Flet UI.
+#
+#   service = ComparisonService()                # assets/providers.json
+#   service.rank("electricity", "residential", kwh=300, days=30, limit=5)
+#
+#   python comparison_service.py --port 8080     # HTTP endpoint, see handle()
+#   curl 'localhost:8080/rank?kwh=300&days=30&type=electricity&mode=residential&limit=5'
+#
+# The data file is loaded into a Catalogue: one PricingEngine (the same
+# columns the app prices from) plus a per-category index of offers by
+# provider. A catalogue is never modified after it is built; a changed file
+# (mtime / size) builds a new one that replaces the old one in a single
+# assignment, so requests in flight keep a consistent snapshot and need no
+# locks. Pricing a category is a fraction of a millisecond and identical
+# requests are answered from a per-catalogue LRU cache, so one process serves
+# many clients.
+
+QUOTE_CACHE_SIZE = 1024
+MAX_REQUEST_BYTES = 16384
+
+
+class Catalogue:
+    def __init__(self, data, stamp=None):
+        self.engine = PricingEngine(data)
+        self.last_updated = data.get("last_updated", "")
+        self.stamp = stamp # (mtime_ns, size) of the file it was loaded from
+        # (energy type, mode) -> {provider name (upper case): [offer index, ...]}
+        self.by_provider = {}
+        for category, table in self.engine.tables.items():
+            index = self.by_provider[category] = {}
+            for i, offer in enumerate(table.offers):
+                index.setdefault(offer["name"].strip().upper(), []).append(i)
+        self.quote = lru_cache(maxsize=QUOTE_CACHE_SIZE)(self._quote)
+
+    def _quote(self, energy_type, mode, kwh, days):
+        return self.engine.quote(energy_type, mode, kwh, days)
+
+    def __len__(self):
+        return sum(len(table) for table in self.engine.tables.values())
+
+    def providers(self, energy_type, mode):
+        table = self.engine.table(energy_type, mode)
+        return [table.offers[indexes[0]]["name"] for indexes in self.by_provider[(energy_type, mode)].values()]
+
+    def offer_indexes(self, energy_type, mode, provider):
+        return self.by_provider[(energy_type, mode)].get(provider.strip().upper(), [])
+
+    def rank(self, energy_type, mode, kwh, days=30, provider=None, limit=None):
+        # Offers cheapest first as dicts; `provider` keeps only that supplier's offers
+        quote = self.quote(energy_type, mode, kwh, days)
+        table = quote.table
+        order = sorted(range(len(table)), key=quote.total.__getitem__)
+        positions = {i: p for p, i in enumerate(order, 1)}
+        if provider:
+            order = sorted(self.offer_indexes(energy_type, mode, provider), key=quote.total.__getitem__)
+        if limit is not None:
+            order = order[:limit]
+        return [{
+            "rank": positions[i],
+            "name": table.offers[i]["name"],
+            "program": table.offers[i]["program"],
+            "price_kwh": table.offers[i]["price_kwh"],
+            "monthly_fee": table.offers[i]["monthly_fee"],
+            "energy_cost": round(quote.energy_cost[i], 2),
+            "regulated": round(quote.reg_cost, 2),
+            "vat": round(quote.vat[i], 2),
+            "total": round(quote.total[i], 2),
+        } for i in order]
+
+
+class ComparisonService:
+    def __init__(self, path=None, check_interval=1.0):
+        # check_interval: seconds between file checks on access (None = only reload())
+        self.path = path or os.path.join(find_assets_dir() or ".", JSON_ASSET)
+        self.check_interval = check_interval
+        self._catalogue = None
+        self._checked = 0.0
+        self._reload_lock = threading.Lock()
+        self.reload()
+
+    def _stamp(self):
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size
+
+    def reload(self):
+        # Rebuild the catalogue if the file changed. Returns True on a reload;
+        # a file that fails to load leaves the current catalogue in place.
+        with self._reload_lock:
+            self._checked = time.monotonic()
+            try:
+                stamp = self._stamp()
+                if self._catalogue is not None and self._catalogue.stamp == stamp:
+                    return False
+                catalogue = Catalogue(read_providers_file(self.path, include_raw=False), stamp)
+            except (OSError, ValueError) as e:
+                if self._catalogue is None: raise
+                print(f"Reload of {self.path} failed, keeping the loaded data: {e}")
+                return False
+            self._catalogue = catalogue
+            print(f"Loaded {len(catalogue)} offers from {self.path} (updated {catalogue.last_updated or '?'})")
+            return True
+
+    @property
+    def catalogue(self):
+        if self.check_interval is not None and time.monotonic() - self._checked >= self.check_interval:
+            self.reload()
+        return self._catalogue
+
+    def rank(self, energy_type, mode, kwh, days=30, provider=None, limit=None):
+        return self.catalogue.rank(energy_type, mode, kwh, days, provider, limit)
+
+    def providers(self, energy_type, mode):
+        return self.catalogue.providers(energy_type, mode)
+
+
+# --- HTTP endpoint ---
+
+class BadRequest(Exception):
+    pass
+
+
+def _param(query, name, convert=str, default=None):
+    values = query.get(name)
+    if not values:
+        if default is None: raise BadRequest(f"Missing parameter: {name}")
+        return default
+    try:
+        return convert(values[0])
+    except ValueError:
+        raise BadRequest(f"Invalid {name}: {values[0]}")
+
+
+def _category(query):
+    energy_type = _param(query, "type", default=ELECTRICITY)
+    mode = _param(query, "mode", default="residential")
+    if (energy_type, mode) not in CATEGORY_KEYS:
+        raise BadRequest(f"Unknown category: {energy_type}/{mode}")
+    return energy_type, mode
+
+
+def handle(service, target):
+    # (status, body dict) for one GET request target
+    #   /health
+    #   /providers?type=gas&mode=business
+    #   /rank?kwh=300[&days=30&type=electricity&mode=residential&provider=ΔΕΗ&limit=10]
+    url = urlsplit(target)
+    query = parse_qs(url.query)
+    try:
+        if url.path == "/health":
+            catalogue = service.catalogue
+            return 200, {"status": "ok", "offers": len(catalogue), "last_updated": catalogue.last_updated}
+        if url.path == "/providers":
+            energy_type, mode = _category(query)
+            return 200, {"providers": service.providers(energy_type, mode)}
+        if url.path == "/rank":
+            energy_type, mode = _category(query)
+            kwh = _param(query, "kwh", float)
+            days = _param(query, "days", int, 30)
+            limit = _param(query, "limit", int) if "limit" in query else None
+            # NaN / inf would come back as NaN / Infinity, which is not JSON
+            if not math.isfinite(kwh) or kwh < 0 or days <= 0:
+                raise BadRequest("kwh must be a number >= 0 and days > 0")
+            if limit is not None and limit < 1: raise BadRequest("limit must be >= 1")
+            catalogue = service.catalogue
+            offers = catalogue.rank(energy_type, mode, kwh, days, _param(query, "provider", default=""), limit)
+            return 200, {"type": energy_type, "mode": mode, "kwh": kwh, "days": days,
+                         "last_updated": catalogue.last_updated, "offers": offers}
+        return 404, {"error": f"Not found: {url.path}"}
+    except BadRequest as e:
+        return 400, {"error": str(e)}
+    except Exception as e:
+        # Still an answer: the connection stays usable and the client isn't left waiting
+        print(f"Error handling {target}: {e!r}")
+        return 500, {"error": "Internal server error"}
+
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+           500: "Internal Server Error"}
+
+
+async def _serve_connection(service, reader, writer):
+    # HTTP/1.1 with keep-alive; one request at a time per connection
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except asyncio.LimitOverrunError:
+                status, body, keep_alive = 413, {"error": "Request too large"}, False
+            except asyncio.IncompleteReadError:
+                return # Client closed the connection
+            else:
+                lines = head.decode("latin-1").split("\r\n")
+                method, target, version = (lines[0].split(" ") + ["", "", ""])[:3]
+                headers = {k.strip().lower(): v.strip() for k, _, v in (line.partition(":") for line in lines[1:] if line)}
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                if method != "GET":
+                    status, body = 405, {"error": f"Method not allowed: {method}"}
+                else:
+                    status, body = handle(service, target)
+
+            payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + payload)
+            await writer.drain()
+            if not keep_alive: return
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def _watch(service, interval):
+    # Off the event loop: a reload parses the whole file
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        await loop.run_in_executor(None, service.reload)
+
+
+async def serve(service, host="127.0.0.1", port=8080, watch_interval=2.0, on_ready=None):
+    # on_ready(port): called once listening; port=0 picks a free port
+    server = await asyncio.start_server(lambda r, w: _serve_connection(service, r, w), host, port,
+                                        limit=MAX_REQUEST_BYTES)
+    port = server.sockets[0].getsockname()[1]
+    watcher = asyncio.ensure_future(_watch(service, watch_interval))
+    print(f"Serving comparisons on http://{host}:{port} ({service.path})")
+    if on_ready: on_ready(port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        watcher.cancel()
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="HTTP offer comparison over providers.json")
+    arg_parser.add_argument("--data", help="providers.json or columnar asset (default: the bundled assets)")
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8080)
+    arg_parser.add_argument("--watch", type=float, default=2.0, help="Seconds between data file checks")
+    args = arg_parser.parse_args()
+
+    # The watcher reloads; requests never stat the file themselves
+    service = ComparisonService(args.data, check_interval=None)
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.watch))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,221 @@
+from bisect import bisect_right
+
+from pricing import ELECTRICITY, DEFAULT_YKO_TIERS
+
+# Precomputed cost curves for one (data snapshot, energy type, mode, days).
+#
+# With the billing days fixed, every offer's total is piecewise-linear in kWh:
+#   total(x) = (unit_price * x + fixed + reg(x)) * (1 + vat)
+# reg(x) is shared by all offers and only bends at the YKO tier limits, so it
+# is stored once as breakpoints + slopes. Because reg(x) is common, the cheapest
+# offer at x is the lowest of the lines unit_price * x + fixed, i.e. their lower
+# envelope, which is precomputed too. Both queries are a bisect: O(log n).
+# OfferMap spreads that over the whole slider range: the interval where each
+# offer is cheapest and the break-even points of a detected provider.
+#
+# Get instances through PricingEngine.cost_curves(); they are cached on the
+# engine, which load_data replaces on every new snapshot.
+
+
+class PiecewiseLinear:
+    # f(x) = values[k] + slopes[k] * (x - breaks[k]) for breaks[k] <= x < breaks[k+1]
+    def __init__(self, breaks, values, slopes):
+        self.breaks = breaks
+        self.values = values
+        self.slopes = slopes
+
+    def __call__(self, x):
+        k = max(0, bisect_right(self.breaks, x) - 1)
+        return self.values[k] + self.slopes[k] * (x - self.breaks[k])
+
+    @classmethod
+    def from_segments(cls, start_value, segments):
+        # segments: [(length, slope), ...] starting at x=0; the last one is open-ended
+        breaks, values, slopes = [], [], []
+        x, value = 0.0, start_value
+        for length, slope in segments:
+            if length <= 0 and slopes: continue
+            breaks.append(x)
+            values.append(value)
+            slopes.append(slope)
+            x += length
+            value += slope * length
+        return cls(breaks, values, slopes)
+
+
+def regulated_curve_elec(reg_charges, days):
+    # Same charges as pricing.regulated_charges_elec, folded into segments
+    if not reg_charges:
+        return PiecewiseLinear([0.0], [0.0], [0.0])
+    kva = 8
+    base_slope = reg_charges.get("admie_monopasiko", 0.00999) + \
+                 reg_charges.get("deddie_monopasiko_energy", 0.00339) + \
+                 reg_charges.get("etmear", 0.017)
+    start = 0.5 + reg_charges.get("deddie_monopasiko_power", 6.21) * kva * (days/365)
+
+    period_factor = days / 120
+    tiers = reg_charges.get("yko_tiers", []) or DEFAULT_YKO_TIERS
+    segments = [(tier["limit"] * period_factor, base_slope + tier["rate"]) for tier in tiers]
+    # Past the last tier no more YKO is charged
+    segments.append((float("inf"), base_slope))
+    return PiecewiseLinear.from_segments(start, segments)
+
+
+def regulated_curve_gas(gas_reg_charges, days):
+    if not gas_reg_charges:
+        return PiecewiseLinear([0.0], [0.0], [0.0])
+    start = gas_reg_charges.get("fixed_network_charge_per_month", 0.85) * (days / 30)
+    slope = gas_reg_charges.get("variable_network_charge_per_kwh", 0.003) + \
+            gas_reg_charges.get("etd_per_kwh", 0.002) + \
+            gas_reg_charges.get("eph_per_kwh", 0.005)
+    return PiecewiseLinear([0.0], [start], [slope])
+
+
+def lower_envelope(slopes, intercepts):
+    # Lower envelope of y = slopes[i] * x + intercepts[i] for x >= 0.
+    # Returns (starts, indexes): line indexes[k] is lowest from starts[k] up to starts[k+1].
+    # Ties go to the lower index, like the stable sort in the ranking.
+    order = sorted(range(len(slopes)), key=lambda i: (-slopes[i], intercepts[i], i))
+    hull, starts = [], []
+    for i in order:
+        if hull and slopes[hull[-1]] == slopes[i]:
+            continue # Parallel and not lower
+        x = float("-inf")
+        while hull:
+            j = hull[-1]
+            x = (intercepts[i] - intercepts[j]) / (slopes[j] - slopes[i])
+            if x <= starts[-1]:
+                hull.pop()
+                starts.pop()
+                x = float("-inf")
+            else:
+                break
+        hull.append(i)
+        starts.append(x)
+
+    # Clip to the x >= 0 domain
+    k = max(0, bisect_right(starts, 0.0) - 1)
+    hull, starts = hull[k:], starts[k:]
+    if starts: starts[0] = 0.0
+    return starts, hull
+
+
+class CostCurves:
+    def __init__(self, engine, energy_type, mode, days):
+        table = engine.table(energy_type, mode)
+        self.table = table
+        self.energy_type = energy_type
+        self.mode = mode
+        self.days = days
+        self.vat_factor = 1 + engine.vat_rate(energy_type)
+        self.slopes = list(table.unit_price)
+        self.intercepts = [(fee / 30) * days for fee in table.monthly_fee]
+
+        if energy_type == ELECTRICITY:
+            self.regulated = regulated_curve_elec(engine.reg_charges, days)
+        else:
+            self.regulated = regulated_curve_gas(engine.gas_reg_charges, days)
+
+        self.envelope_starts, self.envelope_offers = lower_envelope(self.slopes, self.intercepts)
+        self._maps = {}
+
+    def __len__(self):
+        return len(self.table)
+
+    def total(self, index, kwh):
+        # Total bill (incl. VAT) of offer `index` at `kwh`
+        return (self.slopes[index] * kwh + self.intercepts[index] + self.regulated(kwh)) * self.vat_factor
+
+    def cheapest(self, kwh):
+        # (offer index, total) of the cheapest offer at `kwh`, or None for an empty category
+        if not self.envelope_offers: return None
+        k = max(0, bisect_right(self.envelope_starts, kwh) - 1)
+        index = self.envelope_offers[k]
+        return index, self.total(index, kwh)
+
+    def envelope(self, max_kwh=None):
+        # [(from_kwh, to_kwh, offer index), ...] covering [0, max_kwh)
+        segments = []
+        ends = self.envelope_starts[1:] + [float("inf")]
+        for start, end, index in zip(self.envelope_starts, ends, self.envelope_offers):
+            if max_kwh is not None:
+                if start >= max_kwh: break
+                end = min(end, max_kwh)
+            segments.append((start, end, index))
+        return segments
+
+    def offer_map(self, max_kwh, detected=None):
+        # OfferMap over [0, max_kwh], cached per (max_kwh, detected provider)
+        key = (max_kwh, detected)
+        offer_map = self._maps.get(key)
+        if offer_map is None:
+            offer_map = self._maps[key] = OfferMap(self, max_kwh, detected)
+        return offer_map
+
+
+def _segments(curves, indexes, max_kwh):
+    # Lower envelope of a subset of the offers as [(from_kwh, to_kwh, offer index), ...]
+    if not indexes: return []
+    starts, hull = lower_envelope([curves.slopes[i] for i in indexes], [curves.intercepts[i] for i in indexes])
+    ends = starts[1:] + [float("inf")]
+    return [(start, min(end, max_kwh), indexes[k]) for start, end, k in zip(starts, ends, hull) if start < max_kwh]
+
+
+class OfferMap:
+    # The whole slider range at once, for one CostCurves (snapshot, energy type,
+    # mode, days):
+    #   intervals  [(from_kwh, to_kwh, offer index), ...] where each offer is cheapest
+    #   detected   offer indexes of the detected provider ([] if none)
+    #   crossings  [(kwh, detected offer, best alternative), ...] where the detected
+    #              provider's best offer and the best other offer cost the same
+    # Built once; at() / savings() per slider position are a bisect.
+    def __init__(self, curves, max_kwh, detected=None):
+        self.curves = curves
+        self.max_kwh = max_kwh
+        self.intervals = curves.envelope(max_kwh)
+        self.starts = [start for start, _, _ in self.intervals]
+
+        matches = curves.table.matches(detected) if detected else [False] * len(curves)
+        self.detected = [i for i, m in enumerate(matches) if m]
+        others = [i for i, m in enumerate(matches) if not m]
+        self.detected_segments = _segments(curves, self.detected, max_kwh)
+        self.other_segments = _segments(curves, others, max_kwh)
+        self.crossings = self._crossings() if self.detected and others else []
+
+    def _crossings(self):
+        # Walk both envelopes together; on each piece both are one line, so the
+        # difference is linear and changes sign at most once.
+        slopes, intercepts = self.curves.slopes, self.curves.intercepts
+        points = sorted({s for s, _, _ in self.detected_segments} | {s for s, _, _ in self.other_segments})
+        bounds = points[1:] + [self.max_kwh]
+        crossings = []
+        for a, b in zip(points, bounds):
+            d = self._line_at(self.detected_segments, a)
+            o = self._line_at(self.other_segments, a)
+            # detected - other = slope * x + offset
+            slope = slopes[d] - slopes[o]
+            offset = intercepts[d] - intercepts[o]
+            if slope == 0: continue
+            x = -offset / slope
+            if a < x <= b and x < self.max_kwh:
+                crossings.append((x, d, o))
+        return crossings
+
+    @staticmethod
+    def _line_at(segments, kwh):
+        k = max(0, bisect_right([s for s, _, _ in segments], kwh) - 1)
+        return segments[k][2]
+
+    def at(self, kwh):
+        # (from_kwh, to_kwh, offer index) of the interval holding `kwh`, or None
+        if not self.intervals: return None
+        k = max(0, bisect_right(self.starts, kwh) - 1)
+        return self.intervals[k]
+
+    def savings(self, kwh):
+        # (detected offer, best alternative, € saved by switching) at `kwh`, or
+        # None without a detected provider. Negative: the detected offer is cheaper.
+        if not self.detected_segments or not self.other_segments: return None
+        d = self._line_at(self.detected_segments, kwh)
+        o = self._line_at(self.other_segments, kwh)
+        return d, o, self.curves.total(d, kwh) - self.curves.total(o, kwh)
@@ -0,0 +1,72 @@
+import heapq
+
+from pricing import ELECTRICITY, GAS
+
+# Cheapest electricity + gas combination for a household.
+#
+# The imported bills of each energy type are normalised to one common period
+# (consumption per day from the parsed kWh and days, times `days`), each type
+# is priced in one Quote pass, and the pairs are searched with pruning instead
+# of pricing all n_elec * n_gas combinations: an electricity offer that at
+# least `top` other electricity offers beat can't be part of the `top`
+# cheapest pairs (swapping it for any of them gives a cheaper pair), and the
+# same goes for gas. So only each side's `top` cheapest offers are paired:
+# O(n log top + top^2) whatever the catalogue size.
+#
+# Same-supplier pairs (one supplier for both, e.g. for a bundle discount that
+# providers.json doesn't price) are the cheapest electricity and cheapest gas
+# offer of every supplier that sells both: one pass per type.
+
+HOUSEHOLD_DAYS = 365
+
+
+def normalise(bills, days=HOUSEHOLD_DAYS):
+    # kWh over `days` at the bills' average daily consumption, or None without bills
+    bills = [b for b in bills if "error" not in b and b.get("days")]
+    total_days = sum(b["days"] for b in bills)
+    if not total_days: return None
+    return sum(b.get("total_kwh", 0) for b in bills) / total_days * days
+
+
+def _supplier(offer):
+    return offer["name"].strip().upper()
+
+
+class HouseholdPlan:
+    # pairs          [(total, elec index, gas index), ...] cheapest first (at most `top`)
+    # same_supplier  [(total, elec index, gas index), ...] one per supplier selling both, cheapest first
+    # Indexes are into elec.table / gas.table (the two Quotes).
+    def __init__(self, engine, mode, elec_kwh, gas_kwh, days=HOUSEHOLD_DAYS, top=5):
+        self.days = days
+        self.elec_kwh = elec_kwh
+        self.gas_kwh = gas_kwh
+        self.elec = engine.quote(ELECTRICITY, mode, elec_kwh, days)
+        self.gas = engine.quote(GAS, mode, gas_kwh, days)
+
+        elec_total, gas_total = self.elec.total, self.gas.total
+        elec_best = heapq.nsmallest(top, range(len(elec_total)), key=elec_total.__getitem__)
+        gas_best = heapq.nsmallest(top, range(len(gas_total)), key=gas_total.__getitem__)
+        self.pairs = heapq.nsmallest(top, ((elec_total[i] + gas_total[j], i, j) for i in elec_best for j in gas_best))
+
+        cheapest_gas = {}
+        for j, offer in enumerate(self.gas.table.offers):
+            supplier = _supplier(offer)
+            if supplier not in cheapest_gas or gas_total[j] < gas_total[cheapest_gas[supplier]]:
+                cheapest_gas[supplier] = j
+        cheapest_elec = {}
+        for i, offer in enumerate(self.elec.table.offers):
+            supplier = _supplier(offer)
+            if supplier in cheapest_gas and (supplier not in cheapest_elec or elec_total[i] < elec_total[cheapest_elec[supplier]]):
+                cheapest_elec[supplier] = i
+        self.same_supplier = sorted((elec_total[i] + gas_total[cheapest_gas[s]], i, cheapest_gas[s])
+                                    for s, i in cheapest_elec.items())
+
+    @property
+    def best(self):
+        return self.pairs[0] if self.pairs else None
+
+    def describe(self, pair):
+        # "EUNICE - HOME CORE + ΗΡΩΝ - Gas Basic"
+        total, i, j = pair
+        e, g = self.elec.table.offers[i], self.gas.table.offers[j]
+        return f"{e['name']} - {e['program']} + {g['name']} - {g['program']}"
@@ -0,0 +1,139 @@
+import atexit
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+
+# Opt-in timing / debug instrumentation, written as JSON lines.
+#
+#   WATTSAVER_TRACE=stderr     -> one JSON object per line on stderr
+#   WATTSAVER_TRACE=trace.jsonl -> appended to that file
+#   WATTSAVER_PROFILE=profiles/ -> also cProfile every profile() block into
+#                                  profiles/<name>-<pid>-<n>.prof
+#
+# Records:
+#   {"type": "span", "name": "pdf.extract", "ms": 12.3, ...fields}
+#   {"type": "debug", "name": "parse.result", ...fields}
+#   {"type": "counters", "counters": {"bill.cache_hit": 3, ...}}   (at exit)
+#
+# With WATTSAVER_TRACE unset, span() returns a shared no-op context manager,
+# count() and debug() return immediately, and nothing is formatted: wrap any
+# costly debug arguments in `if instrument.ENABLED:`.
+
+TRACE = os.getenv("WATTSAVER_TRACE", "")
+PROFILE_DIR = os.getenv("WATTSAVER_PROFILE", "")
+ENABLED = bool(TRACE)
+
+_lock = threading.Lock()
+_out = None
+_counters = {}
+_profiles = 0
+
+
+def _stream():
+    global _out
+    if _out is None:
+        if TRACE in ("1", "stderr"):
+            _out = sys.stderr
+        else:
+            directory = os.path.dirname(os.path.abspath(TRACE))
+            os.makedirs(directory, exist_ok=True)
+            _out = open(TRACE, "a", encoding="utf-8", buffering=1)
+    return _out
+
+
+def emit(record):
+    record.setdefault("ts", round(time.time(), 6))
+    record.setdefault("pid", os.getpid())
+    line = json.dumps(record, ensure_ascii=False, default=str)
+    with _lock:
+        _stream().write(line + "\n")
+
+
+class _NoSpan:
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+    def set(self, **fields): pass
+
+
+NO_SPAN = _NoSpan()
+
+
+class Span:
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+
+    def set(self, **fields):
+        # Attach results found inside the span (row counts, cache hit, ...)
+        self.fields.update(fields)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record = {"type": "span", "name": self.name, "ms": round((time.perf_counter() - self.start) * 1000, 3),
+                  "thread": threading.current_thread().name}
+        record.update(self.fields)
+        if exc_type is not None: record["error"] = exc_type.__name__
+        emit(record)
+        return False
+
+
+def span(name, **fields):
+    # with span("pdf.extract", file=path) as s: ...; s.set(pages=2)
+    if not ENABLED: return NO_SPAN
+    return Span(name, fields)
+
+
+def count(name, n=1):
+    if not ENABLED: return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def debug(name, **fields):
+    if not ENABLED: return
+    emit({"type": "debug", "name": name, **fields})
+
+
+class _Profile:
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc):
+        global _profiles
+        self.profiler.disable()
+        with _lock:
+            _profiles += 1
+            n = _profiles
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, f"{self.name}-{os.getpid()}-{n}.prof")
+        self.profiler.dump_stats(path)
+        if ENABLED: emit({"type": "profile", "name": self.name, "path": path})
+        return False
+
+
+def profile(name):
+    # cProfile the block when WATTSAVER_PROFILE is set (view with `python -m pstats`)
+    if not PROFILE_DIR: return NO_SPAN
+    return _Profile(name)
+
+
+def flush_counters():
+    if not ENABLED: return
+    with _lock:
+        counters = dict(_counters)
+        _counters.clear()
+    if counters: emit({"type": "counters", "counters": counters})
+
+
+if ENABLED: atexit.register(flush_counters)
@@ -1,12 +1,29 @@
+import time
+STARTED = time.perf_counter() # Startup clock for the ui.first_frame record
+
 import flet as ft
 import json
 import os
-import requests
-from bill_parser import BillParser
+import threading
+import instrument
+from annual import monthly_profile, periods_from_bills
+from cloud_sync import CloudSync, NOT_MODIFIED
+from household import HOUSEHOLD_DAYS, HouseholdPlan, normalise
+from pricing import PricingEngine
+from provider_data import lean_data, load_providers
+from results_view import OfferBand, ResultsView, Throttle
 
 # REPLACE WITH YOUR REPO URL
 GITHUB_DATA_URL = "https://raw.githubusercontent.com/papajimm/wattsaver-mobile/main/wattsaver_mobile/assets/providers.json"
 
+SLIDER_MAX = 2000 # kWh
+
+# Cold start: nothing heavy runs before the first frame. PyMuPDF (bill_parser)
+# is imported when the first PDF is picked and requests on the first Cloud
+# Sync; provider data loads on a background thread behind a skeleton UI; only
+# the visible tab's list is built, the other one on first view.
+# benchmarks/startup.py measures it.
+
 def main(page: ft.Page):
     page.title = "WattSaver Mobile"
     page.theme_mode = ft.ThemeMode.DARK
@@ -24,6 +41,7 @@ def main(page: ft.Page):
 
     reg_charges = {}
     gas_reg_charges = {}
+    engine = PricingEngine({})
     
     current_elec_kwh = 0
     current_gas_kwh = 0
@@ -33,62 +51,112 @@ def main(page: ft.Page):
     # Mode: "residential" or "business"
     current_mode = "residential"
 
-    parser = BillParser()
+    # Year view: offers priced over the imported bills (this session), or over
+    # 12 months at the slider value when none of that energy type were imported
+    annual_view = False
+    imported_bills = {"electricity": {}, "gas": {}} # file path -> parse result
+
+    data_last_updated = ""
+    data_loaded = False
+
+    # Tabs whose list is out of date; rendered when next shown
+    stale_tabs = set()
+
+    cloud = CloudSync(GITHUB_DATA_URL)
+    parser = None
+
+    def get_parser():
+        # Built on the first import; re-importing a bill we've already parsed is a cache lookup
+        nonlocal parser
+        if parser is None:
+            from bill_cache import CACHE_FILE, open_bill_cache
+            from bill_parser import BillParser, cache_version
+            parser = BillParser(cache=open_bill_cache(cache_version(), os.path.join(cloud.storage_dir, CACHE_FILE)))
+        return parser
 
     # --- LOAD DATA ---
-    def load_data(from_json_string=None):
-        nonlocal providers_res, gas_providers_res, providers_bus, gas_providers_bus, reg_charges, gas_reg_charges
-        try:
-            data = None
-            if from_json_string:
-                data = json.loads(from_json_string)
-            else:
-                # Load Local
-                path = "assets/providers.json" 
-                if not os.path.exists(path):
-                    path = "wattsaver_mobile/assets/providers.json"
-                
-                if os.path.exists(path):
-                    with open(path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
+    def load_data(from_json_string=None, newer_only=False):
+        nonlocal providers_res, gas_providers_res, providers_bus, gas_providers_bus, reg_charges, gas_reg_charges, data_last_updated, engine
+        with instrument.span("ui.load_data", source="payload" if from_json_string else "asset"):
+            try:
+                data = None
+                # Slotted Offer records; raw_data etc. stay in the file until a details view asks
+                if from_json_string:
+                    # Cloud Sync keeps this payload as cloud.cache_path, where offers read their full records
+                    data = lean_data(json.loads(from_json_string), cloud.cache_path)
+                else:
+                    # Load Local (compact columnar asset if bundled, else providers.json)
+                    data = load_providers(lean=True)
             
-            if data:
-                # Residential
-                providers_res = data.get("providers", [])
-                gas_providers_res = data.get("gas_providers", [])
+                if data and newer_only and data.get("last_updated", "") < data_last_updated:
+                    return False
+
+                if data:
+                    data_last_updated = data.get("last_updated", "")
+
+                    # Residential
+                    providers_res = data.get("providers", [])
+                    gas_providers_res = data.get("gas_providers", [])
                 
-                # Business
-                providers_bus = data.get("providers_business", [])
-                gas_providers_bus = data.get("gas_providers_business", [])
+                    # Business
+                    providers_bus = data.get("providers_business", [])
+                    gas_providers_bus = data.get("gas_providers_business", [])
                 
-                reg_charges = data.get("regulated_charges", {})
-                gas_reg_charges = reg_charges.get("gas_reg_charges", {})
-                return True
-        except Exception as e:
-            print(f"Data load error: {e}")
+                    reg_charges = data.get("regulated_charges", {})
+                    gas_reg_charges = reg_charges.get("gas_reg_charges", {})
+
+                    # Columns + regulated-charge settings for the pricing engine
+                    engine = PricingEngine(data)
+                    return True
+            except Exception as e:
+                print(f"Data load error: {e}")
+                return False
             return False
-        return False
 
-    load_data()
+    def initial_load_worker():
+        nonlocal data_loaded
+        load_data()
+
+        # The last successful Cloud Sync survives restarts; use it unless the bundled asset is newer
+        cached_payload = cloud.load_cached()
+        if cached_payload:
+            load_data(cached_payload, newer_only=True)
+
+        data_loaded = True
+        btn_refresh.disabled = False
+        refresh_current_view()
+        page.update()
 
     # --- CLOUD SYNC ---
     def fetch_online_data(e):
         btn_refresh.text = "Syncing..."
         btn_refresh.disabled = True
         page.update()
-        
+
+        # Network + parsing run off the UI thread
+        threading.Thread(target=sync_worker, daemon=True).start()
+
+    def sync_worker():
         try:
-            r = requests.get(GITHUB_DATA_URL)
-            if r.status_code == 200:
-                success = load_data(r.text)
-                if success:
-                    page.snack_bar = ft.SnackBar(ft.Text("Data Updated from Cloud!"))
-                else:
-                    page.snack_bar = ft.SnackBar(ft.Text("Failed to parse Cloud Data."))
+            with instrument.span("sync.fetch") as s:
+                status, payload, validators = cloud.fetch()
+                s.set(status=status)
+            if status == NOT_MODIFIED:
+                page.snack_bar = ft.SnackBar(ft.Text("Data already up to date."))
+            elif load_data(payload):
+                try:
+                    cloud.store(payload, validators)
+                except OSError as ex:
+                    print(f"Cache write error: {ex}")
+                page.snack_bar = ft.SnackBar(ft.Text("Data Updated from Cloud!"))
             else:
-                page.snack_bar = ft.SnackBar(ft.Text(f"Cloud Error: {r.status_code}"))
+                page.snack_bar = ft.SnackBar(ft.Text("Failed to parse Cloud Data."))
         except Exception as ex:
-            page.snack_bar = ft.SnackBar(ft.Text(f"Connection Error: {ex}"))
+            response = getattr(ex, "response", None) # requests.HTTPError
+            if response is not None:
+                page.snack_bar = ft.SnackBar(ft.Text(f"Cloud Error: {response.status_code}"))
+            else:
+                page.snack_bar = ft.SnackBar(ft.Text(f"Connection Error: {ex}"))
         
         page.snack_bar.open = True
         btn_refresh.text = "Cloud Sync ☁"
@@ -98,167 +166,143 @@ def main(page: ft.Page):
         refresh_current_view()
         page.update()
 
-    # --- LOGIC HELPERS ---
-    def calculate_regulated_charges_elec(kwh, days):
-        # NOTE: Business regulated charges are different from Residential!
-        # For this MVP, we are using the RESIDENTIAL formula for both, 
-        # or we return 0 if business logic is unknown/complex.
-        # Let's keep using the same formula for now but be aware it's an approximation for Business.
-        if not reg_charges: return 0
-        kva = 8
-        admie = (reg_charges.get("admie_monopasiko", 0.00999) * kwh) + 0.5
-        deddie = (reg_charges.get("deddie_monopasiko_energy", 0.00339) * kwh) + \
-                 (reg_charges.get("deddie_monopasiko_power", 6.21) * kva * (days/365))
-        etmear = reg_charges.get("etmear", 0.017) * kwh
-        
-        yko = 0
-        remaining_kwh = kwh
-        period_factor = days / 120
-        tiers = reg_charges.get("yko_tiers", [])
-        if not tiers: 
-            tiers = [{"limit": 1600, "rate": 0.0069},{"limit": 2000, "rate": 0.050},{"limit": 99999, "rate": 0.085}]
-        
-        for tier in tiers:
-            limit = tier["limit"] * period_factor
-            rate = tier["rate"]
-            if remaining_kwh <= 0: break
-            chunk = min(remaining_kwh, limit)
-            yko += chunk * rate
-            remaining_kwh -= chunk
-            
-        return admie + deddie + etmear + yko
-
-    def calculate_regulated_charges_gas(kwh, days):
-        if not gas_reg_charges: return 0
-        fixed = gas_reg_charges.get("fixed_network_charge_per_month", 0.85) * (days / 30)
-        variable = gas_reg_charges.get("variable_network_charge_per_kwh", 0.003) * kwh
-        etd = gas_reg_charges.get("etd_per_kwh", 0.002) * kwh
-        eph = gas_reg_charges.get("eph_per_kwh", 0.005) * kwh
-        return fixed + variable + etd + eph
-
     # --- UI COMPONENTS ---
     
     # 1. Slider Sections
     lbl_elec_val = ft.Text("0 kWh", weight=ft.FontWeight.BOLD, size=16)
     lbl_gas_val = ft.Text("0 kWh", weight=ft.FontWeight.BOLD, size=16)
 
-    def on_elec_slider_change(e):
-        val = int(e.control.value)
+    def apply_elec_kwh(val):
         lbl_elec_val.value = f"{val} kWh"
         nonlocal current_elec_kwh
         current_elec_kwh = val
         update_table("electricity")
         page.update()
 
-    def on_gas_slider_change(e):
-        val = int(e.control.value)
+    def apply_gas_kwh(val):
         lbl_gas_val.value = f"{val} kWh"
         nonlocal current_gas_kwh
         current_gas_kwh = val
         update_table("gas")
         page.update()
 
-    slider_elec = ft.Slider(min=0, max=2000, divisions=200, label="{value}", on_change=on_elec_slider_change)
-    slider_gas = ft.Slider(min=0, max=2000, divisions=200, label="{value}", on_change=on_gas_slider_change)
+    # A drag fires on_change for every step; recompute at most every 80ms
+    throttled_elec = Throttle(0.08, apply_elec_kwh)
+    throttled_gas = Throttle(0.08, apply_gas_kwh)
+
+    def on_elec_slider_change(e):
+        throttled_elec(int(e.control.value))
+
+    def on_gas_slider_change(e):
+        throttled_gas(int(e.control.value))
+
+    slider_elec = ft.Slider(min=0, max=SLIDER_MAX, divisions=200, label="{value}", on_change=on_elec_slider_change)
+    slider_gas = ft.Slider(min=0, max=SLIDER_MAX, divisions=200, label="{value}", on_change=on_gas_slider_change)
+    # Where each offer is cheapest over the slider range, and the detected provider's break-even points
+    band_elec = OfferBand()
+    band_gas = OfferBand()
+    lbl_basis_elec = ft.Text("", size=12, italic=True, color="#BDBDBD", visible=False)
+    lbl_basis_gas = ft.Text("", size=12, italic=True, color="#BDBDBD", visible=False)
 
     # 2. Results List
-    results_col_elec = ft.Column(scroll=ft.ScrollMode.ADAPTIVE)
-    results_col_gas = ft.Column(scroll=ft.ScrollMode.ADAPTIVE)
-
-    def create_card(res, is_detected=False):
-        p = res["data"]
-        card_color = "#444746"
-        border = None
-        if is_detected:
-            card_color = "#0D47A1"
-            border = ft.border.all(2, "#90CAF9")
-
-        return ft.Container(
-            padding=10,
-            border_radius=10,
-            bgcolor=card_color,
-            border=border,
-            content=ft.Column([
-                ft.Row([
-                    ft.Text(p["name"], weight=ft.FontWeight.BOLD, size=16, color="white" if is_detected else None),
-                    ft.Container(
-                        content=ft.Text(f"{res['total']:.2f} €", weight=ft.FontWeight.BOLD, size=18, color="#66BB6A"),
-                        alignment=ft.alignment.center_right,
-                        expand=True
-                    )
-                ]),
-                ft.Text(f"{p['program']} | {res['price_disp']} /kWh", size=12, italic=True),
-                ft.Divider(height=5, color="transparent"),
-                ft.Row([
-                    ft.Text(f"Energy: {res['energy_cost']:.2f}€", size=12),
-                    ft.Text(f"Regulated: {res['reg_cost']:.2f}€", size=12),
-                    ft.Text(f"Fixed: {res['fixed_disp']}", size=12),
-                ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN)
-            ])
+    # Cards are built once per offer and updated in place (see results_view.py)
+    # Skeleton until the initial load replaces it
+    results_col_elec = ft.Column([ft.Text("Loading offers...", italic=True)], scroll=ft.ScrollMode.ADAPTIVE)
+    results_col_gas = ft.Column([ft.Text("Loading offers...", italic=True)], scroll=ft.ScrollMode.ADAPTIVE)
+
+    def show_offer_details(offer):
+        # The only place the full record (raw_data) is loaded
+        record = offer.details() or {}
+        cells = [cell for cell in record.get("raw_data") or [] if cell]
+        dialog = ft.AlertDialog(
+            title=ft.Text(f"{offer['name']} - {offer['program']}"),
+            content=ft.Column([ft.Text(cell, size=12) for cell in cells] or [ft.Text("No details available.", italic=True)],
+                              tight=True, scroll=ft.ScrollMode.ADAPTIVE),
         )
+        page.dialog = dialog
+        dialog.open = True
+        page.update()
+
+    results_view_elec = ResultsView(results_col_elec, on_select=show_offer_details)
+    results_view_gas = ResultsView(results_col_gas, on_select=show_offer_details)
 
-    def get_current_providers(energy_type):
-        if current_mode == "residential":
-            if energy_type == "electricity": return providers_res
-            else: return gas_providers_res
-        else: # Business
-            if energy_type == "electricity": return providers_bus
-            else: return gas_providers_bus
+    # update_table runs on the UI thread (tab / mode / dialog events), on the
+    # slider Throttle's timer thread (trailing call) and on the load / sync
+    # workers; one render at a time, so no two threads update the same cards
+    render_lock = threading.RLock()
 
     def update_table(energy_type):
-        target_col = results_col_elec if energy_type == "electricity" else results_col_gas
-        target_col.controls.clear()
-        
+        with render_lock:
+            _update_table(energy_type)
+
+    def _update_table(energy_type):
+        view = results_view_elec if energy_type == "electricity" else results_view_gas
         kwh = current_elec_kwh if energy_type == "electricity" else current_gas_kwh
-        vat_rate = reg_charges.get("vat", 0.06)
-        
-        reg_cost = 0
-        if energy_type == "electricity":
-            reg_cost = calculate_regulated_charges_elec(kwh, current_days)
-        else:
-            reg_cost = calculate_regulated_charges_gas(kwh, current_days)
-            vat_rate = gas_reg_charges.get("vat", 0.06)
-
-        results = []
-        
-        # Get correct list based on mode
-        current_providers = get_current_providers(energy_type)
-        
-        for p in current_providers:
-            final_price = p["price_kwh"] * (1 - p.get("discount_percent", 0))
-            energy_val = kwh * final_price
-            fixed_val = (p["monthly_fee"] / 30) * current_days
-            cost_energy_total = energy_val + fixed_val
-            total_pre_vat = cost_energy_total + reg_cost
-            vat_val = total_pre_vat * vat_rate
-            total_final = total_pre_vat + vat_val
-            
-            is_det = (detected_provider.lower() in p["name"].lower())
-
-            results.append({
-                "data": p,
-                "price_disp": f"{final_price:.3f}€",
-                "fixed_disp": f"{fixed_val:.1f}€",
-                "energy_cost": cost_energy_total,
-                "reg_cost": reg_cost,
-                "vat": vat_val,
-                "total": total_final,
-                "is_detected": is_det
-            })
-            
-        results.sort(key=lambda x: (not x["is_detected"], x["total"]))
-        
-        for res in results:
-            target_col.controls.append(create_card(res, res["is_detected"]))
-            
-        if not results:
-             target_col.controls.append(ft.Text(f"No {current_mode} providers found.", italic=True))
-        
-        target_col.update()
+        lbl_basis = lbl_basis_elec if energy_type == "electricity" else lbl_basis_gas
+        band = band_elec if energy_type == "electricity" else band_gas
+
+        if not data_loaded: return # Skeleton stays until the first load
+
+        with instrument.span("ui.update_table", energy_type=energy_type, mode=current_mode, annual=annual_view) as s:
+            if annual_view:
+                bills = imported_bills[energy_type]
+                periods = periods_from_bills(bills.values()) or monthly_profile(kwh)
+                quote = engine.annual(energy_type, current_mode, periods, detected_provider)
+                if bills:
+                    lbl_basis.value = f"Total over {len(periods)} imported bill(s), {quote.days} days"
+                else:
+                    lbl_basis.value = f"Year total at {kwh} kWh per month"
+            else:
+                # Price every offer of the current mode in one pass
+                quote = engine.quote(energy_type, current_mode, kwh, current_days, detected_provider)
+                lbl_basis.value = ""
+            lbl_basis.visible = annual_view
+            view.render(quote, f"No {current_mode} providers found.")
+
+            # Precomputed once per (snapshot, mode, days, provider); a slider move is a lookup
+            detected = detected_provider if detected_provider != "Unknown" else None
+            band.render(engine.cost_curves(energy_type, current_mode, current_days).offer_map(SLIDER_MAX, detected), kwh)
+            s.set(offers=len(quote), **view.stats.as_dict()) # Controls created / updated (results_view.UiStats)
+
+    # Household: cheapest electricity + gas pair once bills of both types were imported
+    household_col = ft.Column([], spacing=2, visible=False)
+
+    def update_household():
+        elec_kwh = normalise(imported_bills["electricity"].values())
+        gas_kwh = normalise(imported_bills["gas"].values())
+        household_col.visible = data_loaded and elec_kwh is not None and gas_kwh is not None
+        if not household_col.visible: return
+
+        with instrument.span("ui.household", mode=current_mode) as s:
+            plan = HouseholdPlan(engine, current_mode, elec_kwh, gas_kwh)
+            rows = [ft.Text(f"Household, {HOUSEHOLD_DAYS} days at your bills' usage "
+                            f"({elec_kwh:.0f} kWh electricity, {gas_kwh:.0f} kWh gas)", size=12, weight=ft.FontWeight.BOLD)]
+            if plan.best is None:
+                rows.append(ft.Text(f"No {current_mode} offers for both energy types.", size=12, italic=True))
+            else:
+                rows.append(ft.Text(f"Cheapest: {plan.describe(plan.best)} = {plan.best[0]:.2f} €", size=12, color="#2ecc71"))
+                for pair in plan.pairs[1:]:
+                    rows.append(ft.Text(f"{plan.describe(pair)} = {pair[0]:.2f} €", size=11, color="#BDBDBD"))
+            if plan.same_supplier:
+                pair = plan.same_supplier[0]
+                rows.append(ft.Text(f"Single supplier: {plan.describe(pair)} = {pair[0]:.2f} €", size=12, color="#f1c40f"))
+            household_col.controls = rows
+            s.set(elec_offers=len(plan.elec), gas_offers=len(plan.gas))
 
     def refresh_current_view():
-        update_table("electricity")
-        update_table("gas")
+        # Only the visible tab now; the other one when it is selected
+        visible = "gas" if tabs.selected_index == 1 else "electricity"
+        update_table(visible)
+        update_household()
+        stale_tabs.clear()
+        stale_tabs.add("electricity" if visible == "gas" else "gas")
+
+    def on_tab_change(e):
+        shown = "gas" if tabs.selected_index == 1 else "electricity"
+        if shown in stale_tabs:
+            stale_tabs.discard(shown)
+            update_table(shown)
+            page.update()
 
     # 3. Mode Switch & File Picker
     def on_mode_change(e):
@@ -271,37 +315,53 @@ def main(page: ft.Page):
     switch_mode = ft.Switch(label="", value=False, on_change=on_mode_change)
     lbl_mode = ft.Text("Residential Mode", weight=ft.FontWeight.BOLD)
 
+    def on_annual_change(e):
+        nonlocal annual_view
+        annual_view = e.control.value
+        refresh_current_view()
+        page.update()
+
+    switch_annual = ft.Switch(label="Year", value=False, on_change=on_annual_change)
+
     def on_dialog_result(e: ft.FilePickerResultEvent):
-        if e.files:
-            file_path = e.files[0].path
-            if file_path:
-                res = parser.parse_bill(file_path)
-                if "error" in res:
-                    page.snack_bar = ft.SnackBar(ft.Text(f"Error: {res['error']}"))
-                    page.snack_bar.open = True
-                    page.update()
-                    return
-
-                nonlocal current_days, detected_provider, current_elec_kwh, current_gas_kwh
-                current_days = res.get("days", 30)
-                detected_provider = res.get("provider_detected", "Unknown")
-                bill_type = res.get("bill_type", "electricity")
-                consumption = res.get("total_kwh", 0)
-
-                if bill_type == "gas":
-                    current_gas_kwh = consumption
-                    slider_gas.value = consumption
-                    lbl_gas_val.value = f"{consumption} kWh"
-                    tabs.selected_index = 1
-                else:
-                    current_elec_kwh = consumption
-                    slider_elec.value = consumption
-                    lbl_elec_val.value = f"{consumption} kWh"
-                    tabs.selected_index = 0
-                
-                status_text.value = f"Detected: {detected_provider} ({bill_type}) | {consumption} kWh"
-                refresh_current_view()
-                page.update()
+        # One or several bills; the last of each energy type sets its slider
+        paths = [f.path for f in e.files or [] if f.path]
+        if not paths: return
+        nonlocal current_days, detected_provider, current_elec_kwh, current_gas_kwh
+        errors = []
+        imported = []
+        for file_path in paths:
+            res = get_parser().parse_bill(file_path)
+            if "error" in res:
+                errors.append(f"{os.path.basename(file_path)}: {res['error']}")
+                continue
+
+            current_days = res.get("days", 30)
+            # As named in the catalogue, so the provider's offers are found and ranked first
+            detected_provider = get_parser().rules.catalogue_name(res.get("provider_detected", "Unknown"))
+            bill_type = res.get("bill_type", "electricity")
+            consumption = res.get("total_kwh", 0)
+            imported_bills["gas" if bill_type == "gas" else "electricity"][file_path] = res
+            imported.append(f"{detected_provider} ({bill_type}) | {consumption} kWh")
+
+            if bill_type == "gas":
+                current_gas_kwh = consumption
+                slider_gas.value = consumption
+                lbl_gas_val.value = f"{consumption} kWh"
+                tabs.selected_index = 1
+            else:
+                current_elec_kwh = consumption
+                slider_elec.value = consumption
+                lbl_elec_val.value = f"{consumption} kWh"
+                tabs.selected_index = 0
+
+        if errors:
+            page.snack_bar = ft.SnackBar(ft.Text("Error: " + "; ".join(errors)))
+            page.snack_bar.open = True
+        if imported:
+            status_text.value = "Detected: " + imported[0] if len(imported) == 1 else f"Imported {len(imported)} bills"
+            refresh_current_view()
+        page.update()
 
     file_picker = ft.FilePicker(on_result=on_dialog_result)
     page.overlay.append(file_picker)
@@ -311,12 +371,15 @@ def main(page: ft.Page):
     status_text = ft.Text("Waiting for input...", italic=True, color="#BDBDBD")
 
     # Add Refresh Button
-    btn_refresh = ft.ElevatedButton("Cloud Sync ☁", on_click=fetch_online_data, bgcolor="#d35400", color="white")
+    btn_refresh = ft.ElevatedButton("Cloud Sync ☁", on_click=fetch_online_data, bgcolor="#d35400", color="white",
+                                    disabled=True) # Until the initial load is done
 
     tab_elec = ft.Container(
         content=ft.Column([
             ft.Text("Electricity Consumption", size=14),
             ft.Row([slider_elec, lbl_elec_val], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+            band_elec.control,
+            lbl_basis_elec,
             ft.Divider(),
             results_col_elec
         ]),
@@ -327,6 +390,8 @@ def main(page: ft.Page):
         content=ft.Column([
             ft.Text("Gas Consumption", size=14),
             ft.Row([slider_gas, lbl_gas_val], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+            band_gas.control,
+            lbl_basis_gas,
             ft.Divider(),
             results_col_gas
         ]),
@@ -341,6 +406,7 @@ def main(page: ft.Page):
             ft.Tab(text="Gas 🔥", content=tab_gas),
         ],
         expand=1,
+        on_change=on_tab_change,
     )
 
     header = ft.Container(
@@ -353,20 +419,23 @@ def main(page: ft.Page):
                 ft.Text("WattSaver Ultimate", size=20, weight=ft.FontWeight.BOLD),
             ]),
             status_text,
+            household_col,
             ft.Divider(),
             ft.Row([ft.Row([switch_mode, lbl_mode]),
+                switch_annual,
                 btn_refresh
             ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
             ft.Container(height=10),
-            ft.ElevatedButton("Import PDF Bill", icon=ft.Icons.UPLOAD_FILE, on_click=lambda _: file_picker.pick_files(allow_multiple=False, allowed_extensions=["pdf"])),
+            ft.ElevatedButton("Import PDF Bill", icon=ft.Icons.UPLOAD_FILE, on_click=lambda _: file_picker.pick_files(allow_multiple=True, allowed_extensions=["pdf"])),
             ft.Text("Note: Live scraping is disabled on mobile.", size=10, color="#BDBDBD", text_align=ft.TextAlign.CENTER)
         ])
     )
 
     page.add(header, tabs)
-    
-    # Init
-    refresh_current_view()
+    instrument.debug("ui.first_frame", ms=round((time.perf_counter() - STARTED) * 1000, 3))
+
+    # Init: offers arrive in the background
+    threading.Thread(target=initial_load_worker, daemon=True).start()
 
 if __name__ == "__main__":
     ft.app(target=main)
@@ -0,0 +1,164 @@
+from array import array
+
+# Tariff engine: prices every offer of a category in one pass over
+# array-backed columns instead of a per-provider loop in the UI.
+#
+# For a given consumption every offer's bill is
+#   energy  = kwh * price_kwh * (1 - discount)
+#   fixed   = monthly_fee / 30 * days
+#   reg     = regulated charges (same for every offer of the energy type)
+#   total   = (energy + fixed + reg) * (1 + vat)
+# so the per-offer work is two multiply-adds; the regulated charges are
+# computed once per (kwh, days) and shared.
+#
+# Pure Python on purpose: the app ships to Android via Flet and the
+# offer counts (tens to hundreds) don't justify pulling in numpy.
+
+ELECTRICITY = "electricity"
+GAS = "gas"
+
+RESIDENTIAL = "residential"
+BUSINESS = "business"
+
+# (energy type, mode) -> providers.json key
+CATEGORY_KEYS = {
+    (ELECTRICITY, RESIDENTIAL): "providers",
+    (GAS, RESIDENTIAL): "gas_providers",
+    (ELECTRICITY, BUSINESS): "providers_business",
+    (GAS, BUSINESS): "gas_providers_business",
+}
+
+DEFAULT_YKO_TIERS = [{"limit": 1600, "rate": 0.0069}, {"limit": 2000, "rate": 0.050}, {"limit": 99999, "rate": 0.085}]
+
+
+def regulated_charges_elec(reg_charges, kwh, days):
+    # NOTE: Business regulated charges are different from Residential!
+    # For this MVP, we are using the RESIDENTIAL formula for both,
+    # or we return 0 if business logic is unknown/complex.
+    # Let's keep using the same formula for now but be aware it's an approximation for Business.
+    if not reg_charges: return 0
+    kva = 8
+    admie = (reg_charges.get("admie_monopasiko", 0.00999) * kwh) + 0.5
+    deddie = (reg_charges.get("deddie_monopasiko_energy", 0.00339) * kwh) + \
+             (reg_charges.get("deddie_monopasiko_power", 6.21) * kva * (days/365))
+    etmear = reg_charges.get("etmear", 0.017) * kwh
+
+    yko = 0
+    remaining_kwh = kwh
+    period_factor = days / 120
+    tiers = reg_charges.get("yko_tiers", [])
+    if not tiers:
+        tiers = DEFAULT_YKO_TIERS
+
+    for tier in tiers:
+        limit = tier["limit"] * period_factor
+        rate = tier["rate"]
+        if remaining_kwh <= 0: break
+        chunk = min(remaining_kwh, limit)
+        yko += chunk * rate
+        remaining_kwh -= chunk
+
+    return admie + deddie + etmear + yko
+
+
+def regulated_charges_gas(gas_reg_charges, kwh, days):
+    if not gas_reg_charges: return 0
+    fixed = gas_reg_charges.get("fixed_network_charge_per_month", 0.85) * (days / 30)
+    variable = gas_reg_charges.get("variable_network_charge_per_kwh", 0.003) * kwh
+    etd = gas_reg_charges.get("etd_per_kwh", 0.002) * kwh
+    eph = gas_reg_charges.get("eph_per_kwh", 0.005) * kwh
+    return fixed + variable + etd + eph
+
+
+class OfferTable:
+    # One category's offers as columns. `offers` keeps the source records
+    # (for names / programs on the cards) in column order.
+    def __init__(self, offers):
+        self.offers = list(offers)
+        self.unit_price = array("d", (p["price_kwh"] * (1 - p.get("discount_percent", 0)) for p in self.offers))
+        self.monthly_fee = array("d", (p["monthly_fee"] for p in self.offers))
+
+    def __len__(self):
+        return len(self.offers)
+
+    def matches(self, provider):
+        # Column of "is this the detected provider" flags
+        needle = provider.lower()
+        return [needle in p["name"].lower() for p in self.offers]
+
+
+class Quote:
+    # Priced offers for one (kwh, days). Columns are in OfferTable order;
+    # `order` ranks them (detected provider first, then cheapest).
+    def __init__(self, table, kwh, days, reg_cost, vat_rate, detected=None):
+        self.table = table
+        self.kwh = kwh
+        self.days = days
+        self.reg_cost = reg_cost
+        # Same operation order as the original per-card loop, so totals match to the bit
+        self.fixed = [(fee / 30) * days for fee in table.monthly_fee]
+        self.energy_cost = [kwh * price + fixed for price, fixed in zip(table.unit_price, self.fixed)]
+        pre_vat = [cost + reg_cost for cost in self.energy_cost]
+        self.vat = [total * vat_rate for total in pre_vat]
+        self.total = [total + vat for total, vat in zip(pre_vat, self.vat)]
+        self.is_detected = table.matches(detected) if detected else [False] * len(table)
+        self.order = sorted(range(len(table)), key=lambda i: (not self.is_detected[i], self.total[i]))
+
+    def __len__(self):
+        return len(self.table)
+
+
+class PricingEngine:
+    # Built once per providers.json snapshot (load_data / Cloud Sync)
+    def __init__(self, data):
+        self.reg_charges = data.get("regulated_charges", {})
+        self.gas_reg_charges = self.reg_charges.get("gas_reg_charges", {})
+        self.tables = {key: OfferTable(data.get(name, [])) for key, name in CATEGORY_KEYS.items()}
+        self._curves = {}
+
+    def table(self, energy_type, mode=RESIDENTIAL):
+        return self.tables[(energy_type, mode)]
+
+    def vat_rate(self, energy_type):
+        if energy_type == ELECTRICITY:
+            return self.reg_charges.get("vat", 0.06)
+        return self.gas_reg_charges.get("vat", 0.06)
+
+    def regulated(self, energy_type, kwh, days):
+        if energy_type == ELECTRICITY:
+            return regulated_charges_elec(self.reg_charges, kwh, days)
+        return regulated_charges_gas(self.gas_reg_charges, kwh, days)
+
+    def quote(self, energy_type, mode, kwh, days, detected=None):
+        return Quote(self.table(energy_type, mode), kwh, days,
+                     self.regulated(energy_type, kwh, days), self.vat_rate(energy_type), detected)
+
+    def annual(self, energy_type, mode, periods, detected=None):
+        # Every offer summed over [(kwh, days), ...] billing periods (see annual.py)
+        from annual import AnnualQuote
+        periods = list(periods)
+        reg_costs = [self.regulated(energy_type, kwh, days) for kwh, days in periods]
+        return AnnualQuote(self.table(energy_type, mode), periods, reg_costs, self.vat_rate(energy_type), detected)
+
+    def cost_curves(self, energy_type, mode, days):
+        # Precomputed piecewise-linear curves (see cost_curve.py), built once per
+        # (energy type, mode, days) for this snapshot. A new snapshot means a new
+        # engine, so nothing stale survives a load_data.
+        key = (energy_type, mode, days)
+        curves = self._curves.get(key)
+        if curves is None:
+            from cost_curve import CostCurves
+            curves = self._curves[key] = CostCurves(self, energy_type, mode, days)
+        return curves
+
+    def curve(self, energy_type, mode, kwh_values, days):
+        # Total cost of every offer at every consumption in `kwh_values`:
+        # one row per offer (OfferTable order), one column per kWh value.
+        table = self.table(energy_type, mode)
+        vat_factor = 1 + self.vat_rate(energy_type)
+        kwh_values = list(kwh_values)
+        regs = [self.regulated(energy_type, kwh, days) for kwh in kwh_values]
+        return [
+            array("d", ((kwh * price + fixed + reg) * vat_factor for kwh, reg in zip(kwh_values, regs)))
+            for price, fixed in zip(table.unit_price, ((fee / 30) * days for fee in table.monthly_fee))
+        ]
@@ -0,0 +1,244 @@
+import gzip
+import json
+import os
+import sys
+import tempfile
+
+# Loading and encoding of the provider database.
+#
+# providers.json is the canonical, human-readable snapshot. The scraper also
+# emits providers.col.json.gz: the same data stored column by column, with every
+# string (names, programs, raw_data cells, ...) kept once in a shared string
+# table and referenced by index. It is a fraction of the size and the app
+# prefers it at startup.
+
+CATEGORY_KEYS = ("providers", "gas_providers", "providers_business", "gas_providers_business")
+
+COLUMNAR_FORMAT = "wattsaver-columnar"
+COLUMNAR_VERSION = 1
+
+JSON_ASSET = "providers.json"
+COLUMNAR_ASSETS = ("providers.col.json.gz", "providers.col.json")
+
+# Column kinds
+STR = "s"       # index into the string table
+STR_LIST = "l"  # list of indexes into the string table
+VALUE = "v"     # stored as-is (numbers, bools, null, mixed)
+
+
+def _column_kind(values):
+    if all(isinstance(v, str) for v in values):
+        return STR
+    if all(isinstance(v, list) and all(isinstance(x, str) for x in v) for v in values):
+        return STR_LIST
+    return VALUE
+
+
+def encode_columnar(data):
+    strings = []
+    string_ids = {}
+
+    def sid(s):
+        i = string_ids.get(s)
+        if i is None:
+            i = string_ids[s] = len(strings)
+            strings.append(s)
+        return i
+
+    categories = {}
+    for key in CATEGORY_KEYS:
+        offers = data.get(key)
+        if offers is None: continue
+
+        fields = []
+        for offer in offers:
+            for field in offer:
+                if field not in fields: fields.append(field)
+
+        columns = {}
+        for field in fields:
+            values = [offer.get(field) for offer in offers]
+            kind = _column_kind(values)
+            if kind == STR:
+                values = [sid(v) for v in values]
+            elif kind == STR_LIST:
+                values = [[sid(x) for x in v] for v in values]
+            columns[field] = {"kind": kind, "values": values}
+
+        categories[key] = {"count": len(offers), "fields": fields, "columns": columns}
+
+    meta = {k: v for k, v in data.items() if k not in CATEGORY_KEYS}
+    return {
+        "format": COLUMNAR_FORMAT,
+        "version": COLUMNAR_VERSION,
+        "meta": meta,
+        "strings": strings,
+        "categories": categories,
+    }
+
+
+def decode_columnar(doc, include_raw=True):
+    # Rebuilds the providers.json layout. include_raw=False skips the
+    # display-only raw_data column (the app never reads it).
+    if doc.get("format") != COLUMNAR_FORMAT or doc.get("version") != COLUMNAR_VERSION:
+        raise ValueError("Unsupported providers data format")
+
+    strings = doc["strings"]
+    data = dict(doc.get("meta", {}))
+    for key, table in doc["categories"].items():
+        fields = [f for f in table["fields"] if include_raw or f != "raw_data"]
+        cols = []
+        for field in fields:
+            column = table["columns"][field]
+            kind, values = column["kind"], column["values"]
+            if kind == STR:
+                values = [strings[i] for i in values]
+            elif kind == STR_LIST:
+                values = [[strings[i] for i in v] for v in values]
+            cols.append(values)
+        data[key] = [dict(zip(fields, row)) for row in zip(*cols)] if cols else [{} for _ in range(table["count"])]
+    return data
+
+
+def dumps_columnar(data, compress=True):
+    payload = json.dumps(encode_columnar(data), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    # mtime=0 keeps the gzip bytes reproducible, so unchanged data doesn't churn git
+    return gzip.compress(payload, compresslevel=9, mtime=0) if compress else payload
+
+
+def loads_columnar(blob, include_raw=True):
+    if blob[:2] == b"\x1f\x8b":
+        blob = gzip.decompress(blob)
+    return decode_columnar(json.loads(blob), include_raw=include_raw)
+
+
+def write_columnar(data, path):
+    blob = dumps_columnar(data, compress=path.endswith(".gz"))
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+        os.chmod(tmp_path, 0o644) # mkstemp creates 0600
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path): os.remove(tmp_path)
+        raise
+
+
+def find_assets_dir():
+    # `flet run main.py` from wattsaver_mobile/ or from the repo root
+    for path in ("assets", "wattsaver_mobile/assets"):
+        if os.path.isdir(path): return path
+    return None
+
+
+def load_providers(assets_dir=None, include_raw=True, lean=False):
+    # Prefer the compact columnar asset, fall back to providers.json.
+    # Returns None when no asset is available. lean=True returns Offer records
+    # (see lean_data) instead of dicts.
+    assets_dir = assets_dir or find_assets_dir()
+    if not assets_dir: return None
+
+    for name in COLUMNAR_ASSETS:
+        path = os.path.join(assets_dir, name)
+        if os.path.exists(path):
+            try:
+                with open(path, "rb") as f:
+                    data = loads_columnar(f.read(), include_raw=include_raw and not lean)
+                return lean_data(data, path) if lean else data
+            except Exception as e:
+                print(f"Columnar asset unreadable ({e}), falling back to JSON")
+                break
+
+    path = os.path.join(assets_dir, JSON_ASSET)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return lean_data(data, path) if lean else data
+    return None
+
+
+def read_providers_file(path, include_raw=True):
+    # providers.json or a columnar asset, by file name
+    with open(path, "rb") as f:
+        blob = f.read()
+    if ".col.json" in os.path.basename(path):
+        return loads_columnar(blob, include_raw=include_raw)
+    return json.loads(blob.decode("utf-8"))
+
+
+# --- Lean in-memory records ---
+#
+# The app only prices and lists offers, so it keeps one slotted Offer per offer
+# with just those fields, strings interned (the same names repeat across all
+# four categories). Everything else - type, colour, category and the
+# 15-cell raw_data - stays in the file and is read back on demand for a
+# details view (Offer.details()).
+
+class OfferSource:
+    # Where a category's full records live: one per (file, category), shared by its offers
+    __slots__ = ("path", "key", "last_updated")
+
+    def __init__(self, path, key, last_updated):
+        self.path = path
+        self.key = key
+        self.last_updated = last_updated
+
+    def record(self, index):
+        # The offer's full providers.json dict, or None if the file is gone or
+        # now holds a different snapshot than the one the offer came from
+        if not self.path: return None
+        try:
+            data = read_providers_file(self.path)
+            if data.get("last_updated", "") != self.last_updated: return None
+            return data[self.key][index]
+        except (OSError, ValueError, KeyError, IndexError):
+            return None
+
+
+class Offer:
+    FIELDS = ("name", "program", "price_kwh", "monthly_fee", "discount_percent")
+    __slots__ = FIELDS + ("_source", "_index")
+
+    def __init__(self, d, source=None, index=None):
+        self.name = sys.intern(d.get("name", ""))
+        self.program = sys.intern(d.get("program", ""))
+        self.price_kwh = d.get("price_kwh", 0.0)
+        self.monthly_fee = d.get("monthly_fee", 0.0)
+        self.discount_percent = d.get("discount_percent", 0.0)
+        self._source = source
+        self._index = index
+
+    # Read like the providers.json dicts, so pricing / cards work on either.
+    # Only FIELDS: anything else is a KeyError, not a silent read of the whole
+    # file - ask details() for it explicitly.
+    def __getitem__(self, key):
+        if key not in Offer.FIELDS: raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def details(self):
+        # Full record including raw_data, read from the source file (slow; details view only)
+        if self._source is None: return None
+        return self._source.record(self._index)
+
+    def __repr__(self):
+        return f"Offer({self.name!r}, {self.program!r}, {self.price_kwh}, {self.monthly_fee})"
+
+
+def lean_data(data, path=None):
+    # Same layout as providers.json with every offer list turned into Offer
+    # records; `path` is the file they can read their full records back from.
+    lean = {k: v for k, v in data.items() if k not in CATEGORY_KEYS}
+    last_updated = data.get("last_updated", "")
+    for key in CATEGORY_KEYS:
+        if key not in data: continue
+        source = OfferSource(path, key, last_updated)
+        lean[key] = [Offer(d, source, i) for i, d in enumerate(data[key])]
+    return lean
@@ -0,0 +1,243 @@
+import threading
+import time
+import weakref
+import flet as ft
+
+# Incremental offer list.
+#
+# Cards are created once per offer and then only their changed text/colours
+# are touched on each recompute, and the Column's children are only
+# re-ordered when the ranking changes. Flet then ships just the changed
+# properties to the client instead of the whole list on every slider tick.
+
+CARD_COLOR = "#444746"
+DETECTED_COLOR = "#0D47A1"
+DETECTED_BORDER_COLOR = "#90CAF9"
+
+
+class UiStats:
+    # Controls created / property updates, for the last render and in total.
+    # Lets us measure list churn headless (no Flet client needed).
+    def __init__(self):
+        self.renders = 0
+        self.created = 0
+        self.updated = 0
+        self.last_created = 0
+        self.last_updated = 0
+
+    def begin(self):
+        self.renders += 1
+        self.last_created = 0
+        self.last_updated = 0
+
+    def add_created(self, n=1):
+        self.created += n
+        self.last_created += n
+
+    def add_updated(self, n=1):
+        self.updated += n
+        self.last_updated += n
+
+    def as_dict(self):
+        return {
+            "renders": self.renders, "created": self.created, "updated": self.updated,
+            "last_created": self.last_created, "last_updated": self.last_updated,
+        }
+
+
+class OfferCard:
+    CONTROL_COUNT = 12 # Controls built per card (for UiStats)
+
+    def __init__(self, offer, on_select=None):
+        self.offer = offer
+        self.is_detected = False
+        self.txt_name = ft.Text(offer["name"], weight=ft.FontWeight.BOLD, size=16)
+        self.txt_total = ft.Text("", weight=ft.FontWeight.BOLD, size=18, color="#66BB6A")
+        self.txt_program = ft.Text("", size=12, italic=True)
+        self.txt_energy = ft.Text("", size=12)
+        self.txt_reg = ft.Text("", size=12)
+        self.txt_fixed = ft.Text("", size=12)
+        self.control = ft.Container(
+            padding=10,
+            border_radius=10,
+            bgcolor=CARD_COLOR,
+            on_click=(lambda _: on_select(offer)) if on_select else None,
+            content=ft.Column([
+                ft.Row([
+                    self.txt_name,
+                    ft.Container(
+                        content=self.txt_total,
+                        alignment=ft.alignment.center_right,
+                        expand=True
+                    )
+                ]),
+                self.txt_program,
+                ft.Divider(height=5, color="transparent"),
+                ft.Row([
+                    self.txt_energy,
+                    self.txt_reg,
+                    self.txt_fixed,
+                ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN)
+            ])
+        )
+
+    def set(self, total, price_disp, energy_cost, reg_cost, fixed_disp, is_detected):
+        # Returns the number of properties that actually changed
+        changed = 0
+        for txt, value in (
+            (self.txt_total, f"{total:.2f} €"),
+            (self.txt_program, f"{self.offer['program']} | {price_disp} /kWh"),
+            (self.txt_energy, f"Energy: {energy_cost:.2f}€"),
+            (self.txt_reg, f"Regulated: {reg_cost:.2f}€"),
+            (self.txt_fixed, f"Fixed: {fixed_disp}"),
+        ):
+            if txt.value != value:
+                txt.value = value
+                changed += 1
+
+        if is_detected != self.is_detected:
+            self.is_detected = is_detected
+            self.control.bgcolor = DETECTED_COLOR if is_detected else CARD_COLOR
+            self.control.border = ft.border.all(2, DETECTED_BORDER_COLOR) if is_detected else None
+            self.txt_name.color = "white" if is_detected else None
+            changed += 3
+        return changed
+
+
+class ResultsView:
+    def __init__(self, column, on_select=None):
+        self.column = column
+        self.on_select = on_select # Called with the offer when its card is tapped
+        self.stats = UiStats()
+        # OfferTable -> its cards; tables from a replaced snapshot drop out with it
+        self._cards = weakref.WeakKeyDictionary()
+        self._empty_text = ft.Text("", italic=True)
+
+    def _cards_for(self, table):
+        cards = self._cards.get(table)
+        if cards is None:
+            cards = self._cards[table] = [OfferCard(offer, self.on_select) for offer in table.offers]
+            self.stats.add_created(len(cards) * OfferCard.CONTROL_COUNT)
+        return cards
+
+    def render(self, quote, empty_message):
+        self.stats.begin()
+        table = quote.table
+        cards = self._cards_for(table)
+
+        for i, card in enumerate(cards):
+            self.stats.add_updated(card.set(
+                quote.total[i],
+                f"{table.unit_price[i]:.3f}€",
+                quote.energy_cost[i],
+                quote.reg_cost,
+                f"{quote.fixed[i]:.1f}€",
+                quote.is_detected[i],
+            ))
+
+        if cards:
+            controls = [cards[i].control for i in quote.order]
+        else:
+            self._empty_text.value = empty_message
+            controls = [self._empty_text]
+
+        # Only touch the child list when the ranking (or the table) changed
+        current = self.column.controls
+        if len(current) != len(controls) or any(a is not b for a, b in zip(current, controls)):
+            self.column.controls = controls
+            self.stats.add_updated()
+
+        if self.column.page:
+            self.column.update()
+
+
+BAND_COLORS = ("#66BB6A", "#42A5F5", "#FFA726", "#AB47BC", "#26C6DA", "#EF5350", "#D4E157", "#8D6E63")
+
+
+class OfferBand:
+    # Strip under a slider showing which offer is cheapest where (cost_curve.OfferMap).
+    # The strip is rebuilt only when the map changes (snapshot, mode, days,
+    # detected provider); a slider move just looks its interval up.
+    def __init__(self):
+        self.offer_map = None
+        self.strip = ft.Row(spacing=0, height=8)
+        self.label = ft.Text("", size=12, color="#BDBDBD")
+        self.control = ft.Column([self.strip, self.label], spacing=4)
+
+    def _name(self, index):
+        offer = self.offer_map.curves.table.offers[index]
+        return f"{offer['name']} - {offer['program']}"
+
+    def render(self, offer_map, kwh):
+        if offer_map is not self.offer_map:
+            self.offer_map = offer_map
+            colors = {}
+            segments = []
+            for start, end, index in offer_map.intervals:
+                color = colors.setdefault(index, BAND_COLORS[len(colors) % len(BAND_COLORS)])
+                segments.append(ft.Container(
+                    bgcolor=color,
+                    expand=max(1, round((end - start) * 1000 / offer_map.max_kwh)),
+                    tooltip=f"{self._name(index)}: {start:.0f}-{end:.0f} kWh",
+                ))
+            self.strip.controls = segments
+        self.label.value = self._describe(kwh)
+
+    def _describe(self, kwh):
+        interval = self.offer_map.at(kwh)
+        if interval is None: return ""
+        start, end, index = interval
+        text = f"Cheapest {start:.0f}-{end:.0f} kWh: {self._name(index)}"
+        savings = self.offer_map.savings(kwh)
+        if savings is not None:
+            _, alternative, saved = savings
+            if saved > 0.005:
+                text += f" | Switching to {self._name(alternative)} saves {saved:.2f}€"
+            else:
+                text += " | Your provider is the cheapest here"
+        if self.offer_map.crossings:
+            text += " | Break-even at " + ", ".join(f"{x:.0f}" for x, _, _ in self.offer_map.crossings) + " kWh"
+        return text
+
+
+class Throttle:
+    # Runs `fn` at most once per `interval` seconds. Calls inside the window
+    # collapse into one trailing call with the latest arguments, so a slider
+    # drag does a bounded number of recomputes and always ends on the final value.
+    # The trailing call runs on a timer thread: `fn` has to lock against other
+    # callers of what it updates (main.update_table does).
+    def __init__(self, interval, fn):
+        self.interval = interval
+        self.fn = fn
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._timer = None
+        self._pending = None
+        self._last_run = 0.0
+
+    def __call__(self, *args):
+        with self._lock:
+            self._pending = args
+            if self._timer is not None:
+                return
+            wait = self.interval - (time.monotonic() - self._last_run)
+            if wait > 0:
+                self._timer = threading.Timer(wait, self._fire)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+            self._pending = None
+            self._last_run = time.monotonic()
+        self._run(args)
+
+    def _fire(self):
+        with self._lock:
+            args, self._pending = self._pending, None
+            self._timer = None
+            self._last_run = time.monotonic()
+        if args is not None:
+            self._run(args)
+
+    def _run(self, args):
+        with self._run_lock:
+            self.fn(*args)